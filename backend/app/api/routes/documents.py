@@ -3,10 +3,15 @@ Document Management API Routes
 Endpoints for uploading and managing PDF documents.
 """
 
-from typing import List
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import List, Tuple
 from datetime import datetime
 from pathlib import Path
 
+import anyio
 from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, Query, BackgroundTasks
 from pydantic import BaseModel
 from loguru import logger
@@ -14,8 +19,11 @@ from loguru import logger
 from app.config import get_settings, Settings
 from app.api.dependencies import get_rag_assistant, get_graph_builder
 from app.services.document_pipeline import get_document_pipeline
+from app.services.document_catalog import STATUS_PROCESSING, get_document_catalog
 from app.services.document_manager import get_document_manager
 from app.services.progress_tracker import get_progress_tracker
+from app.services.llm_scheduler import llm_priority, PRIORITY_BACKGROUND
+from app.services.metrics import JOBS_IN_PROGRESS
 
 router = APIRouter()
 
@@ -29,7 +37,9 @@ class DocumentInfo(BaseModel):
     chunk_count: int
     uploaded_at: datetime | None = None
     processed: bool
+    status: str | None = None
     subject: str | None = None
+    aliases: List[str] = []
 
 
 class DocumentListResponse(BaseModel):
@@ -73,14 +83,17 @@ async def _process_document_background(
             details="Dokument wird analysiert und in Textabschnitte aufgeteilt"
         )
 
-        result = await pipeline.process_document(
-            file_path=file_path,
-            subject=subject,
-            assistant=assistant,
-            graph_builder=graph_builder,
-            document_id=document_id,
-            progress_tracker=tracker
-        )
+        # Ingestion yields OpenAI capacity to interactive queries
+        job = JOBS_IN_PROGRESS.labels("ingestion").track_inprogress()
+        with llm_priority(PRIORITY_BACKGROUND), job:
+            result = await pipeline.process_document(
+                file_path=file_path,
+                subject=subject,
+                assistant=assistant,
+                graph_builder=graph_builder,
+                document_id=document_id,
+                progress_tracker=tracker
+            )
 
         # Mark as complete
         tracker.complete_progress(document_id, result)
@@ -88,9 +101,90 @@ async def _process_document_background(
         logger.info(f"Background processing completed for {filename}: {result}")
     except Exception as e:
         logger.error(f"Background processing failed for {filename}: {str(e)}")
+        get_document_catalog().mark_failed(document_id, str(e))
+        tracker.error_progress(document_id, str(e))
+
+
+async def _reprocess_document_background(
+    file_path: Path,
+    subject: str | None,
+    document_id: str
+):
+    """Background task for incremental document reprocessing."""
+    tracker = get_progress_tracker()
+
+    try:
+        logger.info(f"Starting background reprocessing for {file_path.name}")
+        tracker.create_progress(document_id, file_path.name)
+
+        job = JOBS_IN_PROGRESS.labels("reprocessing").track_inprogress()
+        with llm_priority(PRIORITY_BACKGROUND), job:
+            result = await get_document_pipeline().reprocess_document(
+                file_path=file_path,
+                document_id=document_id,
+                subject=subject,
+                assistant=get_rag_assistant(),
+                graph_builder=get_graph_builder(),
+                progress_tracker=tracker
+            )
+
+        tracker.complete_progress(document_id, result)
+        logger.info(f"Background reprocessing completed for {file_path.name}: {result}")
+    except Exception as e:
+        logger.error(f"Background reprocessing failed for {file_path.name}: {str(e)}")
+        get_document_catalog().mark_failed(document_id, str(e))
         tracker.error_progress(document_id, str(e))
 
 
+async def _stream_upload(
+    file: UploadFile, target: Path, settings: Settings
+) -> Tuple[Path, int, str]:
+    """
+    Stream an upload to disk in fixed-size chunks, hashing it on the way.
+    Chunks go to a temporary file next to the target (non-blocking I/O), so
+    memory per upload is bounded by the chunk size; the caller moves it into
+    place or discards it.
+
+    Args:
+        file: Uploaded file
+        target: Final file path
+        settings: Application settings
+
+    Returns:
+        Tuple of (temporary file path, size in bytes, hex SHA-256 of the contents)
+
+    Raises:
+        HTTPException: 413 if the file exceeds the upload size limit
+    """
+    max_bytes = settings.max_upload_size_mb * 1024 * 1024
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size: {settings.max_upload_size_mb}MB"
+    )
+    if file.size is not None and file.size > max_bytes:
+        raise too_large
+
+    chunk_size = settings.upload_chunk_size_kb * 1024
+    temp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        async with await anyio.open_file(temp_path, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise too_large
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        # Also on cancellation (client disconnect), hence no await here
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return temp_path, size, digest.hexdigest()
+
+
 @router.post("/upload", response_model=DocumentUploadResponse)
 async def upload_document(
     background_tasks: BackgroundTasks,
@@ -104,7 +198,12 @@ async def upload_document(
     1. Stored in the uploads directory
     2. Processed in the background (chunked, added to ChromaDB, entities extracted, flashcards generated)
 
+    A byte-identical copy of an existing document is not stored or processed
+    again: its filename becomes an alias of that document, which keeps its
+    chunks, vectors, graph entities and flashcards.
+
     This endpoint returns IMMEDIATELY after file validation and saving.
+    The file is streamed to disk in chunks, never held in memory as a whole.
     Processing happens asynchronously in the background.
 
     Args:
@@ -114,7 +213,8 @@ async def upload_document(
         settings: Application settings
 
     Returns:
-        Upload confirmation with document ID (processing continues in background)
+        Upload confirmation with document ID (processing continues in background),
+        or the existing document's ID with status "duplicate"
     """
     try:
         # Validate file type
@@ -124,27 +224,59 @@ async def upload_document(
                 detail="Only PDF files are supported"
             )
 
-        # Check file size
-        contents = await file.read()
-        file_size_mb = len(contents) / (1024 * 1024)
-
-        if file_size_mb > settings.max_upload_size_mb:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size: {settings.max_upload_size_mb}MB"
-            )
-
-        # Save file
+        # Stream to a temporary file (enforces the size limit while streaming)
         file_path = settings.upload_dir / file.filename
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        temp_path, file_size_bytes, content_hash = await _stream_upload(file, file_path, settings)
+        file_size_mb = file_size_bytes / (1024 * 1024)
+        catalog = get_document_catalog()
+
+        try:
+            existing = None
+            if settings.upload_dedup_enabled:
+                existing = catalog.get_by_content_hash(content_hash)
+
+            if existing is None:
+                # Register before the next await, so a concurrent identical upload finds it
+                document_id = str(uuid.uuid4())
+                catalog.add_document(
+                    document_id=document_id,
+                    filename=file.filename,
+                    file_size_bytes=file_size_bytes,
+                    content_hash=content_hash,
+                    subject=subject
+                )
+                try:
+                    await asyncio.to_thread(os.replace, temp_path, file_path)
+                except BaseException:
+                    catalog.delete_document(document_id)
+                    raise
+        finally:
+            # Discards the copy of a duplicate; no-op once moved into place
+            temp_path.unlink(missing_ok=True)
+
+        if existing is not None:
+            if file.filename != existing["filename"]:
+                catalog.add_alias(existing["id"], file.filename)
+            logger.info(
+                f"Upload {file.filename} is identical to {existing['filename']}, "
+                f"linked to document {existing['id']} without reprocessing"
+            )
+            return DocumentUploadResponse(
+                document_id=existing["id"],
+                filename=existing["filename"],
+                status="duplicate",
+                message=f"Identical document already uploaded as '{existing['filename']}'. "
+                        f"Its chunks, graph and flashcards are reused.",
+                details={
+                    "file_size_mb": round(file_size_mb, 2),
+                    "alias": file.filename,
+                    "document_status": existing["status"],
+                    "subject": existing["subject"]
+                }
+            )
 
         logger.info(f"Saved uploaded file: {file.filename} ({file_size_mb:.2f}MB)")
 
-        # Generate document ID
-        import uuid
-        document_id = str(uuid.uuid4())
-
         # Add background task for processing
         background_tasks.add_task(
             _process_document_background,
@@ -199,7 +331,7 @@ async def list_documents(
 
         return DocumentListResponse(
             documents=[DocumentInfo(**doc) for doc in documents],
-            total=len(documents)
+            total=doc_manager.count_documents(subject=subject)
         )
     except Exception as e:
         logger.error(f"Error listing documents: {str(e)}")
@@ -336,7 +468,7 @@ async def generate_more_flashcards(
 
         # Process document to get chunks
         doc_processor = DocumentProcessor()
-        documents = doc_processor.process_pdf(file_path)
+        documents = await doc_processor.aprocess_pdf(file_path)
 
         # Generate flashcards
         flashcard_generator = FlashcardGenerator()
@@ -362,26 +494,104 @@ async def generate_more_flashcards(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/{document_id}/reprocess")
+@router.post("/{document_id}/reprocess", response_model=DocumentUploadResponse)
 async def reprocess_document(
     document_id: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile | None = File(
+        None, description="Optional corrected PDF replacing the stored file"
+    ),
     settings: Settings = Depends(get_settings)
 ):
     """
-    Reprocess a document (useful after configuration changes).
+    Reprocess a document (useful after configuration changes or a corrected upload).
+    New and old chunks are diffed by content hash: unchanged chunks keep their
+    vectors, graph links and flashcards; only added chunks are embedded and
+    analysed, removed chunks are deleted. Runs in the background, progress is
+    reported like for uploads.
 
     Args:
         document_id: Document ID
+        background_tasks: FastAPI background tasks
+        file: Optional replacement PDF
         settings: Application settings
 
     Returns:
-        Reprocessing confirmation
+        Reprocessing confirmation (processing continues in background)
+
+    Raises:
+        HTTPException: 409 if the document is still being processed
     """
-    # TODO: Implement document reprocessing
-    raise HTTPException(
-        status_code=501,
-        detail="Document reprocessing not yet implemented"
+    already_processing = HTTPException(
+        status_code=409,
+        detail=f"Document '{document_id}' is already being processed"
     )
+    temp_path = None
+    try:
+        catalog = get_document_catalog()
+        document = catalog.get_document(document_id)
+        if not document:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Document '{document_id}' not found"
+            )
+        if document["status"] == STATUS_PROCESSING:
+            raise already_processing
+
+        file_path = settings.upload_dir / document["filename"]
+        file_size_bytes = content_hash = None
+
+        if file is not None:
+            if not file.filename.endswith('.pdf'):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Only PDF files are supported"
+                )
+            temp_path, file_size_bytes, content_hash = await _stream_upload(
+                file, file_path, settings
+            )
+        elif not file_path.exists():
+            raise HTTPException(
+                status_code=404,
+                detail=f"File for document '{document_id}' not found"
+            )
+
+        # Claimed atomically, so concurrent requests never run two jobs or swap the file mid-run
+        if not catalog.mark_reprocessing(document_id, file_size_bytes, content_hash):
+            raise already_processing
+
+        if temp_path is not None:
+            # Keep the stored filename so existing chunk metadata stays valid
+            try:
+                await asyncio.to_thread(os.replace, temp_path, file_path)
+            except Exception as e:
+                catalog.mark_failed(document_id, f"Replacing file: {str(e)}")
+                raise
+            logger.info(f"Replaced file of document {document_id}: {document['filename']}")
+
+        background_tasks.add_task(
+            _reprocess_document_background,
+            file_path=file_path,
+            subject=document["subject"],
+            document_id=document_id
+        )
+
+        return DocumentUploadResponse(
+            document_id=document_id,
+            filename=document["filename"],
+            status="processing",
+            message="Document reprocessing started. Only changed chunks are re-embedded.",
+            details={"replaced_file": file is not None}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting reprocessing: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if temp_path is not None:
+            temp_path.unlink(missing_ok=True)
 
 
 @router.get("/{document_id}/download")
@@ -433,7 +643,7 @@ async def cleanup_orphaned_chunks(
             }
 
         # Get list of existing document IDs
-        existing_docs = manager.list_documents()
+        existing_docs = manager.list_documents(limit=None)
         existing_doc_ids = {doc["id"] for doc in existing_docs}
 
         # Get list of existing filenames
@@ -469,7 +679,7 @@ async def cleanup_orphaned_chunks(
 
         # Delete orphaned chunks
         if orphaned_ids:
-            manager.collection.delete(ids=orphaned_ids)
+            manager.delete_chunks(orphaned_ids)
             logger.info(f"Cleaned up {len(orphaned_ids)} orphaned chunks from ChromaDB")
 
         return {
@@ -3,14 +3,17 @@ RAG API Routes
 Endpoints for document-based question answering.
 """
 
-from typing import List, Dict, Any
+import json
+from typing import AsyncGenerator, List, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from loguru import logger
 
 from app.api.dependencies import get_rag_assistant, get_settings
-from app.services.rag.rag_chain import RAGAssistant
+from app.services.metrics import JOBS_IN_PROGRESS, SSE_SUBSCRIBERS
+from app.services.rag.rag_chain import DEFAULT_CONVERSATION_ID, RAGAssistant
 from app.config import Settings
 
 router = APIRouter()
@@ -26,12 +29,18 @@ class Source(BaseModel):
     file: str
     page: int
     content_preview: str
+    pages: List[int] | None = None
 
 
 class QueryResponse(BaseModel):
     answer: str
     sources: List[Source]
     conversation_id: str
+    timings: Dict[str, float] | None = None
+
+
+class BatchQueryRequest(BaseModel):
+    questions: List[str]
 
 
 class ConversationClearResponse(BaseModel):
@@ -62,15 +71,18 @@ async def query_documents(
         Answer with sources and citations
     """
     try:
-        # Query the RAG system
-        result = assistant.ask(request.question)
+        conversation_id = request.conversation_id or DEFAULT_CONVERSATION_ID
+
+        # Query the RAG system within the caller's conversation
+        result = await assistant.aask(request.question, conversation_id)
 
         # Convert sources to response model
         sources = [
             Source(
                 file=src["file"],
                 page=src["page"],
-                content_preview=src["content_preview"]
+                content_preview=src["content_preview"],
+                pages=src.get("pages")
             )
             for src in result["sources"]
         ]
@@ -78,7 +90,8 @@ async def query_documents(
         return QueryResponse(
             answer=result["answer"],
             sources=sources,
-            conversation_id=request.conversation_id or "default"
+            conversation_id=conversation_id,
+            timings=result.get("timings")
         )
 
     except Exception as e:
@@ -86,6 +99,130 @@ async def query_documents(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def answer_event_generator(
+    assistant: RAGAssistant,
+    question: str,
+    conversation_id: str
+) -> AsyncGenerator[str, None]:
+    """
+    Generate SSE events for a streamed answer.
+
+    Args:
+        assistant: RAG assistant instance
+        question: User question
+        conversation_id: Conversation whose history is used and extended
+
+    Yields:
+        SSE formatted "sources", "token", "done" or "error" events
+    """
+    try:
+        with SSE_SUBSCRIBERS.labels("rag_answer").track_inprogress():
+            async for event in assistant.astream(question, conversation_id):
+                event_type = event.pop("type")
+                if event_type == "sources":
+                    event["sources"] = [Source(**src).model_dump() for src in event["sources"]]
+                elif event_type == "done":
+                    event["conversation_id"] = conversation_id
+                yield f"event: {event_type}\ndata: {json.dumps(event)}\n\n"
+
+    except Exception as e:
+        logger.error(f"Error in streamed RAG query: {str(e)}")
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+
+@router.post("/query/stream")
+async def query_documents_stream(
+    request: QueryRequest,
+    assistant: RAGAssistant = Depends(get_rag_assistant)
+):
+    """
+    Query the knowledge base and stream the answer via Server-Sent Events.
+
+    Emits one "sources" event with the retrieved sources, then a "token"
+    event per answer token and a final "done" event with the full answer.
+
+    Args:
+        request: Query request with question
+        assistant: RAG assistant instance
+
+    Returns:
+        SSE stream of answer events
+    """
+    return StreamingResponse(
+        answer_event_generator(
+            assistant, request.question, request.conversation_id or DEFAULT_CONVERSATION_ID
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        }
+    )
+
+
+async def batch_result_generator(
+    assistant: RAGAssistant,
+    questions: List[str]
+) -> AsyncGenerator[str, None]:
+    """
+    Generate NDJSON lines for a batch query.
+
+    Args:
+        assistant: RAG assistant instance
+        questions: Questions to answer
+
+    Yields:
+        One JSON line per answered question, in completion order
+    """
+    try:
+        with JOBS_IN_PROGRESS.labels("batch_query").track_inprogress():
+            async for result in assistant.abatch(questions):
+                if "sources" in result:
+                    result["sources"] = [Source(**src).model_dump() for src in result["sources"]]
+                yield json.dumps(result) + "\n"
+
+    except Exception as e:
+        logger.error(f"Error in batch RAG query: {str(e)}")
+        yield json.dumps({"error": str(e)}) + "\n"
+
+
+@router.post("/query/batch")
+async def query_documents_batch(
+    request: BatchQueryRequest,
+    assistant: RAGAssistant = Depends(get_rag_assistant),
+    settings: Settings = Depends(get_settings)
+):
+    """
+    Answer a list of independent questions (e.g. an exam sheet).
+
+    Questions are embedded and searched together, answers are generated
+    with bounded concurrency and streamed back as NDJSON in completion
+    order; each line carries the question's index in the request.
+
+    Args:
+        request: Batch request with questions
+        assistant: RAG assistant instance
+        settings: Application settings
+
+    Returns:
+        NDJSON stream of answers
+    """
+    if not request.questions:
+        raise HTTPException(status_code=400, detail="No questions given")
+    if len(request.questions) > settings.batch_query_max_questions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.batch_query_max_questions} questions per batch"
+        )
+
+    return StreamingResponse(
+        batch_result_generator(assistant, request.questions),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/clear", response_model=ConversationClearResponse)
 async def clear_conversation(
     conversation_id: str | None = None,
@@ -102,7 +239,7 @@ async def clear_conversation(
         Confirmation message
     """
     try:
-        assistant.clear_conversation()
+        assistant.clear_conversation(conversation_id or DEFAULT_CONVERSATION_ID)
         logger.info("Cleared conversation history")
 
         return ConversationClearResponse(
@@ -117,22 +254,24 @@ async def clear_conversation(
 
 @router.get("/stats", response_model=StatsResponse)
 async def get_stats(
+    conversation_id: str | None = None,
     assistant: RAGAssistant = Depends(get_rag_assistant)
 ):
     """
     Get RAG system statistics.
 
     Args:
+        conversation_id: Optional conversation whose length is reported
         assistant: RAG assistant instance
 
     Returns:
         System statistics
     """
     try:
-        stats = assistant.get_stats()
+        stats = assistant.get_stats(conversation_id or DEFAULT_CONVERSATION_ID)
 
         return StatsResponse(
-            total_documents=len(assistant.get_all_documents()),
+            total_documents=assistant.get_document_count(),
             total_chunks=stats["collection"]["document_count"],
             conversation_length=stats["conversation_length"],
             model=stats["model"]
@@ -0,0 +1,98 @@
+"""
+One-off cleanup of duplicate chunks in the Chroma collection.
+
+Before chunk IDs were deterministic, retried batches, double uploads and
+re-runs after crashes stored the same chunk several times under random
+IDs. This job groups chunks by (document, page, content hash), keeps the
+first stored copy of each group and deletes the others from Chroma and
+the derived indexes. Catalog chunk counts are corrected afterwards.
+
+Usage (from backend/):
+    python -m app.cli.dedupe_chunks --dry-run
+    python -m app.cli.dedupe_chunks
+"""
+
+import argparse
+import sys
+from collections import Counter
+from typing import Dict, List, Optional
+
+from chromadb.api.models.Collection import Collection
+
+from app.services.document_catalog import get_document_catalog
+from app.services.document_manager import get_document_manager
+from app.services.rag.document_processor import chunk_content_hash
+
+
+def find_duplicate_chunks(collection: Collection, page_size: int = 1000) -> Dict[str, List[str]]:
+    """
+    Group duplicate chunks of a collection.
+
+    Args:
+        collection: ChromaDB collection
+        page_size: Chunks fetched per request
+
+    Returns:
+        Mapping of kept chunk ID to the IDs of its duplicates
+    """
+    first_seen: Dict[tuple, str] = {}
+    duplicates: Dict[str, List[str]] = {}
+
+    for offset in range(0, collection.count(), page_size):
+        page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+        for chunk_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+            metadata = metadata or {}
+            key = (
+                metadata.get("document_id") or metadata.get("source_file"),
+                metadata.get("page", metadata.get("page_number")),
+                metadata.get("content_hash") or chunk_content_hash(text or ""),
+            )
+            if key in first_seen:
+                duplicates.setdefault(first_seen[key], []).append(chunk_id)
+            else:
+                first_seen[key] = chunk_id
+
+    return duplicates
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report duplicates")
+    parser.add_argument("--batch-size", type=int, default=500, help="Chunks deleted per request")
+    args = parser.parse_args(argv)
+
+    manager = get_document_manager()
+    collection = manager.collection
+    total = collection.count()
+    duplicates = find_duplicate_chunks(collection)
+    redundant = [chunk_id for ids in duplicates.values() for chunk_id in ids]
+
+    print(f"{total} chunks, {len(redundant)} duplicates in {len(duplicates)} groups")
+    if args.dry_run or not redundant:
+        return 0
+
+    for start in range(0, len(redundant), args.batch_size):
+        manager.delete_chunks(redundant[start:start + args.batch_size])
+        deleted = min(start + args.batch_size, len(redundant))
+        print(f"\rDeleted {deleted}/{len(redundant)}", end="", flush=True)
+    print()
+
+    # Correct catalog chunk counts
+    remaining = Counter(
+        (metadata or {}).get("document_id")
+        for metadata in collection.get(include=["metadatas"])["metadatas"]
+    )
+    catalog = get_document_catalog()
+    for document in catalog.list_documents(limit=None):
+        if document["id"] in remaining and document["chunk_count"] != remaining[document["id"]]:
+            catalog.update_chunk_count(document["id"], remaining[document["id"]])
+
+    print(f"Done: {collection.count()} chunks remain")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Offline migration of a Chroma collection to another embedding dimension.
+
+Copies every chunk (same IDs, texts and metadata) into a new collection,
+either re-projecting the stored vectors (truncate + L2-normalize, valid for
+the Matryoshka-trained text-embedding-3 models) or re-embedding the texts.
+Progress is checkpointed per batch so an interrupted run can be resumed.
+
+Usage (from backend/):
+    python -m app.cli.migrate_embeddings --target study_documents_512 --dimensions 512
+    python -m app.cli.migrate_embeddings --target study_documents_512 --dimensions 512 \
+        --mode reembed
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+from chromadb.api import ClientAPI
+from langchain_core.embeddings import Embeddings
+
+from app.config import get_settings
+from app.services.shared_chroma import (
+    EmbeddingMismatchError,
+    embedding_metadata,
+    get_chroma_client,
+    verify_embedding_metadata,
+)
+
+MODES = ("reproject", "reembed")
+
+# Models trained with Matryoshka representation learning, whose prefixes are valid embeddings
+MATRYOSHKA_MODEL_PREFIX = "text-embedding-3-"
+
+
+def reproject(vectors: List[List[float]], dimensions: int) -> List[List[float]]:
+    """
+    Shorten embeddings by truncation and re-normalization.
+
+    Args:
+        vectors: Full-size embeddings
+        dimensions: Target dimensions
+
+    Returns:
+        Shortened, L2-normalized embeddings
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if dimensions > matrix.shape[1]:
+        raise ValueError(f"Cannot re-project {matrix.shape[1]} dimensions up to {dimensions}")
+    matrix = matrix[:, :dimensions]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms == 0, 1, norms)).tolist()
+
+
+def migrate_collection(
+    client: ClientAPI,
+    source_name: str,
+    target_name: str,
+    dimensions: int,
+    mode: str = "reproject",
+    model: Optional[str] = None,
+    batch_size: int = 500,
+    checkpoint_path: Optional[Path] = None,
+    embeddings: Optional[Embeddings] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Copy a collection into a new collection with another embedding dimension.
+
+    Args:
+        client: ChromaDB client
+        source_name: Collection to migrate
+        target_name: Collection to create or resume
+        dimensions: Target embedding dimensions
+        mode: "reproject" stored vectors or "reembed" the texts
+        model: Embedding model recorded on the target (default: the source's model
+            when re-projecting, otherwise from settings)
+        batch_size: Chunks per batch
+        checkpoint_path: JSON file recording the migrated offset (enables resume)
+        embeddings: Embeddings used for "reembed"
+        progress: Callback receiving (migrated, total)
+
+    Returns:
+        Number of chunks written to the target collection in this run
+
+    Raises:
+        EmbeddingMismatchError: If the target exists with another embedding space, or
+            the source model cannot be re-projected
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown migration mode: {mode}")
+    if mode == "reembed" and embeddings is None:
+        raise ValueError("Mode 'reembed' requires an embeddings instance")
+
+    source = client.get_collection(source_name)
+    if mode == "reproject":
+        source_model = (source.metadata or {}).get("embedding_model") or "an unrecorded model"
+        if not source_model.startswith(MATRYOSHKA_MODEL_PREFIX):
+            raise EmbeddingMismatchError(
+                f"Collection '{source_name}' was embedded with {source_model}; "
+                f"only {MATRYOSHKA_MODEL_PREFIX}* embeddings can be re-projected. "
+                "Use --mode reembed instead."
+            )
+        # Re-projected vectors stay in the source model's embedding space
+        model = model or source_model
+
+    expected = embedding_metadata(model, dimensions)
+    target = client.get_or_create_collection(name=target_name, metadata=expected)
+    verify_embedding_metadata(target, expected)
+
+    offset = 0
+    if checkpoint_path and checkpoint_path.exists():
+        checkpoint = json.loads(checkpoint_path.read_text())
+        if checkpoint.get("source") == source_name and checkpoint.get("target") == target_name:
+            offset = checkpoint["offset"]
+
+    total = source.count()
+    written = 0
+    include = ["metadatas", "documents"] + (["embeddings"] if mode == "reproject" else [])
+
+    while offset < total:
+        page = source.get(include=include, limit=batch_size, offset=offset)
+        if not page["ids"]:
+            break
+
+        # Skip chunks a previous, interrupted run already wrote after its last checkpoint
+        existing = set(target.get(ids=page["ids"], include=[])["ids"])
+        keep = [i for i, chunk_id in enumerate(page["ids"]) if chunk_id not in existing]
+
+        if keep:
+            ids = [page["ids"][i] for i in keep]
+            texts = [page["documents"][i] or "" for i in keep]
+            if mode == "reproject":
+                vectors = reproject([page["embeddings"][i] for i in keep], dimensions)
+            else:
+                vectors = embeddings.embed_documents(texts)
+            target.add(
+                ids=ids,
+                embeddings=vectors,
+                metadatas=[page["metadatas"][i] for i in keep],
+                documents=texts,
+            )
+            written += len(ids)
+
+        offset += len(page["ids"])
+        if checkpoint_path:
+            checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            checkpoint_path.write_text(
+                json.dumps({"source": source_name, "target": target_name, "offset": offset})
+            )
+        if progress:
+            progress(offset, total)
+
+    return written
+
+
+def _print_progress(start: float) -> Callable[[int, int], None]:
+    """Progress callback printing a single updating status line."""
+
+    def report(done: int, total: int) -> None:
+        elapsed = time.monotonic() - start
+        rate = done / elapsed if elapsed else 0.0
+        eta = (total - done) / rate if rate else 0.0
+        print(
+            f"\r{done}/{total} chunks ({done / total:.0%}) - {rate:.0f}/s - ETA {eta:.0f}s",
+            end="",
+            flush=True,
+        )
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--source", default=settings.collection_name, help="Collection to migrate")
+    parser.add_argument("--target", required=True, help="New collection name")
+    parser.add_argument("--dimensions", type=int, required=True, help="Target embedding dimensions")
+    parser.add_argument("--mode", choices=MODES, default="reproject")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    embeddings = None
+    if args.mode == "reembed":
+        from app.services.llm_clients import create_embeddings
+
+        embeddings = create_embeddings(dimensions=args.dimensions)
+
+    checkpoint = settings.data_dir / "migrations" / f"{args.source}__{args.target}.json"
+    try:
+        written = migrate_collection(
+            get_chroma_client(),
+            args.source,
+            args.target,
+            args.dimensions,
+            mode=args.mode,
+            batch_size=args.batch_size,
+            checkpoint_path=checkpoint,
+            embeddings=embeddings,
+            progress=_print_progress(time.monotonic()),
+        )
+    except EmbeddingMismatchError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"\nMigrated {written} chunks into '{args.target}'.")
+    print(f"Activate it with COLLECTION_NAME={args.target} "
+          f"and EMBEDDING_DIMENSIONS={args.dimensions}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -43,12 +43,90 @@ class Settings(BaseSettings):
 
     # OpenAI Configuration
     openai_api_key: str = Field(..., description="OpenAI API key")
+    openai_base_url: Optional[str] = Field(
+        default=None,
+        description="OpenAI-compatible API base URL (e.g. a local fake server for load tests)"
+    )
+
+    # OpenAI Connection Pool (shared by all LLM, embedding and vision clients)
+    openai_max_connections: int = Field(
+        default=50,
+        gt=0,
+        description="Maximum concurrent HTTP connections to the OpenAI API"
+    )
+    openai_max_keepalive_connections: int = Field(
+        default=20,
+        ge=0,
+        description="Idle connections kept open for reuse"
+    )
+    openai_keepalive_expiry_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds an idle connection is kept open"
+    )
+    openai_timeout_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Total timeout per OpenAI request"
+    )
+    openai_connect_timeout_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="Connection timeout for OpenAI requests"
+    )
+    openai_max_retries: int = Field(
+        default=2,
+        ge=0,
+        description="Retries of failed OpenAI requests"
+    )
+
+    # LLM Scheduler (rate limits and priorities of all OpenAI requests)
+    llm_scheduler_enabled: bool = Field(
+        default=True,
+        description="Admit OpenAI requests through RPM/TPM token buckets with interactive priority"
+    )
+    openai_rpm_limit: int = Field(
+        default=500,
+        gt=0,
+        description="Requests per minute per chat model"
+    )
+    openai_tpm_limit: int = Field(
+        default=200000,
+        gt=0,
+        description="Tokens per minute per chat model"
+    )
+    openai_embedding_rpm_limit: int = Field(
+        default=3000,
+        gt=0,
+        description="Requests per minute per embedding model"
+    )
+    openai_embedding_tpm_limit: int = Field(
+        default=1000000,
+        gt=0,
+        description="Tokens per minute per embedding model"
+    )
+    llm_interactive_reserve: float = Field(
+        default=0.2,
+        ge=0.0,
+        lt=1.0,
+        description="Share of each rate limit background work leaves for interactive requests"
+    )
+    llm_retry_max_delay_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Longest wait before retrying a throttled OpenAI request"
+    )
 
     # Model Configuration - RAG
     embedding_model: str = Field(
         default="text-embedding-3-small",
         description="OpenAI embedding model"
     )
+    embedding_dimensions: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Shortened embedding dimensions (text-embedding-3 only, default: native size)"
+    )
     llm_model: str = Field(
         default="gpt-4o-mini",
         description="OpenAI LLM model for chat"
@@ -76,6 +154,22 @@ class Settings(BaseSettings):
         ge=0,
         description="Chunk overlap"
     )
+    pdf_parse_workers: int = Field(
+        default=4,
+        ge=0,
+        description="Worker processes for PDF text extraction (0 = a thread of the API process)"
+    )
+    pdf_parse_pages_per_task: int = Field(
+        default=16,
+        gt=0,
+        description="Pages per parsing task; larger PDFs are parsed as page ranges in parallel"
+    )
+    pdf_extractor: str = Field(
+        default="pypdf",
+        pattern="^(pypdf|pdfium|pymupdf)$",
+        description="PDF text extractor: 'pypdf', 'pdfium' (pypdfium2) or 'pymupdf' "
+                    "(falls back to pypdf if not installed)"
+    )
 
     # Advanced PDF Processing (State-of-the-art 2025)
     use_advanced_pdf_processing: bool = Field(
@@ -104,6 +198,30 @@ class Settings(BaseSettings):
         default=Path("./data/flashcards/flashcards.db"),
         description="SQLite flashcards database"
     )
+    catalog_db_path: Path = Field(
+        default=Path("./data/catalog/documents.db"),
+        description="SQLite document catalog"
+    )
+    sparse_index_path: Path = Field(
+        default=Path("./data/sparse_index/bm25.db"),
+        description="SQLite BM25 inverted index"
+    )
+    near_duplicate_index_path: Path = Field(
+        default=Path("./data/near_duplicates/signatures.db"),
+        description="SQLite MinHash signatures for collection-wide near-duplicate detection"
+    )
+    conversation_db_path: Path = Field(
+        default=Path("./data/conversations/conversations.db"),
+        description="SQLite store of per-conversation chat histories"
+    )
+    local_index_dir: Path = Field(
+        default=Path("./data/local_index"),
+        description="Memory-mapped local vector index"
+    )
+    embedding_cache_path: Path = Field(
+        default=Path("./data/embedding_cache/embeddings.db"),
+        description="SQLite embedding cache"
+    )
 
     # Vector Store Configuration
     collection_name: str = Field(
@@ -116,6 +234,171 @@ class Settings(BaseSettings):
         description="Number of documents to retrieve"
     )
 
+    # Near-Duplicate Detection Configuration
+    near_duplicate_enabled: bool = Field(
+        default=True,
+        description="Collapse near-identical chunks (slide templates, disclaimers) at ingest"
+    )
+    near_duplicate_threshold: float = Field(
+        default=0.85,
+        gt=0.0,
+        le=1.0,
+        description="Estimated Jaccard similarity above which chunks count as near-duplicates"
+    )
+    near_duplicate_num_perm: int = Field(
+        default=128,
+        gt=0,
+        description="MinHash signature length"
+    )
+    near_duplicate_scope: str = Field(
+        default="document",
+        pattern="^(document|collection)$",
+        description="Collapse within each document, or also other documents' chunks (at query time)"
+    )
+
+    # Hybrid Search Configuration
+    hybrid_search_enabled: bool = Field(
+        default=True,
+        description="Fuse BM25 keyword search with vector search (reciprocal-rank fusion)"
+    )
+    hybrid_candidate_k: int = Field(
+        default=20,
+        gt=0,
+        description="Candidates fetched from each of the sparse and dense searches"
+    )
+    hybrid_rrf_k: int = Field(
+        default=60,
+        gt=0,
+        description="Reciprocal-rank fusion damping constant"
+    )
+    hybrid_sparse_shortcut: bool = Field(
+        default=False,
+        description="Answer exact-reference queries (§, section numbers, quotes) from BM25 only "
+                    "when the best BM25 hit contains the reference verbatim"
+    )
+
+    # Dense Search Backend Configuration
+    search_backend: str = Field(
+        default="chroma",
+        pattern="^(chroma|local)$",
+        description="Dense search backend: 'chroma' or 'local' (memory-mapped exact index)"
+    )
+    local_index_dtype: str = Field(
+        default="float32",
+        pattern="^(float32|float16)$",
+        description="Storage dtype of the local vector index"
+    )
+    local_index_compact_ratio: float = Field(
+        default=0.25,
+        gt=0.0,
+        lt=1.0,
+        description="Share of deleted rows after which the local index is compacted"
+    )
+    vector_quantization: str = Field(
+        default="none",
+        pattern="^(none|int8|binary)$",
+        description="In-memory first-pass codes of the local index: 'none', 'int8' or 'binary' "
+                    "(shrinks the local index only; Chroma keeps its float32 HNSW copy in memory)"
+    )
+    quantization_rerank_candidates: int = Field(
+        default=200,
+        gt=0,
+        description="Candidates rescored against full-precision vectors (before calibration)"
+    )
+    quantization_recall_target: float = Field(
+        default=0.95,
+        gt=0.0,
+        le=1.0,
+        description="Recall@k the rerank candidate count is calibrated to reach"
+    )
+
+    # RAG Query Concurrency Configuration
+    rag_thread_pool_size: int = Field(
+        default=16,
+        gt=0,
+        description="Threads for blocking retrieval and storage calls of async RAG queries"
+    )
+
+    batch_query_concurrency: int = Field(
+        default=8,
+        gt=0,
+        description="Concurrent answer LLM calls of a batch query"
+    )
+    batch_query_max_questions: int = Field(
+        default=500,
+        gt=0,
+        description="Maximum number of questions per batch query"
+    )
+
+    # Speculative Retrieval Configuration
+    speculative_retrieval_enabled: bool = Field(
+        default=True,
+        description="Retrieve for the raw follow-up question while it is being condensed"
+    )
+    speculative_retrieval_threshold: float = Field(
+        default=0.6,
+        ge=0.0,
+        le=1.0,
+        description="Jaccard word overlap of raw and condensed question to keep speculative results"
+    )
+
+    # Conversation Memory Configuration
+    chat_history_compaction_enabled: bool = Field(
+        default=True,
+        description="Fold older turns into a rolling summary instead of sending the full history"
+    )
+    chat_history_keep_turns: int = Field(
+        default=4,
+        gt=0,
+        description="Maximum number of recent turns sent verbatim"
+    )
+    chat_history_token_budget: int = Field(
+        default=1500,
+        gt=0,
+        description="Token budget for summary plus verbatim turns in each prompt"
+    )
+    conversation_cache_size: int = Field(
+        default=1000,
+        gt=0,
+        description="Number of conversations kept in the in-process LRU"
+    )
+    conversation_ttl_seconds: float = Field(
+        default=7 * 24 * 3600.0,
+        gt=0,
+        description="Idle time after which a conversation is deleted"
+    )
+
+    # Embedding Cache Configuration
+    embedding_cache_enabled: bool = Field(
+        default=True,
+        description="Cache chunk embeddings on disk, keyed by model and text hash"
+    )
+    embedding_cache_max_entries: int = Field(
+        default=200_000,
+        gt=0,
+        description="Maximum number of cached embeddings before LRU eviction"
+    )
+    query_embedding_cache_size: int = Field(
+        default=2048,
+        gt=0,
+        description="Number of query embeddings kept in the in-process LRU cache"
+    )
+    query_embedding_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Time-to-live of cached query embeddings"
+    )
+    query_embedding_batch_window_ms: float = Field(
+        default=5.0,
+        ge=0,
+        description="Window for merging concurrent query embeddings into one call (0 = off)"
+    )
+    query_embedding_max_batch_size: int = Field(
+        default=64,
+        gt=0,
+        description="Maximum number of queries per batched embeddings call"
+    )
+
     # Neo4j Configuration
     neo4j_uri: str = Field(
         default="bolt://localhost:7687",
@@ -202,10 +485,34 @@ class Settings(BaseSettings):
         gt=0,
         description="Batch size for processing"
     )
+    embedding_batch_max_tokens: int = Field(
+        default=250_000,
+        gt=0,
+        description="Maximum tokens per embeddings request during ingestion"
+    )
+    embedding_batch_max_inputs: int = Field(
+        default=1000,
+        gt=0,
+        description="Maximum chunks per embeddings request during ingestion"
+    )
+    embedding_max_concurrency: int = Field(
+        default=4,
+        gt=0,
+        description="Concurrent embeddings requests during ingestion"
+    )
     max_upload_size_mb: int = Field(
         default=50,
         description="Maximum file upload size in MB"
     )
+    upload_chunk_size_kb: int = Field(
+        default=1024,
+        gt=0,
+        description="Uploads are streamed to disk in chunks of this size (bounds memory per upload)"
+    )
+    upload_dedup_enabled: bool = Field(
+        default=True,
+        description="Link byte-identical uploads to the existing document instead of re-ingesting"
+    )
 
     # Session Settings
     session_timeout_minutes: int = Field(
@@ -235,6 +542,14 @@ class Settings(BaseSettings):
         # Create flashcards directory
         self.flashcards_db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Create document catalog and embedding cache directories
+        self.catalog_db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sparse_index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.local_index_dir.mkdir(parents=True, exist_ok=True)
+        self.near_duplicate_index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conversation_db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.embedding_cache_path.parent.mkdir(parents=True, exist_ok=True)
+
 
 # Global settings instance
 _settings: Optional[Settings] = None
@@ -5,15 +5,21 @@ Central API for RAG, Voice Buddy, Knowledge Graph, and Flashcards.
 
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from loguru import logger
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.config import get_settings
+from app.services.llm_clients import close_clients
+from app.services.llm_scheduler import get_llm_scheduler
+from app.services.metrics import HTTP_REQUEST_SECONDS
+from app.services.rag.pdf_parsing import shutdown_pdf_parser
 from app.api.routes import rag, voice, graph, flashcards, documents, progress
 
 # Disable ChromaDB telemetry
@@ -44,6 +50,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
 
     # Cleanup on shutdown
     logger.info("Shutting down services...")
+    await close_clients()
+    shutdown_pdf_parser()
 
 
 def create_application() -> FastAPI:
@@ -74,6 +82,21 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Request latency per route template (until the response starts)
+    @app.middleware("http")
+    async def record_request_latency(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                request.method, getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - start)
+
     # Include routers
     app.include_router(
         rag.router,
@@ -123,6 +146,19 @@ def create_application() -> FastAPI:
             "version": settings.app_version
         }
 
+    # LLM scheduler metrics (queue depth, waits, throttling)
+    @app.get("/health/llm")
+    async def llm_scheduler_stats():
+        return {
+            "enabled": settings.llm_scheduler_enabled,
+            **get_llm_scheduler().get_stats()
+        }
+
+    # Prometheus metrics
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
     # Exception handlers
     @app.exception_handler(Exception)
     async def global_exception_handler(request, exc):
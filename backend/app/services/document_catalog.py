@@ -0,0 +1,465 @@
+"""
+Document Catalog
+SQLite-backed catalog with one row per uploaded document, plus the
+alias filenames under which byte-identical copies were uploaded.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from app.config import get_settings
+from app.services.metrics import connect_sqlite
+
+
+# Document status values
+STATUS_PROCESSING = "processing"
+STATUS_PROCESSED = "processed"
+STATUS_ERROR = "error"
+
+# Documents with their alias filenames as a JSON array
+_SELECT_DOCUMENTS = """
+    SELECT d.*,
+           (SELECT json_group_array(a.filename) FROM document_aliases a
+            WHERE a.document_id = d.id) AS aliases
+    FROM documents d
+"""
+
+
+class DocumentCatalog:
+    """
+    Persistent document catalog.
+    Ingestion and deletion keep it up to date so listings never scan
+    the upload directory or ChromaDB.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize document catalog.
+
+        Args:
+            db_path: Optional path to SQLite database
+        """
+        settings = get_settings()
+        self.db_path = Path(db_path or settings.catalog_db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._init_database()
+        logger.info(f"Initialized document catalog with database: {self.db_path}")
+
+    def _init_database(self) -> None:
+        """
+        Initialize database schema.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                content_hash TEXT,
+                file_size_bytes INTEGER NOT NULL DEFAULT 0,
+                page_count INTEGER,
+                chunk_count INTEGER NOT NULL DEFAULT 0,
+                subject TEXT,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at TIMESTAMP NOT NULL,
+                updated_at TIMESTAMP NOT NULL
+            )
+        """)
+
+        # Indexes for pagination and lookups
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_documents_created_at ON documents(created_at)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_documents_subject ON documents(subject, created_at)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_documents_filename ON documents(filename)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash)
+        """)
+
+        # Further filenames of byte-identical uploads
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS document_aliases (
+                filename TEXT PRIMARY KEY,
+                document_id TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_document_aliases_document
+            ON document_aliases(document_id)
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get database connection.
+
+        Returns:
+            SQLite connection
+        """
+        conn = connect_sqlite(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add_document(
+        self,
+        document_id: str,
+        filename: str,
+        file_size_bytes: int,
+        content_hash: Optional[str] = None,
+        subject: Optional[str] = None,
+        status: str = STATUS_PROCESSING,
+        chunk_count: int = 0,
+        page_count: Optional[int] = None,
+        created_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Register a document in the catalog (replaces an existing row with the same ID).
+        An alias with the same filename is dropped, the file now has its own document.
+
+        Args:
+            document_id: Document ID
+            filename: Stored filename
+            file_size_bytes: File size in bytes
+            content_hash: Optional SHA-256 of the file contents
+            subject: Optional subject category
+            status: Initial status
+            chunk_count: Initial chunk count
+            page_count: Optional page count
+            created_at: Optional upload time (default: now)
+        """
+        now = datetime.now().isoformat()
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO documents
+                (id, filename, content_hash, file_size_bytes, page_count, chunk_count,
+                 subject, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                document_id,
+                filename,
+                content_hash,
+                file_size_bytes,
+                page_count,
+                chunk_count,
+                subject,
+                status,
+                created_at.isoformat() if created_at else now,
+                now,
+            ))
+            conn.execute("DELETE FROM document_aliases WHERE filename = ?", (filename,))
+        conn.close()
+
+    def add_alias(self, document_id: str, filename: str) -> None:
+        """
+        Link a filename to an existing document (re-linking an existing alias).
+
+        Args:
+            document_id: Document ID
+            filename: Filename of the identical upload
+        """
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO document_aliases (filename, document_id, created_at)
+                VALUES (?, ?, ?)
+            """, (filename, document_id, datetime.now().isoformat()))
+        conn.close()
+
+    def mark_processed(
+        self,
+        document_id: str,
+        chunk_count: int,
+        page_count: Optional[int] = None
+    ) -> None:
+        """
+        Record successful ingestion of a document.
+
+        Args:
+            document_id: Document ID
+            chunk_count: Number of stored chunks
+            page_count: Optional number of pages
+        """
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                UPDATE documents
+                SET status = ?, chunk_count = ?, page_count = COALESCE(?, page_count),
+                    error = NULL, updated_at = ?
+                WHERE id = ?
+            """, (STATUS_PROCESSED, chunk_count, page_count, datetime.now().isoformat(),
+                  document_id))
+        conn.close()
+
+    def update_chunk_count(self, document_id: str, chunk_count: int) -> None:
+        """
+        Correct the stored chunk count of a document.
+
+        Args:
+            document_id: Document ID
+            chunk_count: Number of stored chunks
+        """
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                UPDATE documents SET chunk_count = ?, updated_at = ? WHERE id = ?
+            """, (chunk_count, datetime.now().isoformat(), document_id))
+        conn.close()
+
+    def mark_reprocessing(
+        self,
+        document_id: str,
+        file_size_bytes: Optional[int] = None,
+        content_hash: Optional[str] = None
+    ) -> bool:
+        """
+        Record the start of a reprocessing run, optionally for a replaced file.
+        Documents that are still being processed are left untouched.
+
+        Args:
+            document_id: Document ID
+            file_size_bytes: Size of the replacement file
+            content_hash: SHA-256 of the replacement file
+
+        Returns:
+            True if the run was started, False if the document is already processing
+        """
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.execute("""
+                UPDATE documents
+                SET status = ?, error = NULL,
+                    file_size_bytes = COALESCE(?, file_size_bytes),
+                    content_hash = COALESCE(?, content_hash),
+                    updated_at = ?
+                WHERE id = ? AND status != ?
+            """, (
+                STATUS_PROCESSING, file_size_bytes, content_hash, datetime.now().isoformat(),
+                document_id, STATUS_PROCESSING,
+            ))
+        conn.close()
+        return cursor.rowcount == 1
+
+    def mark_failed(self, document_id: str, error: str) -> None:
+        """
+        Record failed ingestion of a document.
+
+        Args:
+            document_id: Document ID
+            error: Error message
+        """
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                UPDATE documents SET status = ?, error = ?, updated_at = ? WHERE id = ?
+            """, (STATUS_ERROR, error, datetime.now().isoformat(), document_id))
+        conn.close()
+
+    def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a document by ID.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Document dictionary or None
+        """
+        conn = self._get_connection()
+        row = conn.execute(_SELECT_DOCUMENTS + " WHERE d.id = ?", (document_id,)).fetchone()
+        conn.close()
+        return self._row_to_dict(row) if row else None
+
+    def get_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent document with a given filename or alias.
+
+        Args:
+            filename: Stored filename or alias
+
+        Returns:
+            Document dictionary or None
+        """
+        conn = self._get_connection()
+        row = conn.execute(
+            _SELECT_DOCUMENTS + " WHERE d.filename = ? ORDER BY d.created_at DESC LIMIT 1",
+            (filename,)
+        ).fetchone()
+        if row is None:
+            row = conn.execute(
+                _SELECT_DOCUMENTS
+                + " WHERE d.id = (SELECT document_id FROM document_aliases WHERE filename = ?)",
+                (filename,)
+            ).fetchone()
+        conn.close()
+        return self._row_to_dict(row) if row else None
+
+    def get_by_content_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent document with the given file contents.
+        Failed documents are skipped so their content can be ingested again.
+
+        Args:
+            content_hash: SHA-256 of the file contents
+
+        Returns:
+            Document dictionary or None
+        """
+        conn = self._get_connection()
+        row = conn.execute(
+            _SELECT_DOCUMENTS
+            + " WHERE d.content_hash = ? AND d.status != ? ORDER BY d.created_at DESC LIMIT 1",
+            (content_hash, STATUS_ERROR)
+        ).fetchone()
+        conn.close()
+        return self._row_to_dict(row) if row else None
+
+    def list_documents(
+        self,
+        subject: Optional[str] = None,
+        limit: Optional[int] = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        List documents, newest first.
+
+        Args:
+            subject: Optional subject filter
+            limit: Maximum number of documents (None = all)
+            offset: Number of documents to skip
+
+        Returns:
+            List of document dictionaries
+        """
+        query = _SELECT_DOCUMENTS
+        params: List[Any] = []
+
+        if subject:
+            query += " WHERE d.subject = ?"
+            params.append(subject)
+
+        query += " ORDER BY d.created_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit if limit is not None else -1, offset])
+
+        conn = self._get_connection()
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+        return [self._row_to_dict(row) for row in rows]
+
+    def count_documents(self, subject: Optional[str] = None) -> int:
+        """
+        Count documents.
+
+        Args:
+            subject: Optional subject filter
+
+        Returns:
+            Number of documents
+        """
+        conn = self._get_connection()
+        if subject:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM documents WHERE subject = ?", (subject,)
+            ).fetchone()
+        else:
+            row = conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+        conn.close()
+        return row[0]
+
+    def get_totals(self) -> Dict[str, int]:
+        """
+        Get aggregate document and chunk counts.
+
+        Returns:
+            Dictionary with document and chunk totals
+        """
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(chunk_count), 0) FROM documents"
+        ).fetchone()
+        conn.close()
+        return {"documents": row[0], "chunks": row[1]}
+
+    def delete_document(self, document_id: str) -> bool:
+        """
+        Remove a document and its aliases from the catalog.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            True if a row was deleted
+        """
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+            conn.execute("DELETE FROM document_aliases WHERE document_id = ?", (document_id,))
+        conn.close()
+        return cursor.rowcount > 0
+
+    def clear(self) -> int:
+        """
+        Remove all documents from the catalog.
+
+        Returns:
+            Number of removed rows
+        """
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.execute("DELETE FROM documents")
+            conn.execute("DELETE FROM document_aliases")
+        conn.close()
+        return cursor.rowcount
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        Convert database row to the document info dictionary.
+
+        Args:
+            row: SQLite row
+
+        Returns:
+            Document dictionary
+        """
+        return {
+            "id": row["id"],
+            "filename": row["filename"],
+            "content_hash": row["content_hash"],
+            "file_size_bytes": row["file_size_bytes"],
+            "page_count": row["page_count"],
+            "chunk_count": row["chunk_count"],
+            "uploaded_at": datetime.fromisoformat(row["created_at"]),
+            "updated_at": datetime.fromisoformat(row["updated_at"]),
+            "processed": row["status"] == STATUS_PROCESSED,
+            "status": row["status"],
+            "error": row["error"],
+            "subject": row["subject"],
+            "aliases": json.loads(row["aliases"]),
+        }
+
+
+# Singleton instance
+_document_catalog: Optional[DocumentCatalog] = None
+
+
+def get_document_catalog() -> DocumentCatalog:
+    """Get or create document catalog instance."""
+    global _document_catalog
+    if _document_catalog is None:
+        _document_catalog = DocumentCatalog()
+    return _document_catalog
@@ -12,7 +12,11 @@ from pathlib import Path
 from loguru import logger
 
 from app.config import get_settings
-from app.services.shared_chroma import get_chroma_client
+from app.services.document_catalog import STATUS_ERROR, STATUS_PROCESSED, get_document_catalog
+from app.services.rag.local_index import get_local_index
+from app.services.rag.near_duplicates import get_near_duplicate_index
+from app.services.rag.sparse_index import get_sparse_index
+from app.services.shared_chroma import get_chroma_client, get_collection
 
 
 class DocumentManager:
@@ -21,92 +25,87 @@ class DocumentManager:
     def __init__(self):
         self.settings = get_settings()
         self.chroma_client = get_chroma_client()  # Use shared client
-        self.collection = self.chroma_client.get_or_create_collection(
-            name=self.settings.collection_name
-        )
+        self.collection = get_collection()
+        self.catalog = get_document_catalog()
+        self._register_legacy_uploads()
 
     def _generate_document_id(self, filename: str) -> str:
         """Generate a unique document ID from filename."""
         return hashlib.md5(filename.encode()).hexdigest()[:12]
 
-    def list_documents(
-        self,
-        subject: Optional[str] = None,
-        limit: int = 50,
-        offset: int = 0
-    ) -> List[Dict]:
+    def _register_legacy_uploads(self) -> None:
         """
-        List all uploaded documents with metadata.
-
-        Args:
-            subject: Optional subject filter
-            limit: Maximum number of documents
-            offset: Number of documents to skip
-
-        Returns:
-            List of document info dictionaries
+        Register uploaded files that predate the document catalog.
+        Runs once at startup; afterwards the catalog is maintained by
+        ingestion and deletion.
         """
-        documents = []
         upload_dir = self.settings.upload_dir
-
         if not upload_dir.exists():
-            return documents
+            return
 
-        # Get all PDF files
-        pdf_files = list(upload_dir.glob("*.pdf"))
-
-        # Sort by modification time (newest first)
-        pdf_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-
-        # Apply pagination
-        pdf_files = pdf_files[offset:offset + limit]
+        registered = 0
+        for file_path in upload_dir.glob("*.pdf"):
+            if self.catalog.get_by_filename(file_path.name):
+                continue
 
-        for file_path in pdf_files:
             try:
-                doc_id = self._generate_document_id(file_path.name)
-                file_stats = file_path.stat()
-
-                # Get chunk count from ChromaDB
                 chunk_count = 0
                 try:
-                    # Try new format first (with document_id)
                     results = self.collection.get(
-                        where={"document_id": doc_id},
-                        include=["metadatas"]
+                        where={"source_file": file_path.name},
+                        include=[]
                     )
                     chunk_count = len(results["ids"]) if results["ids"] else 0
-
-                    # Fallback: Try old format (with source_file) for backwards compatibility
-                    if chunk_count == 0:
-                        results = self.collection.get(
-                            where={"source_file": file_path.name},
-                            include=["metadatas"]
-                        )
-                        chunk_count = len(results["ids"]) if results["ids"] else 0
-
                 except Exception as e:
                     logger.warning(f"Could not get chunk count for {file_path.name}: {e}")
 
-                doc_info = {
-                    "id": doc_id,
-                    "filename": file_path.name,
-                    "file_size_bytes": file_stats.st_size,
-                    "page_count": None,  # Would need PyPDF2 to extract
-                    "chunk_count": chunk_count,
-                    "uploaded_at": datetime.fromtimestamp(file_stats.st_ctime),
-                    "processed": chunk_count > 0,
-                    "subject": subject
-                }
-
-                # Filter by subject if provided
-                if subject is None or doc_info.get("subject") == subject:
-                    documents.append(doc_info)
+                file_stats = file_path.stat()
+                self.catalog.add_document(
+                    document_id=self._generate_document_id(file_path.name),
+                    filename=file_path.name,
+                    file_size_bytes=file_stats.st_size,
+                    status=STATUS_PROCESSED if chunk_count > 0 else STATUS_ERROR,
+                    chunk_count=chunk_count,
+                    created_at=datetime.fromtimestamp(file_stats.st_ctime)
+                )
+                registered += 1
 
             except Exception as e:
-                logger.error(f"Error processing file {file_path}: {e}")
-                continue
+                logger.error(f"Error registering file {file_path}: {e}")
 
-        return documents
+        if registered:
+            logger.info(f"Registered {registered} existing uploads in document catalog")
+
+    def list_documents(
+        self,
+        subject: Optional[str] = None,
+        limit: Optional[int] = 50,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        List all uploaded documents with metadata.
+
+        Args:
+            subject: Optional subject filter
+            limit: Maximum number of documents (None = all)
+            offset: Number of documents to skip
+
+        Returns:
+            List of document info dictionaries
+        """
+        return self.catalog.list_documents(subject=subject, limit=limit, offset=offset)
+
+    def count_documents(self, subject: Optional[str] = None) -> int:
+        """
+        Count uploaded documents.
+
+        Args:
+            subject: Optional subject filter
+
+        Returns:
+            Number of documents
+        """
+        return self.catalog.count_documents(subject=subject)
 
     def get_document(self, document_id: str) -> Optional[Dict]:
         """
@@ -118,36 +117,24 @@ class DocumentManager:
         Returns:
             Document info dictionary or None
         """
-        upload_dir = self.settings.upload_dir
-
-        # Find file with matching document_id
-        for file_path in upload_dir.glob("*.pdf"):
-            if self._generate_document_id(file_path.name) == document_id:
-                file_stats = file_path.stat()
+        return self.catalog.get_document(document_id)
 
-                # Get chunk count
-                chunk_count = 0
-                try:
-                    results = self.collection.get(
-                        where={"document_id": document_id},
-                        include=["metadatas"]
-                    )
-                    chunk_count = len(results["ids"]) if results["ids"] else 0
-                except Exception as e:
-                    logger.warning(f"Could not get chunk count: {e}")
-
-                return {
-                    "id": document_id,
-                    "filename": file_path.name,
-                    "file_size_bytes": file_stats.st_size,
-                    "page_count": None,
-                    "chunk_count": chunk_count,
-                    "uploaded_at": datetime.fromtimestamp(file_stats.st_ctime),
-                    "processed": chunk_count > 0,
-                    "subject": None
-                }
+    def delete_chunks(self, chunk_ids: List[str]) -> None:
+        """
+        Delete chunks from ChromaDB and the derived indexes.
 
-        return None
+        Args:
+            chunk_ids: Chunk IDs to delete
+        """
+        if not chunk_ids:
+            return
+        self.collection.delete(ids=chunk_ids)
+        if self.settings.hybrid_search_enabled:
+            get_sparse_index().delete(chunk_ids)
+        if self.settings.search_backend == "local":
+            get_local_index().delete(chunk_ids)
+        if self.settings.near_duplicate_scope == "collection":
+            get_near_duplicate_index().remove_chunks(chunk_ids)
 
     def delete_document(
         self,
@@ -176,13 +163,8 @@ class DocumentManager:
         }
 
         # 1. Delete physical file
-        upload_dir = self.settings.upload_dir
-        file_path = None
-
-        for pdf_file in upload_dir.glob("*.pdf"):
-            if self._generate_document_id(pdf_file.name) == document_id:
-                file_path = pdf_file
-                break
+        document = self.catalog.get_document(document_id)
+        file_path = self.settings.upload_dir / document["filename"] if document else None
 
         if file_path and file_path.exists():
             try:
@@ -204,7 +186,7 @@ class DocumentManager:
 
             chunks_deleted = 0
             if doc_results["ids"]:
-                self.collection.delete(ids=doc_results["ids"])
+                self.delete_chunks(doc_results["ids"])
                 chunks_deleted = len(doc_results["ids"])
                 logger.info(f"Deleted {len(doc_results['ids'])} chunks from ChromaDB (by document_id)")
 
@@ -216,7 +198,7 @@ class DocumentManager:
                     include=["metadatas"]
                 )
                 if old_chunks["ids"]:
-                    self.collection.delete(ids=old_chunks["ids"])
+                    self.delete_chunks(old_chunks["ids"])
                     chunks_deleted += len(old_chunks["ids"])
                     logger.info(f"Deleted {len(old_chunks['ids'])} legacy chunks from ChromaDB (by source_file)")
 
@@ -257,6 +239,9 @@ class DocumentManager:
                 results["errors"].append(error_msg)
                 logger.error(error_msg)
 
+        # 5. Remove from catalog
+        self.catalog.delete_document(document_id)
+
         return results
 
     def clear_all_documents(self) -> Dict[str, any]:
@@ -283,14 +268,20 @@ class DocumentManager:
 
         # Clear ChromaDB collection
         try:
-            self.chroma_client.delete_collection(name=self.settings.chroma_collection_name)
-            self.collection = self.chroma_client.get_or_create_collection(
-                name=self.settings.chroma_collection_name
-            )
+            self.chroma_client.delete_collection(name=self.settings.collection_name)
+            self.collection = get_collection()
+            if self.settings.hybrid_search_enabled:
+                get_sparse_index().clear()
+            if self.settings.search_backend == "local":
+                get_local_index().clear()
+            if self.settings.near_duplicate_scope == "collection":
+                get_near_duplicate_index().clear()
             logger.info("Cleared ChromaDB collection")
         except Exception as e:
             results["errors"].append(f"Failed to clear ChromaDB: {e}")
 
+        self.catalog.clear()
+
         return results
 
 
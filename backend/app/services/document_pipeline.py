@@ -3,15 +3,27 @@ Document Processing Pipeline
 Orchestrates document processing across all services.
 """
 
+import asyncio
 import uuid
 from pathlib import Path
 from typing import Dict, Any, List
 
+from langchain_core.documents import Document
 from loguru import logger
 
 from app.config import get_settings
-from app.services.rag.document_processor import DocumentProcessor
+from app.services.rag.document_processor import (
+    DocumentProcessor,
+    assign_chunk_ids,
+    chunk_content_hash,
+    file_content_hash,
+)
 from app.services.rag.advanced_document_processor import AdvancedDocumentProcessor
+from app.services.rag.embedding_engine import EmbeddingEngine
+from app.services.rag.near_duplicates import get_near_duplicate_index
+from app.services.document_catalog import get_document_catalog
+from app.services.document_manager import get_document_manager
+from app.services.metrics import INGESTION_STAGE_SECONDS
 from app.services.rag.rag_chain import RAGAssistant
 from app.services.graph.entity_extractor import EntityExtractor
 from app.services.graph.graph_builder import GraphBuilder
@@ -89,25 +101,27 @@ class DocumentPipeline:
             "errors": []
         }
 
+        catalog = get_document_catalog()
+
         try:
             # Step 1: Extract and chunk document (must happen first)
             logger.info(f"Step 1/4: Chunking document {filename}")
 
-            # Use appropriate processor (async for advanced, sync for standard)
-            if isinstance(self.doc_processor, AdvancedDocumentProcessor):
-                documents = await self.doc_processor.process_pdf(
-                    file_path,
-                    use_vision=self.settings.use_vision_for_images
+            documents = await self._chunk_document(file_path, document_id)
+
+            # Mark near-duplicates of chunks stored for other documents
+            signatures = None
+            if (
+                assistant
+                and self.settings.near_duplicate_enabled
+                and self.settings.near_duplicate_scope == "collection"
+            ):
+                signatures = await asyncio.to_thread(
+                    self._mark_collection_duplicates, documents, document_id, assistant.vector_store
                 )
-            else:
-                documents = self.doc_processor.process_pdf(file_path)
-
-            # Add document_id to ALL chunk metadata for tracking
-            for doc in documents:
-                doc.metadata["document_id"] = document_id
-                doc.metadata["filename"] = filename
 
             results["chunks_created"] = len(documents)
+            results["page_count"] = self._count_pages(documents)
 
             # Update progress: Chunking complete
             if progress_tracker:
@@ -139,15 +153,21 @@ class DocumentPipeline:
                 if assistant:
                     logger.info(f"Adding {len(documents)} chunks to vector store")
                     try:
-                        # Process in batches for better performance
-                        batch_size = 50
-                        for i in range(0, len(documents), batch_size):
-                            batch = documents[i:i+batch_size]
-                            assistant.add_documents(batch)
-                            logger.info(f"Processed batch {i//batch_size + 1}/{(len(documents) + batch_size - 1)//batch_size}")
+                        # Token-packed batches, embedded concurrently, stored in order
+                        engine = EmbeddingEngine(assistant.vector_store)
+                        with INGESTION_STAGE_SECONDS.labels("embed").time():
+                            ids = await engine.add_documents(documents)
+                        if signatures is not None:
+                            get_near_duplicate_index().add(ids, document_id, signatures)
+                        catalog.mark_processed(
+                            document_id,
+                            chunk_count=len(ids),
+                            page_count=results["page_count"]
+                        )
                     except Exception as e:
                         logger.error(f"Error adding to vector store: {str(e)}")
                         results["errors"].append(f"Vector store: {str(e)}")
+                        catalog.mark_failed(document_id, f"Vector store: {str(e)}")
 
             # Task 2: Entity extraction for knowledge graph
             async def extract_entities():
@@ -171,13 +191,18 @@ class DocumentPipeline:
                             for doc in sampled_docs
                         ]
 
-                        graph_data = self.entity_extractor.extract_from_document_chunks(
-                            chunks_for_extraction,
-                            subject=subject
-                        )
-
-                        # Add to graph
-                        graph_result = graph_builder.add_graph_data(graph_data)
+                        with INGESTION_STAGE_SECONDS.labels("extract").time():
+                            # Extraction and graph writes block, keep them off the event loop
+                            graph_data = await asyncio.to_thread(
+                                self.entity_extractor.extract_from_document_chunks,
+                                chunks_for_extraction,
+                                subject=subject
+                            )
+
+                            # Add to graph
+                            graph_result = await asyncio.to_thread(
+                                graph_builder.add_graph_data, graph_data
+                            )
                         results["entities_extracted"] = graph_result["nodes_created"]
                         results["relationships_created"] = graph_result["relationships_created"]
 
@@ -199,12 +224,13 @@ class DocumentPipeline:
                         else:
                             sampled_docs = documents[:sample_size]
 
-                        flashcards = await self.flashcard_generator.generate_from_documents(
-                            documents=sampled_docs,
-                            subject=subject or "General",
-                            document_id=document_id,
-                            count=self.settings.flashcards_per_document
-                        )
+                        with INGESTION_STAGE_SECONDS.labels("flashcards").time():
+                            flashcards = await self.flashcard_generator.generate_from_documents(
+                                documents=sampled_docs,
+                                subject=subject or "General",
+                                document_id=document_id,
+                                count=self.settings.flashcards_per_document
+                            )
                         results["flashcards_generated"] = len(flashcards)
 
                     except Exception as e:
@@ -227,6 +253,334 @@ class DocumentPipeline:
             results["errors"].append(f"Critical: {str(e)}")
             raise
 
+    async def _chunk_document(self, file_path: Path, document_id: str) -> List[Document]:
+        """
+        Extract and chunk a PDF, tagging every chunk with its document and content hash.
+        Chunk IDs are derived from the document ID, file hash and chunk position.
+
+        Args:
+            file_path: Path to PDF file
+            document_id: Document ID
+
+        Returns:
+            Chunked documents
+        """
+        # Use appropriate processor (async for advanced, sync for standard)
+        if isinstance(self.doc_processor, AdvancedDocumentProcessor):
+            documents = await self.doc_processor.process_pdf(
+                file_path,
+                use_vision=self.settings.use_vision_for_images
+            )
+        else:
+            documents = await self.doc_processor.aprocess_pdf(file_path)
+
+        # Add document_id to ALL chunk metadata for tracking
+        for doc in documents:
+            doc.metadata["document_id"] = document_id
+            doc.metadata["filename"] = file_path.name
+            doc.metadata["content_hash"] = chunk_content_hash(doc.page_content)
+        file_hash = await asyncio.to_thread(file_content_hash, file_path)
+        assign_chunk_ids(documents, document_id, file_hash)
+
+        return documents
+
+    @staticmethod
+    def diff_chunks(
+        old_ids: List[str],
+        old_hashes: List[str],
+        new_documents: List[Document],
+    ) -> Dict[str, Any]:
+        """
+        Match new chunks to stored chunks by content hash.
+        Repeated texts are matched one-to-one, in order.
+
+        Args:
+            old_ids: Stored chunk IDs
+            old_hashes: Content hashes of the stored chunks
+            new_documents: Freshly chunked documents
+
+        Returns:
+            Dictionary with "unchanged" (list of (stored ID, new document)),
+            "added" (new documents) and "removed" (stored IDs)
+        """
+        available: Dict[str, List[str]] = {}
+        for chunk_id, content_hash in zip(old_ids, old_hashes):
+            available.setdefault(content_hash, []).append(chunk_id)
+
+        unchanged, added = [], []
+        for doc in new_documents:
+            matches = available.get(doc.metadata["content_hash"])
+            if matches:
+                unchanged.append((matches.pop(0), doc))
+            else:
+                added.append(doc)
+
+        removed = [chunk_id for ids in available.values() for chunk_id in ids]
+        return {"unchanged": unchanged, "added": added, "removed": removed}
+
+    async def reprocess_document(
+        self,
+        file_path: Path,
+        document_id: str,
+        subject: str | None = None,
+        assistant: RAGAssistant = None,
+        graph_builder: GraphBuilder = None,
+        progress_tracker = None
+    ) -> Dict[str, Any]:
+        """
+        Re-chunk a document and apply only the differences to the stores.
+        Unchanged chunks keep their vectors (only metadata such as page numbers
+        is refreshed); added chunks are embedded and feed entity extraction and
+        flashcard generation; removed chunks are deleted in one batch once the
+        added chunks are stored.
+        Graph nodes and flashcards belong to the document, not to chunks, and
+        are kept.
+
+        Args:
+            file_path: Path to the (possibly replaced) PDF file
+            document_id: ID of the existing document
+            subject: Optional subject classification
+            assistant: RAG assistant instance
+            graph_builder: Graph builder instance
+            progress_tracker: Optional progress tracker
+
+        Returns:
+            Reprocessing results with diff statistics
+        """
+        import asyncio
+
+        logger.info(f"Reprocessing document: {file_path.name} (ID: {document_id})")
+        catalog = get_document_catalog()
+        results = {
+            "document_id": document_id,
+            "filename": file_path.name,
+            "subject": subject,
+            "chunks_created": 0,
+            "chunks_unchanged": 0,
+            "chunks_added": 0,
+            "chunks_removed": 0,
+            "entities_extracted": 0,
+            "relationships_created": 0,
+            "flashcards_generated": 0,
+            "errors": []
+        }
+
+        documents = await self._chunk_document(file_path, document_id)
+        results["chunks_created"] = len(documents)
+        results["page_count"] = self._count_pages(documents)
+
+        stored = await asyncio.to_thread(
+            self._stored_chunks, assistant.vector_store, document_id, file_path.name
+        )
+        old_hashes = [
+            (metadata or {}).get("content_hash") or chunk_content_hash(text or "")
+            for text, metadata in zip(stored["documents"], stored["metadatas"])
+        ]
+        diff = self.diff_chunks(stored["ids"], old_hashes, documents)
+        added = diff["added"]
+        unchanged_ids = [chunk_id for chunk_id, _ in diff["unchanged"]]
+        unchanged_docs = [doc for _, doc in diff["unchanged"]]
+        # New chunks must not take over the ID of a kept chunk, nor of a removed
+        # chunk (those are deleted after the new chunks are stored)
+        assign_chunk_ids(
+            added,
+            document_id,
+            await asyncio.to_thread(file_content_hash, file_path),
+            reserved=set(unchanged_ids) | set(diff["removed"]),
+        )
+
+        results["chunks_unchanged"] = len(diff["unchanged"])
+        results["chunks_added"] = len(added)
+        results["chunks_removed"] = len(diff["removed"])
+        logger.info(
+            f"Chunk diff for {file_path.name}: {results['chunks_unchanged']} unchanged, "
+            f"{results['chunks_added']} added, {results['chunks_removed']} removed"
+        )
+
+        if progress_tracker:
+            progress_tracker.update_progress(
+                document_id,
+                step="Änderungen erkannt",
+                progress=30,
+                current_step=1,
+                details=f"{len(added)} neue, {len(diff['removed'])} entfernte Textabschnitte"
+            )
+
+        try:
+            # Unchanged chunks are re-marked too, their metadata is replaced below
+            signatures = None
+            if (
+                self.settings.near_duplicate_enabled
+                and self.settings.near_duplicate_scope == "collection"
+            ):
+                await asyncio.to_thread(
+                    self._mark_collection_duplicates,
+                    unchanged_docs, document_id, assistant.vector_store
+                )
+                signatures = await asyncio.to_thread(
+                    self._mark_collection_duplicates, added, document_id, assistant.vector_store
+                )
+
+            with INGESTION_STAGE_SECONDS.labels("embed").time():
+                ids = await EmbeddingEngine(assistant.vector_store).add_documents(added)
+            if signatures is not None:
+                await asyncio.to_thread(
+                    get_near_duplicate_index().add, ids, document_id, signatures
+                )
+
+            # Only touch stored chunks once the new ones are in, so a failed
+            # embedding run leaves the previous version searchable
+            await asyncio.to_thread(
+                assistant.vector_store.update_metadata,
+                unchanged_ids, [doc.metadata for doc in unchanged_docs]
+            )
+            await asyncio.to_thread(get_document_manager().delete_chunks, diff["removed"])
+        except Exception as e:
+            logger.error(f"Error updating vector store: {str(e)}")
+            catalog.mark_failed(document_id, f"Vector store: {str(e)}")
+            raise
+
+        catalog.mark_processed(
+            document_id,
+            chunk_count=len(unchanged_ids) + len(added),
+            page_count=results["page_count"]
+        )
+
+        if progress_tracker:
+            progress_tracker.update_progress(
+                document_id,
+                step="Neue Abschnitte werden analysiert...",
+                progress=70,
+                current_step=2,
+                details="Knowledge Graph und Karteikarten für geänderte Inhalte"
+            )
+
+        async def extract_entities():
+            if added and graph_builder and self.settings.entity_extraction_enabled:
+                try:
+                    with INGESTION_STAGE_SECONDS.labels("extract").time():
+                        chunks = [
+                            {"text": doc.page_content, "metadata": doc.metadata}
+                            for doc in added[:30]
+                        ]
+                        graph_data = await asyncio.to_thread(
+                            self.entity_extractor.extract_from_document_chunks, chunks, subject
+                        )
+                        graph_result = await asyncio.to_thread(
+                            graph_builder.add_graph_data, graph_data
+                        )
+                    results["entities_extracted"] = graph_result["nodes_created"]
+                    results["relationships_created"] = graph_result["relationships_created"]
+                except Exception as e:
+                    logger.error(f"Error in entity extraction: {str(e)}")
+                    results["errors"].append(f"Entity extraction: {str(e)}")
+
+        async def generate_flashcards():
+            if added and self.settings.flashcard_generation_enabled:
+                # Scale the card count to the share of new content
+                share = len(added) / len(documents)
+                count = max(1, round(self.settings.flashcards_per_document * share))
+                try:
+                    with INGESTION_STAGE_SECONDS.labels("flashcards").time():
+                        flashcards = await self.flashcard_generator.generate_from_documents(
+                            documents=added[:15],
+                            subject=subject or "General",
+                            document_id=document_id,
+                            count=count
+                        )
+                    results["flashcards_generated"] = len(flashcards)
+                except Exception as e:
+                    logger.error(f"Error generating flashcards: {str(e)}")
+                    results["errors"].append(f"Flashcard generation: {str(e)}")
+
+        await asyncio.gather(extract_entities(), generate_flashcards(), return_exceptions=True)
+
+        logger.info(f"Document reprocessing complete: {file_path.name}")
+        return results
+
+    @staticmethod
+    def _stored_chunks(vector_store, document_id: str, filename: str) -> Dict[str, Any]:
+        """
+        Get the stored chunks of a document.
+
+        Args:
+            vector_store: VectorStore holding the collection
+            document_id: Document ID
+            filename: Source file name (legacy uploads were stored without document_id)
+
+        Returns:
+            Chroma result with "ids", "documents" and "metadatas"
+        """
+        collection = vector_store.vectorstore._collection
+        include = ["documents", "metadatas"]
+        stored = collection.get(where={"document_id": document_id}, include=include)
+        if not stored["ids"]:
+            stored = collection.get(where={"source_file": filename}, include=include)
+        return stored
+
+    @staticmethod
+    def _mark_collection_duplicates(documents: List[Document], document_id: str, vector_store):
+        """
+        Mark chunks that near-duplicate a chunk stored for another document.
+        Every chunk stays stored; duplicates get "duplicate_of" (the ID shared
+        by their group) and are collapsed at query time, so deleting one
+        document never loses text another document still contains. Only the
+        marked chunks' own metadata is written, so reprocessing is idempotent.
+
+        Args:
+            documents: Chunks of the document (metadata updated in place)
+            document_id: ID of the document
+            vector_store: VectorStore holding the collection
+
+        Returns:
+            MinHash signatures of the chunks, in the same order
+        """
+        index = get_near_duplicate_index()
+        signatures, matches = [], {}
+        for doc in documents:
+            signature = index.hasher.signature(doc.page_content)
+            signatures.append(signature)
+            doc.metadata.pop("duplicate_of", None)
+            match = index.find(signature, exclude_document=document_id)
+            if match is not None:
+                matches.setdefault(match, []).append(doc)
+
+        if matches:
+            # A match that is itself a duplicate belongs to its representative's group
+            collection = vector_store.vectorstore._collection
+            stored = collection.get(ids=list(matches), include=["metadatas"])
+            groups = {
+                chunk_id: (metadata or {}).get("duplicate_of") or chunk_id
+                for chunk_id, metadata in zip(stored["ids"], stored["metadatas"])
+            }
+            for match, docs in matches.items():
+                for doc in docs:
+                    doc.metadata["duplicate_of"] = groups.get(match, match)
+            marked = sum(len(docs) for docs in matches.values())
+            logger.info(f"Marked {marked} chunks duplicating other documents")
+
+        return signatures
+
+    @staticmethod
+    def _count_pages(documents: List[Document]) -> int | None:
+        """
+        Derive the page count from chunk metadata.
+
+        Args:
+            documents: Chunked documents
+
+        Returns:
+            Number of pages or None if no page metadata is present
+        """
+        pages = [
+            doc.metadata["page"] + 1 for doc in documents
+            if isinstance(doc.metadata.get("page"), int)
+        ] + [
+            doc.metadata["page_number"] for doc in documents
+            if isinstance(doc.metadata.get("page_number"), int)
+        ]
+        return max(pages) if pages else None
+
 
 # Global pipeline instance
 _pipeline: DocumentPipeline | None = None
@@ -6,12 +6,12 @@ Automatically generates flashcards from documents using LLM.
 from typing import List, Dict, Any
 import json
 
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 from loguru import logger
 
 from app.config import get_settings
+from app.services.llm_clients import create_chat_model
 from app.services.flashcards.flashcard_manager import FlashcardManager, get_flashcard_manager
 
 
@@ -23,11 +23,7 @@ class FlashcardGenerator:
     def __init__(self):
         """Initialize flashcard generator."""
         self.settings = get_settings()
-        self.llm = ChatOpenAI(
-            model=self.settings.llm_model,
-            temperature=0.3,
-            openai_api_key=self.settings.openai_api_key
-        )
+        self.llm = create_chat_model(temperature=0.3)
         self._init_prompt()
         logger.info("Initialized flashcard generator")
 
@@ -134,7 +130,7 @@ Erstelle genau {count} hochwertige Karteikarten. Achte besonders darauf, dass di
                 count=min(count, 20)  # Max 20 per batch
             )
 
-            response = self.llm.invoke(messages)
+            response = await self.llm.ainvoke(messages)
 
             # Parse JSON response
             flashcards_data = self._parse_flashcards(response.content)
@@ -12,6 +12,7 @@ from pathlib import Path
 from loguru import logger
 
 from app.config import get_settings
+from app.services.metrics import connect_sqlite
 from app.services.flashcards.spaced_repetition import SpacedRepetitionAlgorithm, SM2Algorithm
 
 
@@ -96,7 +97,7 @@ class FlashcardManager:
         Returns:
             SQLite connection
         """
-        conn = sqlite3.connect(str(self.db_path))
+        conn = connect_sqlite(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
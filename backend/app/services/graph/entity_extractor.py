@@ -7,13 +7,13 @@ import json
 from typing import List, Dict, Any
 from fuzzywuzzy import fuzz
 
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from loguru import logger
 
 from app.config import get_settings
+from app.services.llm_clients import create_chat_model
 
 
 class Entity(BaseModel):
@@ -48,11 +48,7 @@ class EntityExtractor:
         Initialize entity extractor.
         """
         self.settings = get_settings()
-        self.llm = ChatOpenAI(
-            model=self.settings.llm_model,
-            temperature=0.1,  # Low temperature for consistent extraction
-            openai_api_key=self.settings.openai_api_key
-        )
+        self.llm = create_chat_model(temperature=0.1)  # Low temperature for consistent extraction
         self.parser = PydanticOutputParser(pydantic_object=GraphData)
         self._init_prompt()
         logger.info("Initialized entity extractor")
@@ -9,6 +9,7 @@ from neo4j import GraphDatabase, Driver
 from loguru import logger
 
 from app.config import get_settings
+from app.services.metrics import timed
 from app.services.graph.entity_extractor import Entity, Relationship, GraphData
 
 
@@ -83,6 +84,7 @@ class GraphBuilder:
             "relationships_created": rels_created
         }
 
+    @timed("neo4j", "add_entities_batch")
     def add_entities_batch(self, entities: List[Entity]) -> int:
         """
         Batch add entities to the graph.
@@ -163,6 +165,7 @@ class GraphBuilder:
 
         return count
 
+    @timed("neo4j", "add_relationships_batch")
     def add_relationships_batch(self, relationships: List[Relationship]) -> int:
         """
         Batch add relationships to the graph.
@@ -253,6 +256,7 @@ class GraphBuilder:
 
         return count
 
+    @timed("neo4j", "get_all_concepts")
     def get_all_concepts(self, subject: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get all concepts in the graph.
@@ -284,6 +288,7 @@ class GraphBuilder:
 
             return [dict(record) for record in result]
 
+    @timed("neo4j", "get_graph_data")
     def get_graph_data(self, subject: Optional[str] = None) -> Dict[str, Any]:
         """
         Get complete graph data with nodes and relationships.
@@ -341,6 +346,7 @@ class GraphBuilder:
                 "relationships": relationships
             }
 
+    @timed("neo4j", "get_concept")
     def get_concept(self, name: str) -> Optional[Dict[str, Any]]:
         """
         Get a specific concept by name.
@@ -363,6 +369,7 @@ class GraphBuilder:
 
             return dict(record) if record else None
 
+    @timed("neo4j", "get_stats")
     def get_stats(self) -> Dict[str, Any]:
         """
         Get graph statistics.
@@ -385,6 +392,7 @@ class GraphBuilder:
             result = session.run(query)
             return dict(result.single())
 
+    @timed("neo4j", "delete_by_document")
     def delete_by_document(self, document_id: str) -> Dict[str, int]:
         """
         Delete all nodes and relationships associated with a document.
@@ -419,6 +427,7 @@ class GraphBuilder:
                 "relationships_deleted": 0  # Included in DETACH DELETE
             }
 
+    @timed("neo4j", "delete_all")
     def delete_all(self) -> Dict[str, int]:
         """
         Delete all nodes and relationships (use with caution!).
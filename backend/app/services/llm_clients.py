@@ -0,0 +1,226 @@
+"""
+Shared OpenAI Clients
+Provides one pooled keep-alive HTTP client (sync and async) that every
+LLM, embedding and vision client of the application draws from. When the
+LLM scheduler is enabled, the clients' transports admit each request
+through it and take over retries.
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from loguru import logger
+from openai import AsyncOpenAI
+
+from app.config import get_settings
+from app.services.llm_scheduler import (
+    AsyncScheduledTransport,
+    ScheduledTransport,
+    get_llm_scheduler,
+)
+from app.services.metrics import async_openai_event_hooks, openai_event_hooks
+
+
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_async_openai_client: Optional[AsyncOpenAI] = None
+
+
+def _limits() -> httpx.Limits:
+    """Connection pool limits from settings."""
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.openai_max_connections,
+        max_keepalive_connections=settings.openai_max_keepalive_connections,
+        keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    """Request timeouts from settings."""
+    settings = get_settings()
+    return httpx.Timeout(
+        settings.openai_timeout_seconds, connect=settings.openai_connect_timeout_seconds
+    )
+
+
+def _max_retries() -> int:
+    """Retries left to the OpenAI clients (the scheduler retries itself)."""
+    settings = get_settings()
+    return 0 if settings.llm_scheduler_enabled else settings.openai_max_retries
+
+
+def _transport() -> Optional[httpx.BaseTransport]:
+    """Scheduled synchronous transport, or None for the httpx default."""
+    settings = get_settings()
+    if not settings.llm_scheduler_enabled:
+        return None
+    return ScheduledTransport(
+        httpx.HTTPTransport(limits=_limits()),
+        get_llm_scheduler(),
+        max_retries=settings.openai_max_retries,
+        max_delay=settings.llm_retry_max_delay_seconds,
+    )
+
+
+def _async_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """Scheduled asynchronous transport, or None for the httpx default."""
+    settings = get_settings()
+    if not settings.llm_scheduler_enabled:
+        return None
+    return AsyncScheduledTransport(
+        httpx.AsyncHTTPTransport(limits=_limits()),
+        get_llm_scheduler(),
+        max_retries=settings.openai_max_retries,
+        max_delay=settings.llm_retry_max_delay_seconds,
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get or create the shared synchronous HTTP client.
+
+    Returns:
+        httpx.Client with a keep-alive connection pool
+    """
+    global _http_client
+
+    if _http_client is None:
+        _http_client = httpx.Client(
+            limits=_limits(),
+            timeout=_timeout(),
+            transport=_transport(),
+            event_hooks=openai_event_hooks(),
+        )
+        logger.info(
+            "Created shared OpenAI HTTP client "
+            f"(max {get_settings().openai_max_connections} connections)"
+        )
+
+    return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the shared asynchronous HTTP client.
+
+    Returns:
+        httpx.AsyncClient with a keep-alive connection pool
+    """
+    global _async_http_client
+
+    if _async_http_client is None:
+        _async_http_client = httpx.AsyncClient(
+            limits=_limits(),
+            timeout=_timeout(),
+            transport=_async_transport(),
+            event_hooks=async_openai_event_hooks(),
+        )
+        logger.info(
+            "Created shared async OpenAI HTTP client "
+            f"(max {get_settings().openai_max_connections} connections)"
+        )
+
+    return _async_http_client
+
+
+def openai_client_kwargs() -> Dict[str, Any]:
+    """
+    Keyword arguments shared by all LangChain OpenAI clients.
+
+    Returns:
+        API key, base URL, shared HTTP clients, timeout and retry settings
+    """
+    settings = get_settings()
+    return {
+        "openai_api_key": settings.openai_api_key,
+        "openai_api_base": settings.openai_base_url,
+        "http_client": get_http_client(),
+        "http_async_client": get_async_http_client(),
+        "request_timeout": settings.openai_timeout_seconds,
+        "max_retries": _max_retries(),
+    }
+
+
+def create_chat_model(
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    model: Optional[str] = None,
+) -> ChatOpenAI:
+    """
+    Create a chat model on the shared connection pool.
+
+    Args:
+        temperature: Sampling temperature (default: from settings)
+        max_tokens: Maximum completion tokens (default: unlimited)
+        model: Model name (default: from settings)
+
+    Returns:
+        ChatOpenAI instance
+    """
+    settings = get_settings()
+    return ChatOpenAI(
+        model=model or settings.llm_model,
+        temperature=settings.temperature if temperature is None else temperature,
+        max_tokens=max_tokens,
+        **openai_client_kwargs(),
+    )
+
+
+def create_embeddings(
+    model: Optional[str] = None, dimensions: Optional[int] = None
+) -> OpenAIEmbeddings:
+    """
+    Create an embeddings client on the shared connection pool.
+
+    Args:
+        model: Embedding model (default: from settings)
+        dimensions: Output dimensions (default: from settings)
+
+    Returns:
+        OpenAIEmbeddings instance
+    """
+    settings = get_settings()
+    return OpenAIEmbeddings(
+        model=model or settings.embedding_model,
+        dimensions=dimensions or settings.embedding_dimensions,
+        **openai_client_kwargs(),
+    )
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Get or create the shared raw async OpenAI client (e.g. for vision requests).
+
+    Returns:
+        AsyncOpenAI instance
+    """
+    global _async_openai_client
+
+    if _async_openai_client is None:
+        settings = get_settings()
+        _async_openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            http_client=get_async_http_client(),
+            timeout=settings.openai_timeout_seconds,
+            max_retries=_max_retries(),
+        )
+
+    return _async_openai_client
+
+
+async def close_clients() -> None:
+    """Close the shared HTTP clients (on application shutdown)."""
+    global _http_client, _async_http_client, _async_openai_client
+
+    if _http_client is not None:
+        _http_client.close()
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+
+    _http_client = None
+    _async_http_client = None
+    _async_openai_client = None
+    logger.info("Closed shared OpenAI HTTP clients")
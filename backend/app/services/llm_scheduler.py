@@ -0,0 +1,508 @@
+"""
+LLM Scheduler
+Central admission control for all OpenAI requests: RPM/TPM token buckets
+per model, priority of interactive requests over background work, and
+retries with backoff that honor the rate-limit headers of the API.
+
+Requests are scheduled inside the shared HTTP transport (see
+llm_clients), so every LLM, embedding and vision call goes through it.
+Background work marks itself with `llm_priority(PRIORITY_BACKGROUND)`.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from app.config import get_settings
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+# Status codes retried by the transport
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Completion tokens assumed for chat requests without max_tokens
+DEFAULT_COMPLETION_TOKENS = 500
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """
+    Run the enclosed LLM and embedding calls with the given priority.
+
+    The priority is a context variable, so it carries over into tasks
+    and asyncio.to_thread() calls started inside the block.
+
+    Args:
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parse a rate-limit reset duration such as "1m30s", "6ms" or "0.5s".
+
+    Args:
+        value: Duration string
+
+    Returns:
+        Seconds or None if the value cannot be parsed
+    """
+    parts = _DURATION_RE.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_delay(
+    headers: httpx.Headers, attempt: int, base: float = 0.5, max_delay: float = 60.0
+) -> float:
+    """
+    Delay before retrying a throttled or failed request.
+
+    Honors retry-after-ms, retry-after and the x-ratelimit-reset-* headers;
+    falls back to exponential backoff. A small jitter spreads out retries of
+    concurrent requests.
+
+    Args:
+        headers: Response headers
+        attempt: Zero-based retry attempt
+        base: Initial backoff in seconds
+        max_delay: Upper bound in seconds
+
+    Returns:
+        Delay in seconds
+    """
+    delay = None
+    try:
+        if "retry-after-ms" in headers:
+            delay = float(headers["retry-after-ms"]) / 1000
+        elif "retry-after" in headers:
+            delay = float(headers["retry-after"])
+    except ValueError:
+        delay = None
+
+    if delay is None:
+        resets = [
+            parse_duration(headers[name])
+            for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+            if name in headers
+        ]
+        resets = [reset for reset in resets if reset is not None]
+        delay = max(resets) if resets else base * 2 ** attempt
+
+    return min(delay * (1 + random.uniform(0, 0.1)), max_delay)
+
+
+def estimate_request(request: httpx.Request) -> Tuple[str, int]:
+    """
+    Estimate model and token cost of an OpenAI request.
+
+    Prompt tokens are estimated from the body size (about 4 bytes per
+    token), completion tokens from max_tokens.
+
+    Args:
+        request: Outgoing request
+
+    Returns:
+        Tuple of (model name, estimated tokens)
+    """
+    content = request.content or b""
+    try:
+        body: Dict[str, Any] = json.loads(content) if content else {}
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        body = {}
+
+    model = str(body.get("model", ""))
+    completion = body.get("max_tokens") or body.get("max_completion_tokens")
+    if completion is None:
+        completion = 0 if "input" in body else DEFAULT_COMPLETION_TOKENS
+    return model, len(content) // 4 + int(completion)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Capacity and refill rate per minute
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """Add the tokens accrued since the last refill."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, reserve: float = 0.0) -> float:
+        """
+        Seconds until amount can be taken while leaving a reserve.
+
+        Args:
+            amount: Tokens to take (capped at the capacity)
+            reserve: Fraction of the capacity that must remain afterwards
+
+        Returns:
+            0.0 if the tokens are available now
+        """
+        amount = min(amount, self.capacity)
+        needed = amount + min(reserve * self.capacity, self.capacity - amount)
+        return max(0.0, (needed - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        """Take tokens (the level may go negative for oversized requests)."""
+        self.level -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """
+    Admission control for OpenAI requests.
+
+    Each model has a request and a token bucket. Interactive requests may
+    use the full buckets; background requests wait while interactive ones
+    are queued and must leave a reserve for them.
+    """
+
+    # Longest single sleep before re-checking the buckets
+    POLL_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        embedding_rpm: Optional[int] = None,
+        embedding_tpm: Optional[int] = None,
+        interactive_reserve: Optional[float] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            rpm: Requests per minute for chat models
+            tpm: Tokens per minute for chat models
+            embedding_rpm: Requests per minute for embedding models
+            embedding_tpm: Tokens per minute for embedding models
+            interactive_reserve: Fraction of each bucket background work must leave
+        """
+        settings = get_settings()
+        self.limits = {
+            "chat": (rpm or settings.openai_rpm_limit, tpm or settings.openai_tpm_limit),
+            "embedding": (
+                embedding_rpm or settings.openai_embedding_rpm_limit,
+                embedding_tpm or settings.openai_embedding_tpm_limit,
+            ),
+        }
+        self.interactive_reserve = (
+            settings.llm_interactive_reserve if interactive_reserve is None else interactive_reserve
+        )
+
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._cond = threading.Condition()
+        self._waiting = {priority: 0 for priority in PRIORITY_NAMES}
+        self._in_flight = {priority: 0 for priority in PRIORITY_NAMES}
+        self._requests = {priority: 0 for priority in PRIORITY_NAMES}
+        self._wait_seconds = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self._max_wait_seconds = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self.rate_limited = 0
+        self.retries = 0
+
+    def _buckets_for(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        """Get or create the (requests, tokens) buckets of a model."""
+        if model not in self._buckets:
+            rpm, tpm = self.limits["embedding" if "embedding" in model else "chat"]
+            self._buckets[model] = (TokenBucket(rpm), TokenBucket(tpm))
+        return self._buckets[model]
+
+    def _try_acquire(self, model: str, tokens: int, priority: int) -> float:
+        """
+        Take capacity for a request if available (caller holds the lock).
+
+        Returns:
+            0.0 if granted, otherwise seconds to wait before trying again
+        """
+        if priority != PRIORITY_INTERACTIVE and self._waiting[PRIORITY_INTERACTIVE]:
+            return self.POLL_INTERVAL
+
+        now = time.monotonic()
+        requests, token_bucket = self._buckets_for(model)
+        requests.refill(now)
+        token_bucket.refill(now)
+
+        reserve = 0.0 if priority == PRIORITY_INTERACTIVE else self.interactive_reserve
+        wait = max(requests.wait_time(1, reserve), token_bucket.wait_time(tokens, reserve))
+        if wait > 0:
+            return wait
+
+        requests.take(1)
+        token_bucket.take(tokens)
+        return 0.0
+
+    def _granted(self, priority: int, waited: float) -> None:
+        """Record a granted request (caller holds the lock)."""
+        self._requests[priority] += 1
+        self._in_flight[priority] += 1
+        self._wait_seconds[priority] += waited
+        self._max_wait_seconds[priority] = max(self._max_wait_seconds[priority], waited)
+
+    def acquire(self, model: str, tokens: int, priority: Optional[int] = None) -> int:
+        """
+        Block until a request may be sent.
+
+        Args:
+            model: Model name
+            tokens: Estimated tokens of the request
+            priority: Request priority (default: from llm_priority context)
+
+        Returns:
+            Priority the request was admitted with (pass to release())
+
+        Raises:
+            RuntimeError: If called on a running event loop, which the wait would block
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "Synchronous LLM call on the event loop; use ainvoke() or asyncio.to_thread()"
+            )
+
+        priority = _priority.get() if priority is None else priority
+        start = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    wait = self._try_acquire(model, tokens, priority)
+                    if wait == 0:
+                        break
+                    self._cond.wait(timeout=min(wait, self.POLL_INTERVAL))
+            finally:
+                self._waiting[priority] -= 1
+            self._granted(priority, time.monotonic() - start)
+        return priority
+
+    async def aacquire(self, model: str, tokens: int, priority: Optional[int] = None) -> int:
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            model: Model name
+            tokens: Estimated tokens of the request
+            priority: Request priority (default: from llm_priority context)
+
+        Returns:
+            Priority the request was admitted with (pass to release())
+        """
+        priority = _priority.get() if priority is None else priority
+        start = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_acquire(model, tokens, priority)
+                    if wait == 0:
+                        self._granted(priority, time.monotonic() - start)
+                        return priority
+                await asyncio.sleep(min(wait, self.POLL_INTERVAL))
+        finally:
+            with self._cond:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def release(self, priority: int) -> None:
+        """
+        Mark a request as finished.
+
+        Args:
+            priority: Priority returned by acquire()
+        """
+        with self._cond:
+            self._in_flight[priority] -= 1
+            self._cond.notify_all()
+
+    def observe(self, model: str, response: httpx.Response) -> None:
+        """
+        Align the buckets with the limits reported by the API.
+
+        Args:
+            model: Model name
+            response: API response
+        """
+        headers = response.headers
+        with self._cond:
+            if response.status_code == 429:
+                self.rate_limited += 1
+            requests, token_bucket = self._buckets_for(model)
+            for bucket, name in ((requests, "x-ratelimit-remaining-requests"),
+                                 (token_bucket, "x-ratelimit-remaining-tokens")):
+                try:
+                    remaining = float(headers[name])
+                except (KeyError, ValueError):
+                    continue
+                bucket.level = min(bucket.level, remaining)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Dictionary with queue depth, in-flight requests and wait times per priority
+        """
+        with self._cond:
+            stats: Dict[str, Any] = {
+                "rate_limited_responses": self.rate_limited,
+                "retries": self.retries,
+                "buckets": {
+                    model: {
+                        "requests_available": round(requests.level, 1),
+                        "tokens_available": round(tokens.level),
+                    }
+                    for model, (requests, tokens) in self._buckets.items()
+                },
+            }
+            for priority, name in PRIORITY_NAMES.items():
+                stats[name] = {
+                    "queue_depth": self._waiting[priority],
+                    "in_flight": self._in_flight[priority],
+                    "requests": self._requests[priority],
+                    "avg_wait_seconds": self._wait_seconds[priority] / self._requests[priority]
+                    if self._requests[priority] else 0.0,
+                    "max_wait_seconds": self._max_wait_seconds[priority],
+                }
+            return stats
+
+
+class ScheduledTransport(httpx.BaseTransport):
+    """
+    Synchronous transport admitting requests through the scheduler and
+    retrying throttled or failed ones.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        scheduler: LLMScheduler,
+        max_retries: int,
+        max_delay: float,
+    ):
+        self.transport = transport
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.max_delay = max_delay
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = estimate_request(request)
+        attempt = 0
+        while True:
+            priority = self.scheduler.acquire(model, tokens)
+            try:
+                response = self.transport.handle_request(request)
+            finally:
+                self.scheduler.release(priority)
+            self.scheduler.observe(model, response)
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+
+            delay = retry_delay(response.headers, attempt, max_delay=self.max_delay)
+            logger.warning(
+                f"OpenAI returned {response.status_code} for {model}, retrying in {delay:.1f}s"
+            )
+            response.close()
+            self.scheduler.retries += 1
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncScheduledTransport(httpx.AsyncBaseTransport):
+    """
+    Asynchronous transport admitting requests through the scheduler and
+    retrying throttled or failed ones.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        scheduler: LLMScheduler,
+        max_retries: int,
+        max_delay: float,
+    ):
+        self.transport = transport
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.max_delay = max_delay
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = estimate_request(request)
+        attempt = 0
+        while True:
+            priority = await self.scheduler.aacquire(model, tokens)
+            try:
+                response = await self.transport.handle_async_request(request)
+            finally:
+                self.scheduler.release(priority)
+            self.scheduler.observe(model, response)
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+
+            delay = retry_delay(response.headers, attempt, max_delay=self.max_delay)
+            logger.warning(
+                f"OpenAI returned {response.status_code} for {model}, retrying in {delay:.1f}s"
+            )
+            await response.aclose()
+            self.scheduler.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+# Global scheduler instance
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get or create the LLM scheduler instance."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        _llm_scheduler = LLMScheduler()
+    return _llm_scheduler
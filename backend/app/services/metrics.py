@@ -0,0 +1,197 @@
+"""
+Prometheus Metrics
+Latency histograms for HTTP routes, external calls (OpenAI, Chroma, Neo4j,
+SQLite) and ingestion stages, and gauges for in-flight jobs and SSE
+subscribers. The app exposes them on /metrics.
+"""
+
+import functools
+import inspect
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, TypeVar
+
+import httpx
+from prometheus_client import Gauge, Histogram
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+STAGE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "studyrag_http_request_duration_seconds",
+    "HTTP request latency until the response starts, by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_CALL_SECONDS = Histogram(
+    "studyrag_external_call_duration_seconds",
+    "Latency of calls to OpenAI, Chroma, Neo4j and SQLite",
+    ["service", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+INGESTION_STAGE_SECONDS = Histogram(
+    "studyrag_ingestion_stage_duration_seconds",
+    "Duration of document ingestion stages (parse, chunk, embed, extract, flashcards)",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+JOBS_IN_PROGRESS = Gauge(
+    "studyrag_jobs_in_progress",
+    "Background jobs currently running",
+    ["job"],
+)
+SSE_SUBSCRIBERS = Gauge(
+    "studyrag_sse_subscribers",
+    "Open server-sent event streams",
+    ["stream"],
+)
+
+
+def timed(service: str, operation: str) -> Callable[[F], F]:
+    """
+    Decorator recording the latency of a sync or async call.
+
+    Args:
+        service: External service (e.g. "neo4j")
+        operation: Operation name
+
+    Returns:
+        Decorator
+    """
+    histogram = EXTERNAL_CALL_SECONDS.labels(service, operation)
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with histogram.time():
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with histogram.time():
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+# OpenAI requests (httpx event hooks on the shared clients)
+
+def _openai_operation(request: httpx.Request) -> str:
+    """Operation label from the API path, e.g. "chat_completions"."""
+    return request.url.path.rsplit("/v1/", 1)[-1].strip("/").replace("/", "_") or "unknown"
+
+
+def _on_openai_request(request: httpx.Request) -> None:
+    request.extensions["metrics_start"] = time.perf_counter()
+
+
+def _on_openai_response(response: httpx.Response) -> None:
+    start = response.request.extensions.get("metrics_start")
+    if start is not None:
+        EXTERNAL_CALL_SECONDS.labels("openai", _openai_operation(response.request)).observe(
+            time.perf_counter() - start
+        )
+
+
+async def _on_openai_request_async(request: httpx.Request) -> None:
+    _on_openai_request(request)
+
+
+async def _on_openai_response_async(response: httpx.Response) -> None:
+    _on_openai_response(response)
+
+
+def openai_event_hooks() -> Dict[str, List[Callable[..., Any]]]:
+    """
+    Event hooks timing OpenAI requests on a sync httpx client.
+    Latency runs until the response headers arrive (including scheduler
+    waits and retries), so streamed completions report time to first byte.
+    """
+    return {"request": [_on_openai_request], "response": [_on_openai_response]}
+
+
+def async_openai_event_hooks() -> Dict[str, List[Callable[..., Any]]]:
+    """Event hooks timing OpenAI requests on an async httpx client."""
+    return {"request": [_on_openai_request_async], "response": [_on_openai_response_async]}
+
+
+# SQLite statements
+
+def _statement(sql: str) -> str:
+    """Statement verb, e.g. "select"."""
+    words = sql.split(None, 1)
+    return words[0].lower() if words else "empty"
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor recording the latency of each statement."""
+
+    def _observe(self, sql: str, start: float) -> None:
+        EXTERNAL_CALL_SECONDS.labels(
+            "sqlite", f"{self.connection.metrics_name}.{_statement(sql)}"
+        ).observe(time.perf_counter() - start)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> "TimedCursor":
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._observe(sql, start)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> "TimedCursor":
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._observe(sql, start)
+
+    def executescript(self, sql_script: str, /) -> "TimedCursor":
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._observe("script", start)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose statements and commits are timed per database."""
+
+    def __init__(self, database: Any, *args: Any, **kwargs: Any):
+        super().__init__(database, *args, **kwargs)
+        self.metrics_name = Path(str(database)).stem
+
+    def cursor(self, factory: Any = TimedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str, /) -> sqlite3.Cursor:
+        return self.cursor().executescript(sql_script)
+
+    def commit(self) -> None:
+        with EXTERNAL_CALL_SECONDS.labels("sqlite", f"{self.metrics_name}.commit").time():
+            super().commit()
+
+
+def connect_sqlite(db_path: Path, **kwargs: Any) -> sqlite3.Connection:
+    """
+    Open a SQLite connection whose statements are timed.
+
+    Args:
+        db_path: Database file
+        **kwargs: Further sqlite3.connect arguments
+
+    Returns:
+        SQLite connection labelled with the database file name
+    """
+    return sqlite3.connect(str(db_path), factory=TimedConnection, **kwargs)
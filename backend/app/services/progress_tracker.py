@@ -7,6 +7,8 @@ from typing import Dict, Any
 from datetime import datetime
 import asyncio
 
+from app.services.metrics import SSE_SUBSCRIBERS
+
 
 class ProgressTracker:
     """Tracks document processing progress for SSE streaming."""
@@ -144,6 +146,7 @@ class ProgressTracker:
             self._queues[document_id] = []
 
         self._queues[document_id].append(queue)
+        SSE_SUBSCRIBERS.labels("progress").inc()
 
         # Send current progress immediately if exists
         if document_id in self._progress:
@@ -161,6 +164,7 @@ class ProgressTracker:
         """
         if document_id in self._queues and queue in self._queues[document_id]:
             self._queues[document_id].remove(queue)
+            SSE_SUBSCRIBERS.labels("progress").dec()
 
     def cleanup(self, document_id: str) -> None:
         """
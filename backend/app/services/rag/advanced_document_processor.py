@@ -3,6 +3,7 @@ Advanced Document Processor with Multimodal Support
 Handles tables, images, and complex layouts using state-of-the-art 2025 techniques.
 """
 
+import asyncio
 import base64
 import logging
 from pathlib import Path
@@ -13,6 +14,10 @@ from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from app.config import get_settings
+from app.services.llm_clients import get_async_openai_client
+from app.services.metrics import INGESTION_STAGE_SECONDS
+from app.services.rag.near_duplicates import deduplicate_chunks
+from app.services.rag.pdf_parsing import get_pdf_parser
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,7 @@ class AdvancedDocumentProcessor:
             length_function=len,
             separators=["\n\n", "\n", ". ", " ", ""],
             is_separator_regex=False,
+            add_start_index=True,
         )
 
         # Check if advanced libraries are available
@@ -76,24 +82,26 @@ class AdvancedDocumentProcessor:
             logger.info(f"Processing {file_path.name} with Unstructured.io")
 
             # Partition PDF into elements (text, tables, images)
-            elements = partition_pdf(
-                filename=str(file_path),
-                strategy="hi_res",  # High resolution for tables/images
-                infer_table_structure=True,  # Extract table structure
-                extract_images_in_pdf=True,  # Extract images
-                extract_image_block_types=["Image", "Table"],  # What to extract
-                extract_image_block_to_payload=False,  # Don't embed images in payload
-            )
+            with INGESTION_STAGE_SECONDS.labels("parse").time():
+                elements = partition_pdf(
+                    filename=str(file_path),
+                    strategy="hi_res",  # High resolution for tables/images
+                    infer_table_structure=True,  # Extract table structure
+                    extract_images_in_pdf=True,  # Extract images
+                    extract_image_block_types=["Image", "Table"],  # What to extract
+                    extract_image_block_to_payload=False,  # Don't embed images in payload
+                )
 
             logger.info(f"Extracted {len(elements)} elements from {file_path.name}")
 
             # Chunk elements while preserving structure
-            chunks = chunk_by_title(
-                elements,
-                max_characters=self.settings.chunk_size,
-                combine_text_under_n_chars=self.settings.chunk_overlap,
-                new_after_n_chars=self.settings.chunk_size,
-            )
+            with INGESTION_STAGE_SECONDS.labels("chunk").time():
+                chunks = chunk_by_title(
+                    elements,
+                    max_characters=self.settings.chunk_size,
+                    combine_text_under_n_chars=self.settings.chunk_overlap,
+                    new_after_n_chars=self.settings.chunk_size,
+                )
 
             # Convert to LangChain Documents
             documents = []
@@ -130,6 +138,11 @@ class AdvancedDocumentProcessor:
                 )
                 documents.append(doc)
 
+            # Collapse repeated slide templates and keep chunk IDs contiguous
+            documents = deduplicate_chunks(documents)
+            for i, doc in enumerate(documents):
+                doc.metadata["chunk_id"] = i
+
             logger.info(f"Created {len(documents)} chunks from {file_path.name}")
             return documents
 
@@ -140,7 +153,7 @@ class AdvancedDocumentProcessor:
 
     def _fallback_processing(self, file_path: Path) -> List[Document]:
         """
-        Fallback to standard PyPDF processing.
+        Fallback to standard PyPDF processing (in the PDF parsing pool).
 
         Args:
             file_path: Path to PDF file
@@ -149,11 +162,9 @@ class AdvancedDocumentProcessor:
             List of Document objects
         """
         try:
-            from langchain_community.document_loaders import PyPDFLoader
-
             logger.info(f"Using fallback PyPDF processing for {file_path.name}")
-            loader = PyPDFLoader(str(file_path))
-            documents = loader.load()
+            with INGESTION_STAGE_SECONDS.labels("parse").time():
+                documents = get_pdf_parser().parse(file_path)
 
             # Enrich metadata
             for doc in documents:
@@ -161,8 +172,9 @@ class AdvancedDocumentProcessor:
                 doc.metadata["file_path"] = str(file_path)
                 doc.metadata["element_type"] = "Text"
 
-            # Split into chunks
-            chunks = self.text_splitter.split_documents(documents)
+            # Split into chunks, collapsing near-duplicates
+            with INGESTION_STAGE_SECONDS.labels("chunk").time():
+                chunks = deduplicate_chunks(self.text_splitter.split_documents(documents))
 
             # Add chunk metadata
             for i, chunk in enumerate(chunks):
@@ -196,11 +208,10 @@ class AdvancedDocumentProcessor:
             return documents
 
         try:
-            from openai import AsyncOpenAI
             import pdf2image
 
             logger.info("Enhancing documents with GPT-4 Vision")
-            client = AsyncOpenAI(api_key=self.settings.openai_api_key)
+            client = get_async_openai_client()
 
             # Convert PDF to images
             images = pdf2image.convert_from_path(str(file_path))
@@ -280,11 +291,11 @@ class AdvancedDocumentProcessor:
             List of processed documents
         """
         try:
-            # Use unstructured if available
+            # Use unstructured if available; parsing runs off the event loop
             if self.has_unstructured:
-                documents = self.process_pdf_with_unstructured(file_path)
+                documents = await asyncio.to_thread(self.process_pdf_with_unstructured, file_path)
             else:
-                documents = self._fallback_processing(file_path)
+                documents = await asyncio.to_thread(self._fallback_processing, file_path)
 
             # Optionally enhance with vision
             if use_vision and self.has_vision:
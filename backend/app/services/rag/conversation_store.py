@@ -0,0 +1,287 @@
+"""
+Conversation store keyed by conversation ID.
+Keeps recently used chat histories in an in-process LRU and persists
+every conversation to SQLite, so evicted conversations load lazily and
+idle ones expire after a TTL. Older turns can be folded into a rolling
+summary stored alongside the remaining messages.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+
+from app.config import get_settings
+from app.services.metrics import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationStore:
+    """
+    Chat histories per conversation with a bounded hot set.
+
+    Writes go through to SQLite, so evicting a conversation from the LRU
+    only drops it from process memory.
+    """
+
+    # Minimum seconds between two sweeps over expired conversations
+    PURGE_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_active: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the conversation store.
+
+        Args:
+            db_path: Optional path to SQLite database
+            max_active: Maximum number of conversations held in memory
+            ttl_seconds: Idle time after which a conversation is deleted
+        """
+        settings = get_settings()
+        self.db_path = Path(db_path or settings.conversation_db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_active = max_active or settings.conversation_cache_size
+        self.ttl_seconds = ttl_seconds or settings.conversation_ttl_seconds
+
+        # conversation_id -> (last use, messages, summary of older messages)
+        self._active: "OrderedDict[str, Tuple[float, List[BaseMessage], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self.hits = 0
+        self.misses = 0
+
+        self._init_database()
+        logger.info(f"Initialized conversation store with database: {self.db_path}")
+
+    def _init_database(self) -> None:
+        """Initialize database schema."""
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id TEXT PRIMARY KEY,
+                    messages TEXT NOT NULL,
+                    summary TEXT NOT NULL DEFAULT '',
+                    updated_at REAL NOT NULL
+                )
+            """)
+            # Databases created before summaries were stored
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(conversations)")]
+            if "summary" not in columns:
+                conn.execute(
+                    "ALTER TABLE conversations ADD COLUMN summary TEXT NOT NULL DEFAULT ''"
+                )
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_conversations_updated_at ON conversations(updated_at)
+            """)
+        conn.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get database connection.
+
+        Returns:
+            SQLite connection
+        """
+        return connect_sqlite(self.db_path, timeout=30)
+
+    def _expired(self, updated_at: float, now: float) -> bool:
+        """Check whether a conversation last used at updated_at has expired."""
+        return now - updated_at >= self.ttl_seconds
+
+    def _remember(
+        self, conversation_id: str, updated_at: float, messages: List[BaseMessage], summary: str
+    ) -> None:
+        """Put a conversation into the LRU, evicting the least recently used ones."""
+        self._active[conversation_id] = (updated_at, messages, summary)
+        self._active.move_to_end(conversation_id)
+        while len(self._active) > self.max_active:
+            self._active.popitem(last=False)
+
+    def _save(
+        self, conversation_id: str, updated_at: float, messages: List[BaseMessage], summary: str
+    ) -> None:
+        """Update a conversation in the LRU and in SQLite."""
+        self._remember(conversation_id, updated_at, messages, summary)
+        conn = self._get_connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO conversations (id, messages, summary, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (conversation_id, json.dumps(messages_to_dict(messages)), summary, updated_at),
+            )
+        conn.close()
+
+    def _load(self, conversation_id: str, now: float) -> Tuple[float, List[BaseMessage], str]:
+        """
+        Get a conversation from the LRU or, on a miss, from SQLite.
+
+        Args:
+            conversation_id: Conversation ID
+            now: Current time
+
+        Returns:
+            Tuple of (last use, messages, summary); empty for unknown or expired conversations
+        """
+        entry = self._active.get(conversation_id)
+        if entry is not None and not self._expired(entry[0], now):
+            self._active.move_to_end(conversation_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT messages, summary, updated_at FROM conversations WHERE id = ?",
+            (conversation_id,),
+        ).fetchone()
+        conn.close()
+
+        if row is None or self._expired(row[2], now):
+            return now, [], ""
+
+        entry = (row[2], messages_from_dict(json.loads(row[0])), row[1])
+        self._remember(conversation_id, *entry)
+        return entry
+
+    def get_messages(self, conversation_id: str) -> List[BaseMessage]:
+        """
+        Get the chat history of a conversation.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Messages in chronological order (empty for new or expired conversations)
+        """
+        with self._lock:
+            return list(self._load(conversation_id, time.time())[1])
+
+    def get_history(self, conversation_id: str) -> Tuple[str, List[BaseMessage]]:
+        """
+        Get the summary of folded turns and the remaining messages of a conversation.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Tuple of (summary, messages); the summary is empty if nothing was folded
+        """
+        with self._lock:
+            _, messages, summary = self._load(conversation_id, time.time())
+            return summary, list(messages)
+
+    def append(self, conversation_id: str, messages: List[BaseMessage]) -> None:
+        """
+        Append messages to a conversation and persist it.
+
+        Args:
+            conversation_id: Conversation ID
+            messages: New messages
+        """
+        now = time.time()
+        with self._lock:
+            _, history, summary = self._load(conversation_id, now)
+            self._save(conversation_id, now, history + list(messages), summary)
+
+        if now - self._last_purge >= self.PURGE_INTERVAL:
+            self.purge_expired()
+
+    def fold(self, conversation_id: str, summary: str, count: int) -> None:
+        """
+        Replace the oldest messages of a conversation by a summary.
+
+        Messages appended while the summary was generated are kept, since
+        only the first `count` messages are removed.
+
+        Args:
+            conversation_id: Conversation ID
+            summary: Summary covering the previous summary and the folded messages
+            count: Number of oldest messages covered by the summary
+        """
+        with self._lock:
+            updated_at, history, _ = self._load(conversation_id, time.time())
+            if len(history) < count:
+                return  # Cleared or expired meanwhile
+            self._save(conversation_id, updated_at, history[count:], summary)
+
+    def clear(self, conversation_id: str) -> None:
+        """
+        Delete a conversation.
+
+        Args:
+            conversation_id: Conversation ID
+        """
+        with self._lock:
+            self._active.pop(conversation_id, None)
+            conn = self._get_connection()
+            with conn:
+                conn.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
+            conn.close()
+
+    def purge_expired(self) -> int:
+        """
+        Delete all conversations idle for longer than the TTL.
+
+        Returns:
+            Number of deleted conversations
+        """
+        now = time.time()
+        with self._lock:
+            self._last_purge = now
+            for conversation_id in [cid for cid, (updated_at, _, _) in self._active.items()
+                                    if self._expired(updated_at, now)]:
+                del self._active[conversation_id]
+
+            conn = self._get_connection()
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM conversations WHERE updated_at <= ?", (now - self.ttl_seconds,)
+                ).rowcount
+            conn.close()
+
+        if deleted:
+            logger.info(f"Deleted {deleted} expired conversations")
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary with active and stored conversations and LRU hit rate
+        """
+        conn = self._get_connection()
+        stored = conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+        conn.close()
+
+        total = self.hits + self.misses
+        return {
+            "active_conversations": len(self._active),
+            "max_active_conversations": self.max_active,
+            "stored_conversations": stored,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Global conversation store instance
+_conversation_store: Optional[ConversationStore] = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get or create conversation store instance."""
+    global _conversation_store
+    if _conversation_store is None:
+        _conversation_store = ConversationStore()
+    return _conversation_store
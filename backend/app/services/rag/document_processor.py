@@ -3,15 +3,21 @@ Document processing module for PDF handling and text chunking.
 Supports batch processing and metadata extraction.
 """
 
+import asyncio
+import hashlib
 import logging
+import uuid
 from pathlib import Path
-from typing import List, Optional
+from typing import Collection, List, Optional
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
 
 from app.config import get_settings
+from app.services.metrics import INGESTION_STAGE_SECONDS
+from app.services.rag.embedding_cache import normalize_text
+from app.services.rag.near_duplicates import deduplicate_chunks
+from app.services.rag.pdf_parsing import get_pdf_parser
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +36,21 @@ class DocumentProcessor:
             length_function=len,
             separators=["\n\n", "\n", ". ", " ", ""],
             is_separator_regex=False,
+            add_start_index=True,
         )
 
+    @staticmethod
+    def _enrich_pages(documents: List[Document], file_path: Path) -> List[Document]:
+        """Add source file metadata to parsed pages."""
+        for doc in documents:
+            doc.metadata["source_file"] = file_path.name
+            doc.metadata["file_path"] = str(file_path)
+        return documents
+
     def load_pdf(self, file_path: Path) -> List[Document]:
         """
         Load a PDF file and extract its content.
+        Text extraction runs in the PDF parsing pool; the calling thread waits.
 
         Args:
             file_path: Path to the PDF file
@@ -51,14 +67,33 @@ class DocumentProcessor:
 
         try:
             logger.info(f"Loading PDF: {file_path}")
-            loader = PyPDFLoader(str(file_path))
-            documents = loader.load()
+            documents = self._enrich_pages(get_pdf_parser().parse(file_path), file_path)
+            logger.info(f"Successfully loaded {len(documents)} pages from {file_path.name}")
+            return documents
+
+        except Exception as e:
+            logger.error(f"Error loading PDF {file_path}: {str(e)}")
+            raise
 
-            # Enrich metadata
-            for doc in documents:
-                doc.metadata["source_file"] = file_path.name
-                doc.metadata["file_path"] = str(file_path)
+    async def aload_pdf(self, file_path: Path) -> List[Document]:
+        """
+        Load a PDF file without blocking the event loop.
+
+        Args:
+            file_path: Path to the PDF file
+
+        Returns:
+            List of Document objects with page content and metadata
+
+        Raises:
+            FileNotFoundError: If the PDF file doesn't exist
+            Exception: If PDF loading fails
+        """
+        if not file_path.exists():
+            raise FileNotFoundError(f"PDF file not found: {file_path}")
 
+        try:
+            documents = self._enrich_pages(await get_pdf_parser().aparse(file_path), file_path)
             logger.info(f"Successfully loaded {len(documents)} pages from {file_path.name}")
             return documents
 
@@ -69,6 +104,7 @@ class DocumentProcessor:
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """
         Split documents into smaller chunks for embedding.
+        Near-duplicate chunks are collapsed into their first occurrence.
 
         Args:
             documents: List of documents to split
@@ -78,7 +114,7 @@ class DocumentProcessor:
         """
         try:
             logger.info(f"Splitting {len(documents)} documents into chunks")
-            chunks = self.text_splitter.split_documents(documents)
+            chunks = deduplicate_chunks(self.text_splitter.split_documents(documents))
 
             # Add chunk metadata
             for i, chunk in enumerate(chunks):
@@ -108,10 +144,39 @@ class DocumentProcessor:
         """
         try:
             # Load PDF
-            documents = self.load_pdf(file_path)
+            with INGESTION_STAGE_SECONDS.labels("parse").time():
+                documents = self.load_pdf(file_path)
 
             # Split into chunks
-            chunks = self.split_documents(documents)
+            with INGESTION_STAGE_SECONDS.labels("chunk").time():
+                chunks = self.split_documents(documents)
+
+            logger.info(
+                f"Processed {file_path.name}: {len(documents)} pages → {len(chunks)} chunks"
+            )
+            return chunks
+
+        except Exception as e:
+            logger.error(f"Error processing PDF {file_path}: {str(e)}")
+            raise
+
+    async def aprocess_pdf(self, file_path: Path) -> List[Document]:
+        """
+        Load and chunk a PDF without blocking the event loop.
+        Parsing runs in the PDF parsing pool, splitting in a worker thread.
+
+        Args:
+            file_path: Path to the PDF file
+
+        Returns:
+            List of processed and chunked documents
+        """
+        try:
+            with INGESTION_STAGE_SECONDS.labels("parse").time():
+                documents = await self.aload_pdf(file_path)
+
+            with INGESTION_STAGE_SECONDS.labels("chunk").time():
+                chunks = await asyncio.to_thread(self.split_documents, documents)
 
             logger.info(
                 f"Processed {file_path.name}: {len(documents)} pages → {len(chunks)} chunks"
@@ -127,6 +192,7 @@ class DocumentProcessor:
     ) -> List[Document]:
         """
         Process multiple PDF files in batches.
+        The files of a batch are parsed concurrently in the PDF parsing pool.
 
         Args:
             file_paths: List of PDF file paths
@@ -153,14 +219,21 @@ class DocumentProcessor:
 
             logger.info(f"Processing batch {batch_num}/{total_batches}")
 
-            for file_path in batch:
+            missing = [file_path for file_path in batch if not file_path.exists()]
+            for file_path in missing:
+                logger.error(f"Failed to process {file_path}: PDF file not found")
+            batch = [file_path for file_path in batch if file_path.exists()]
+
+            for file_path, pages in zip(batch, get_pdf_parser().parse_many(batch)):
+                # Continue with next file instead of failing completely
+                if isinstance(pages, Exception):
+                    logger.error(f"Failed to process {file_path}: {str(pages)}")
+                    continue
                 try:
-                    chunks = self.process_pdf(file_path)
+                    chunks = self.split_documents(self._enrich_pages(pages, file_path))
                     all_chunks.extend(chunks)
                 except Exception as e:
                     logger.error(f"Failed to process {file_path}: {str(e)}")
-                    # Continue with next file instead of failing completely
-                    continue
 
         logger.info(
             f"Completed processing {total_files} files → {len(all_chunks)} total chunks"
@@ -196,6 +269,84 @@ class DocumentProcessor:
         }
 
 
+def chunk_content_hash(text: str) -> str:
+    """
+    Hash chunk text for change detection (whitespace- and Unicode-normalized).
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def file_content_hash(file_path: Path) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_chunk_id(document_id: str, document_hash: str, page, offset) -> str:
+    """
+    Derive a stable chunk ID from the document, its file and the chunk position.
+    Re-ingesting the same file yields the same IDs, so writes are idempotent;
+    identical files registered as separate documents get distinct IDs.
+
+    Args:
+        document_id: Document ID
+        document_hash: SHA-256 of the source file
+        page: Page number (or None)
+        offset: Character offset of the chunk on its page (or chunk index)
+
+    Returns:
+        UUID string
+    """
+    name = f"chunk:{document_id}:{document_hash}:{page}:{offset}"
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+
+def assign_chunk_ids(
+    documents: List[Document],
+    document_id: str,
+    document_hash: str,
+    reserved: Collection[str] = (),
+) -> None:
+    """
+    Set deterministic IDs on chunks (in place).
+    Uses the splitter's "start_index" as offset, falling back to "chunk_id".
+    IDs colliding with reserved IDs or each other also hash the chunk text.
+
+    Args:
+        documents: Chunks of one document
+        document_id: Document ID
+        document_hash: SHA-256 of the source file
+        reserved: IDs already used by other chunks of the document
+    """
+    taken = set(reserved)
+    for doc in documents:
+        page = doc.metadata.get("page", doc.metadata.get("page_number"))
+        offset = doc.metadata.get("start_index", doc.metadata.get("chunk_id"))
+        chunk_id = make_chunk_id(document_id, document_hash, page, offset)
+        if chunk_id in taken:
+            offset = f"{offset}:{chunk_content_hash(doc.page_content)}"
+            chunk_id = make_chunk_id(document_id, document_hash, page, offset)
+        doc.id = chunk_id
+        taken.add(chunk_id)
+
+
 def validate_pdf(file_path: Path) -> bool:
     """
     Validate if a file is a valid PDF.
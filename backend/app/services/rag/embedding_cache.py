@@ -0,0 +1,327 @@
+"""
+Embedding cache module for content-addressed chunk embeddings.
+Persists embeddings in SQLite so re-ingested text is never embedded twice.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.config import get_settings
+from app.services.metrics import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize chunk text before hashing.
+
+    Args:
+        text: Raw chunk text
+
+    Returns:
+        NFC-normalized text with collapsed whitespace
+    """
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def make_cache_key(model: str, dimensions: Optional[int], text: str) -> str:
+    """
+    Build the content-addressed cache key for a chunk.
+
+    Args:
+        model: Embedding model name
+        dimensions: Requested embedding dimensions (None = model default)
+        text: Chunk text
+
+    Returns:
+        Hex SHA-256 key over (model, dimensions, normalized text)
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{model}\x00{dimensions or 0}\x00".encode("utf-8"))
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Disk-backed, size-bounded embedding cache stored in SQLite.
+    Entries are evicted least-recently-used once max_entries is exceeded.
+    """
+
+    # SQLite limits the number of host parameters per statement
+    _MAX_PARAMS = 500
+
+    def __init__(self, db_path: Path, max_entries: int = 200_000):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_entries: Maximum number of cached embeddings
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_database()
+        logger.info(f"Initialized embedding cache at: {self.db_path}")
+
+    def _init_database(self) -> None:
+        """Initialize database schema."""
+        conn = self._get_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)
+        """)
+        conn.commit()
+        conn.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get database connection.
+
+        Returns:
+            SQLite connection
+        """
+        return connect_sqlite(self.db_path, timeout=30)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up several embeddings in one round trip.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dictionary of key -> embedding for every key that was found
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+        if not unique_keys:
+            return found
+
+        conn = self._get_connection()
+        try:
+            for i in range(0, len(unique_keys), self._MAX_PARAMS):
+                batch = unique_keys[i:i + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                conn.commit()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]) -> None:
+        """
+        Store several embeddings and evict old entries if over capacity.
+
+        Args:
+            items: Dictionary of key -> embedding
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items.items()
+        ]
+
+        conn = self._get_connection()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._evict(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Evict least-recently-used entries beyond max_entries.
+
+        Args:
+            conn: Open SQLite connection (committed by the caller)
+        """
+        (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                """
+                DELETE FROM embeddings WHERE key IN (
+                    SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (overflow,),
+            )
+            logger.info(f"Evicted {overflow} entries from embedding cache")
+
+    def __len__(self) -> int:
+        conn = self._get_connection()
+        try:
+            (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            return count
+        finally:
+            conn.close()
+
+    def clear(self) -> None:
+        """Remove all cached embeddings and reset counters."""
+        conn = self._get_connection()
+        try:
+            conn.execute("DELETE FROM embeddings")
+            conn.commit()
+        finally:
+            conn.close()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, hits, misses and hit rate
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves chunk embeddings from an EmbeddingCache
+    and only forwards cache misses to the underlying model.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: EmbeddingCache,
+        model: str,
+        dimensions: Optional[int] = None,
+    ):
+        """
+        Initialize the cached embeddings wrapper.
+
+        Args:
+            embeddings: Underlying embeddings implementation
+            cache: Embedding cache instance
+            model: Embedding model name (part of the cache key)
+            dimensions: Embedding dimensions (part of the cache key)
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.dimensions = dimensions
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, serving byte-identical text from the cache.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embeddings in input order
+        """
+        keys = [make_cache_key(self.model, self.dimensions, text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        # Embed each distinct missing text only once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            logger.info(
+                f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses"
+            )
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(fresh)
+            cached.update(fresh)
+
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a query (queries are not persisted in the chunk cache).
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        return self.embeddings.embed_query(text)
+
+
+# Global cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Get global embedding cache instance.
+
+    Returns:
+        EmbeddingCache instance
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        settings = get_settings()
+        _embedding_cache = EmbeddingCache(
+            db_path=settings.embedding_cache_path,
+            max_entries=settings.embedding_cache_max_entries,
+        )
+    return _embedding_cache
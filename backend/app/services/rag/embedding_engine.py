@@ -0,0 +1,128 @@
+"""
+Ingestion embedding engine.
+Packs chunks into token-bounded batches, embeds them concurrently and
+writes the results to the vector store in input order.
+"""
+
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+from langchain_core.documents import Document
+
+from app.config import get_settings
+from app.services.rag.token_counter import get_token_counter
+from app.services.rag.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingEngine:
+    """
+    Embeds document chunks for ingestion with token-aware batching
+    and bounded concurrency.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        max_tokens_per_batch: Optional[int] = None,
+        max_inputs_per_batch: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        token_counter: Optional[Callable[[str], int]] = None,
+    ):
+        """
+        Initialize the embedding engine.
+
+        Args:
+            vector_store: Target vector store
+            max_tokens_per_batch: Token limit per embeddings request (default: from settings)
+            max_inputs_per_batch: Input limit per embeddings request (default: from settings)
+            max_concurrency: Concurrent embeddings requests (default: from settings)
+            token_counter: Optional token counting function (default: tiktoken)
+        """
+        settings = get_settings()
+        self.vector_store = vector_store
+        self.max_tokens_per_batch = max_tokens_per_batch or settings.embedding_batch_max_tokens
+        self.max_inputs_per_batch = max_inputs_per_batch or settings.embedding_batch_max_inputs
+        self.max_concurrency = max_concurrency or settings.embedding_max_concurrency
+        self.count_tokens = token_counter or get_token_counter(settings.embedding_model)
+
+    def pack_batches(self, documents: List[Document]) -> List[List[Document]]:
+        """
+        Pack chunks into consecutive batches bounded by token and input count.
+
+        Args:
+            documents: Chunks in ingestion order
+
+        Returns:
+            List of batches preserving the original order
+        """
+        batches: List[List[Document]] = []
+        current: List[Document] = []
+        current_tokens = 0
+
+        for doc in documents:
+            tokens = self.count_tokens(doc.page_content)
+            if current and (
+                current_tokens + tokens > self.max_tokens_per_batch
+                or len(current) >= self.max_inputs_per_batch
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+
+            # A single oversized chunk still forms its own batch
+            current.append(doc)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    async def add_documents(self, documents: List[Document]) -> List[str]:
+        """
+        Embed chunks concurrently and add them to the vector store in order.
+
+        Args:
+            documents: Chunks to add
+
+        Returns:
+            List of chunk IDs in input order
+        """
+        batches = self.pack_batches(documents)
+        if not batches:
+            return []
+
+        logger.info(
+            f"Embedding {len(documents)} chunks in {len(batches)} batches "
+            f"(max_tokens={self.max_tokens_per_batch}, concurrency={self.max_concurrency})"
+        )
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        embeddings = self.vector_store.embeddings
+
+        async def embed_batch(batch: List[Document]) -> List[List[float]]:
+            async with semaphore:
+                texts = [doc.page_content for doc in batch]
+                return await asyncio.to_thread(embeddings.embed_documents, texts)
+
+        tasks = [asyncio.create_task(embed_batch(batch)) for batch in batches]
+
+        ids: List[str] = []
+        try:
+            # Write in order while later batches are still being embedded
+            for i, (batch, task) in enumerate(zip(batches, tasks)):
+                vectors = await task
+                batch_ids = await asyncio.to_thread(
+                    self.vector_store.add_embedded_documents, batch, vectors
+                )
+                ids.extend(batch_ids)
+                logger.info(f"Stored batch {i + 1}/{len(batches)} ({len(batch)} chunks)")
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return ids
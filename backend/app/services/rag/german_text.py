@@ -0,0 +1,109 @@
+"""
+German-aware text analysis for sparse retrieval.
+Tokenization, stopword removal and CISTEM stemming.
+"""
+
+import re
+import unicodedata
+from typing import List
+
+# Paragraph references ("§ 823", "§§ 3a") and section numbers ("3.2.1")
+_PARAGRAPH_RE = re.compile(r"§+\s*(\d+[a-z]?)")
+_TOKEN_RE = re.compile(r"§\d+[a-z]?|\d+(?:[.,]\d+)+|[^\W_]+", re.UNICODE)
+
+GERMAN_STOPWORDS = frozenset("""
+aber alle allem allen aller alles als also am an ander andere anderem anderen anderer
+anderes anders auch auf aus bei beim bin bis bist da damit dann das dass dein deine dem
+den denn der des dessen deshalb die dies diese diesem diesen dieser dieses doch dort du
+durch ein eine einem einen einer eines einig einige er es etwas euch euer eure für gegen
+hab habe haben hat hatte hatten hier hin hinter ich ihm ihn ihnen ihr ihre ihrem ihren
+ihrer ihres im in indem ins ist jede jedem jeden jeder jedes jene jenem jenen jener jenes
+jetzt kann kein keine keinem keinen keiner man manche mich mir mit muss musste nach nicht
+nichts noch nun nur ob oder ohne sehr sein seine seinem seinen seiner seines selbst sich
+sie sind so solche soll sollte sondern sonst über um und uns unser unsere unter vom von
+vor war waren warst was weil welche welchem welchen welcher welches wenn wer werde werden
+wie wieder will wir wird wirst wo wollen wollte würde würden zu zum zur zwar zwischen
+the a an and or of to in is are was for on with
+""".split())
+
+_STRIP_GE = re.compile(r"^ge(.{4,})")
+_REPL_XX = re.compile(r"(.)\1")
+_STRIP_EMR = re.compile(r"e[mr]$")
+_STRIP_ND = re.compile(r"nd$")
+_STRIP_T = re.compile(r"t$")
+_STRIP_ESN = re.compile(r"[esn]$")
+_REPL_XX_BACK = re.compile(r"(.)\*")
+
+
+def stem(word: str) -> str:
+    """
+    Stem a lowercase German word with the CISTEM algorithm
+    (Weissweiler & Fraser, 2017), case-insensitive variant.
+
+    Args:
+        word: Lowercase word
+
+    Returns:
+        Word stem
+    """
+    if not word:
+        return word
+
+    word = word.replace("ü", "u").replace("ö", "o").replace("ä", "a").replace("ß", "ss")
+    word = _STRIP_GE.sub(r"\1", word)
+    word = word.replace("sch", "$").replace("ei", "%").replace("ie", "&")
+    word = _REPL_XX.sub(r"\1*", word)
+
+    while len(word) > 3:
+        if len(word) > 5:
+            word, stripped = _STRIP_EMR.subn("", word)
+            if stripped:
+                continue
+            word, stripped = _STRIP_ND.subn("", word)
+            if stripped:
+                continue
+        word, stripped = _STRIP_T.subn("", word)
+        if stripped:
+            continue
+        word, stripped = _STRIP_ESN.subn("", word)
+        if stripped:
+            continue
+        break
+
+    word = _REPL_XX_BACK.sub(r"\1\1", word)
+    return word.replace("%", "ei").replace("&", "ie").replace("$", "sch")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase tokens, keeping paragraph references
+    ("§823") and section numbers ("3.2.1") intact.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of raw tokens
+    """
+    text = unicodedata.normalize("NFC", text).lower()
+    text = _PARAGRAPH_RE.sub(r" §\1 ", text)
+    return _TOKEN_RE.findall(text)
+
+
+def analyze(text: str) -> List[str]:
+    """
+    Full analysis chain: tokenize, drop stopwords, stem.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of index terms
+    """
+    terms = []
+    for token in tokenize(text):
+        if token[0] == "§" or token[0].isdigit():
+            terms.append(token)
+        elif len(token) > 1 and token not in GERMAN_STOPWORDS:
+            terms.append(stem(token))
+    return terms
@@ -0,0 +1,132 @@
+"""
+Token-budgeted chat history compaction.
+Keeps the most recent turns verbatim and folds older turns into a
+rolling summary, so the history part of each prompt stays bounded.
+"""
+
+import logging
+from typing import List
+
+from langchain.chains.conversational_retrieval.base import _get_chat_history
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+from app.services.rag.token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+SUMMARY_TEMPLATE = """Fasse den bisherigen Verlauf eines Lerngesprächs zwischen Studierendem und
+Studienassistent zusammen.
+
+Behalte behandelte Themen, Fachbegriffe, genannte Quellen (Dateien, Seiten) und offene Fragen.
+Lass Begrüßungen und Wiederholungen weg. Antworte auf Deutsch mit höchstens {max_words} Wörtern.
+
+Bisherige Zusammenfassung:
+{summary}
+
+Neue Gesprächsabschnitte:
+{history}
+
+Aktualisierte Zusammenfassung:"""
+
+SUMMARY_PREFIX = "Zusammenfassung des bisherigen Gesprächs: "
+
+
+class HistoryCompactor:
+    """
+    Formats chat histories under a token budget and summarizes older turns.
+    """
+
+    def __init__(self, llm: BaseChatModel, keep_turns: int, token_budget: int, model: str):
+        """
+        Initialize the history compactor.
+
+        Args:
+            llm: Chat model used for summaries
+            keep_turns: Maximum number of recent turns kept verbatim
+            token_budget: Maximum tokens of summary plus verbatim turns
+            model: Model name used for token counting
+        """
+        self.llm = llm
+        self.keep_turns = keep_turns
+        self.token_budget = token_budget
+        self.model = model
+
+    def _tokens(self, text: str) -> int:
+        """Count tokens of a text."""
+        return count_tokens(text, self.model) if text else 0
+
+    def verbatim_count(self, summary: str, messages: List[BaseMessage]) -> int:
+        """
+        Number of newest messages that stay verbatim.
+
+        Whole turns (question and answer) are added from the newest one
+        backwards while they fit into the budget left by the summary, up to
+        keep_turns. The latest turn is always kept.
+
+        Args:
+            summary: Summary of earlier turns
+            messages: Messages not yet folded into the summary
+
+        Returns:
+            Number of messages from the end of the list
+        """
+        budget = self.token_budget - self._tokens(summary)
+        count = 0
+        used = 0
+        while count < len(messages) and count < 2 * self.keep_turns:
+            turn = messages[max(len(messages) - count - 2, 0):len(messages) - count]
+            used += self._tokens(_get_chat_history(turn))
+            if count and used > budget:
+                break
+            count += len(turn)
+        return count
+
+    def format_history(self, summary: str, messages: List[BaseMessage]) -> str:
+        """
+        Build the chat history text for a prompt.
+
+        Args:
+            summary: Summary of earlier turns
+            messages: Messages not yet folded into the summary
+
+        Returns:
+            Summary followed by the verbatim recent turns
+        """
+        count = self.verbatim_count(summary, messages)
+        history = _get_chat_history(messages[len(messages) - count:]) if count else ""
+        if summary:
+            return f"\n{SUMMARY_PREFIX}{summary}{history}"
+        return history
+
+    def messages_to_fold(self, summary: str, messages: List[BaseMessage]) -> int:
+        """
+        Number of oldest messages that no longer fit verbatim.
+
+        Args:
+            summary: Summary of earlier turns
+            messages: Messages not yet folded into the summary
+
+        Returns:
+            Number of messages from the start of the list to fold into the summary
+        """
+        return len(messages) - self.verbatim_count(summary, messages)
+
+    def summarize(self, summary: str, messages: List[BaseMessage]) -> str:
+        """
+        Fold messages into the rolling summary.
+
+        Args:
+            summary: Previous summary (may be empty)
+            messages: Messages to fold
+
+        Returns:
+            Updated summary
+        """
+        prompt = SUMMARY_TEMPLATE.format(
+            max_words=max(self.token_budget // 4, 50),
+            summary=summary or "(noch keine)",
+            history=_get_chat_history(messages).strip(),
+        )
+        return self.llm.invoke(prompt).content.strip()
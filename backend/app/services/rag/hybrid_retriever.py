@@ -0,0 +1,227 @@
+"""
+Hybrid retrieval module.
+Fuses sparse BM25 and dense vector results with reciprocal-rank fusion.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+logger = logging.getLogger(__name__)
+
+
+# Exact references: paragraphs, section numbers, quoted terms
+_REFERENCE_RE = re.compile(r"§+\s*\d+[a-z]?|\b\d+(?:\.\d+)+\b|\"([^\"]+)\"|„([^“]+)“")
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[str]],
+    k: int = 60,
+) -> List[Tuple[str, float]]:
+    """
+    Merge ranked ID lists with reciprocal-rank fusion.
+
+    Args:
+        result_lists: Ranked lists of IDs (best first)
+        k: RRF damping constant
+
+    Returns:
+        List of (id, fused score) sorted by descending score
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for results in result_lists:
+        for rank, item_id in enumerate(results):
+            scores[item_id] += 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def _normalize_reference(text: str) -> str:
+    """Collapse whitespace (none after "§") and casefold."""
+    return re.sub(r"§\s*", "§", " ".join(text.split())).casefold()
+
+
+def exact_references(query: str) -> List[str]:
+    """
+    Extract the exact references a query targets.
+
+    Args:
+        query: Query text
+
+    Returns:
+        Normalized paragraph references, section numbers and quoted terms
+    """
+    references = []
+    for match in _REFERENCE_RE.finditer(query):
+        phrase = match.group(1) or match.group(2)
+        references.append(_normalize_reference(phrase or match.group(0)))
+    return [reference for reference in references if reference]
+
+
+def is_exact_lookup(query: str) -> bool:
+    """
+    Check whether a query targets an exact reference.
+
+    Args:
+        query: Query text
+
+    Returns:
+        True for paragraph references, section numbers or quoted terms
+    """
+    return bool(exact_references(query))
+
+
+def contains_references(text: str, references: Sequence[str]) -> bool:
+    """
+    Check whether a text contains every reference as a whole term.
+
+    Args:
+        text: Chunk text
+        references: References from exact_references()
+
+    Returns:
+        True if all references occur (e.g. "§823" does not match "§8231")
+    """
+    normalized = _normalize_reference(text)
+    return bool(references) and all(
+        re.search(rf"(?<![\w.]){re.escape(reference)}(?!\w|\.\d)", normalized)
+        for reference in references
+    )
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Retriever combining the sparse index with dense vector search.
+    With sparse_shortcut, exact-reference queries whose best BM25 hit
+    literally contains the reference skip the dense search and therefore
+    the query embedding round trip.
+    """
+
+    vector_store: Any
+    sparse_index: Any
+    k: int = 4
+    candidate_k: int = 20
+    rrf_k: int = 60
+    sparse_shortcut: bool = False
+    filter: Optional[Dict[str, Any]] = None
+
+    def _sparse_ids(self, query: str) -> List[str]:
+        """Ranked sparse candidate IDs, restricted to the metadata filter."""
+        sparse_ids = [
+            chunk_id for chunk_id, _ in self.sparse_index.search(query, k=self.candidate_k)
+        ]
+        if self.filter:
+            sparse_ids = self.vector_store.filter_ids(sparse_ids, self.filter)
+        return sparse_ids
+
+    def _sparse_only(self, query: str, sparse_ids: List[str]) -> Optional[List[Document]]:
+        """
+        Top-k sparse documents if the shortcut applies to a query.
+
+        Args:
+            query: Query text
+            sparse_ids: Ranked sparse candidate IDs
+
+        Returns:
+            Documents, or None if dense search is needed
+        """
+        if not self.sparse_shortcut or len(sparse_ids) < self.k:
+            return None
+        references = exact_references(query)
+        if not references:
+            return None
+
+        documents = self.vector_store.get_documents_by_ids(sparse_ids[:self.k])
+        if documents and contains_references(documents[0].page_content, references):
+            logger.info(f"Sparse-only retrieval for exact lookup: '{query}'")
+            return documents
+        return None
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        """
+        Retrieve documents for a query.
+
+        Args:
+            query: Query text
+            run_manager: Callback manager
+
+        Returns:
+            Top-k fused documents
+        """
+        sparse_ids = self._sparse_ids(query)
+
+        documents = self._sparse_only(query, sparse_ids)
+        if documents is not None:
+            return documents
+
+        dense_hits = self.vector_store.similarity_search_with_ids(
+            query, k=self.candidate_k, filter=self.filter
+        )
+        return self.fuse(sparse_ids, dense_hits)
+
+    def retrieve_many(self, queries: List[str]) -> List[List[Document]]:
+        """
+        Retrieve documents for many queries at once.
+
+        Queries needing dense search are embedded in one batched call and
+        searched together.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Top-k fused documents per query, in input order
+        """
+        sparse_ids = [self._sparse_ids(query) for query in queries]
+        sparse_only = [self._sparse_only(query, ids) for query, ids in zip(queries, sparse_ids)]
+        dense_positions = [i for i, documents in enumerate(sparse_only) if documents is None]
+        dense_hits = dict(zip(
+            dense_positions,
+            self.vector_store.similarity_search_many(
+                [queries[i] for i in dense_positions], k=self.candidate_k, filter=self.filter
+            ),
+        ))
+
+        return [
+            self.fuse(sparse_ids[i], dense_hits[i]) if i in dense_hits else sparse_only[i]
+            for i in range(len(queries))
+        ]
+
+    def fuse(
+        self,
+        sparse_ids: List[str],
+        dense_hits: List[Tuple[str, Document, float]],
+    ) -> List[Document]:
+        """
+        Fuse sparse IDs and dense hits into the final top-k documents.
+
+        Args:
+            sparse_ids: Ranked chunk IDs from the sparse index
+            dense_hits: Ranked (id, document, distance) tuples from dense search
+
+        Returns:
+            Top-k fused documents
+        """
+        documents = {chunk_id: doc for chunk_id, doc, _ in dense_hits}
+        fused = reciprocal_rank_fusion(
+            [sparse_ids, [chunk_id for chunk_id, _, _ in dense_hits]],
+            k=self.rrf_k,
+        )
+        top_ids = [chunk_id for chunk_id, _ in fused[:self.k]]
+
+        # Sparse-only hits still need their content
+        missing = [chunk_id for chunk_id in top_ids if chunk_id not in documents]
+        if missing:
+            for doc in self.vector_store.get_documents_by_ids(missing):
+                documents[doc.id] = doc
+
+        return [documents[chunk_id] for chunk_id in top_ids if chunk_id in documents]
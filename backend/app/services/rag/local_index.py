@@ -0,0 +1,704 @@
+"""
+Local vector index module.
+Mirrors the Chroma collection into a memory-mapped NumPy matrix for
+exact top-k search without going through the LangChain/Chroma stack.
+Optionally keeps only quantized codes in memory and rescores the best
+candidates against the full-precision matrix on disk.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from app.config import get_settings
+from app.services.metrics import connect_sqlite
+from app.services.rag.quantization import QuantizedCodes, create_codes
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorIndex:
+    """
+    Exact vector index backed by a memory-mapped matrix plus an
+    id/metadata side table in SQLite. Only chunk IDs and the alive mask
+    stay in memory; texts and metadata are read from the side table for
+    the returned hits. Vectors are L2-normalized so the dot product
+    equals cosine similarity.
+    """
+
+    # Rows scored per block (bounds temporary memory for float16 matrices)
+    BLOCK_ROWS = 65536
+
+    def __init__(
+        self,
+        directory: Path,
+        dtype: str = "float32",
+        initial_capacity: int = 1024,
+        quantization: str = "none",
+        rerank_candidates: int = 200,
+        compact_ratio: float = 0.25,
+    ):
+        """
+        Initialize the local vector index.
+
+        Args:
+            directory: Directory holding the matrix and side table
+            dtype: Storage dtype ("float32" or "float16")
+            initial_capacity: Rows allocated when the matrix is first created
+            quantization: First-pass codes ("none", "int8" or "binary")
+            rerank_candidates: Candidates rescored at full precision when quantized
+            compact_ratio: Share of deleted rows that triggers compaction
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported local index dtype: {dtype}")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / "vectors.bin"
+        self.db_path = self.directory / "index.db"
+        self.dtype = np.dtype(dtype)
+        self.initial_capacity = initial_capacity
+        self.quantization = quantization
+        self.rerank_candidates = rerank_candidates
+        self.compact_ratio = compact_ratio
+        self.quantization_report: Optional[Dict[str, Any]] = None
+        self._lock = threading.RLock()
+        self._matrix: Optional[np.memmap] = None
+        self._columns: Dict[str, np.ndarray] = {}
+
+        self._init_database()
+        self._load()
+        logger.info(f"Initialized local vector index at {self.directory} ({len(self)} vectors)")
+
+    def _init_database(self) -> None:
+        """Initialize side table schema."""
+        conn = self._get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rows (
+                row INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL UNIQUE,
+                alive INTEGER NOT NULL,
+                metadata TEXT NOT NULL,
+                document TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get database connection.
+
+        Returns:
+            SQLite connection
+        """
+        return connect_sqlite(self.db_path, timeout=30)
+
+    def _load(self) -> None:
+        """Load the side table and open the matrix."""
+        conn = self._get_connection()
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        rows = conn.execute("SELECT row, chunk_id, alive FROM rows ORDER BY row").fetchall()
+        conn.close()
+
+        if meta.get("dtype") and meta["dtype"] != self.dtype.name:
+            raise ValueError(
+                f"Local index at {self.directory} stores {meta['dtype']}, not {self.dtype.name}"
+            )
+
+        self.dim = int(meta["dim"]) if "dim" in meta else None
+        self.capacity = int(meta.get("capacity", 0))
+        self._ids: List[str] = [row[1] for row in rows]
+        self._rows: Dict[str, int] = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+        self._alive = np.array([bool(row[2]) for row in rows], dtype=bool)
+
+        self._codes: Optional[QuantizedCodes] = None
+        if self.dim is not None and self.capacity:
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=self.dtype, mode="r+", shape=(self.capacity, self.dim)
+            )
+            if self.quantization != "none":
+                self._codes = create_codes(self.quantization, self.dim, self.capacity)
+                for start in range(0, len(self._ids), self.BLOCK_ROWS):
+                    block = self._matrix[start:min(start + self.BLOCK_ROWS, len(self._ids))]
+                    self._codes.set(
+                        np.arange(start, start + len(block)), block.astype(np.float32)
+                    )
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """
+        Grow the memory-mapped matrix to hold at least the given number of rows.
+
+        Args:
+            rows: Required number of rows
+        """
+        if rows <= self.capacity:
+            return
+
+        new_capacity = max(rows, self.capacity * 2, self.initial_capacity)
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(new_capacity * self.dim * self.dtype.itemsize)
+
+        self._matrix = np.memmap(
+            self.vectors_path, dtype=self.dtype, mode="r+", shape=(new_capacity, self.dim)
+        )
+        self.capacity = new_capacity
+
+        if self.quantization != "none":
+            if self._codes is None:
+                self._codes = create_codes(self.quantization, self.dim)
+            self._codes.resize(new_capacity)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Sequence[Dict[str, Any]],
+        documents: Sequence[str],
+    ) -> None:
+        """
+        Add or replace vectors.
+
+        Args:
+            ids: Chunk IDs
+            embeddings: Embeddings in the same order
+            metadatas: Chunk metadata in the same order
+            documents: Chunk texts in the same order
+        """
+        if not ids:
+            return
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match "
+                    f"index dimension {self.dim}"
+                )
+
+            rows = []
+            next_row = len(self._ids)
+            for chunk_id in ids:
+                if chunk_id in self._rows:
+                    rows.append(self._rows[chunk_id])
+                else:
+                    rows.append(next_row)
+                    next_row += 1
+
+            self._ensure_capacity(next_row)
+            self._matrix[rows] = vectors.astype(self.dtype)
+            self._matrix.flush()
+            if self._codes is not None:
+                self._codes.set(rows, vectors)
+
+            conn = self._get_connection()
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rows (row, chunk_id, alive, metadata, document) "
+                    "VALUES (?, ?, 1, ?, ?)",
+                    [
+                        (row, chunk_id, json.dumps(metadata or {}), document)
+                        for row, chunk_id, metadata, document in zip(
+                            rows, ids, metadatas, documents
+                        )
+                    ],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("dim", str(self.dim)),
+                        ("dtype", self.dtype.name),
+                        ("capacity", str(self.capacity)),
+                    ],
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            grow = next_row - len(self._ids)
+            if grow:
+                self._ids.extend([None] * grow)
+                self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+
+            for row, chunk_id in zip(rows, ids):
+                self._ids[row] = chunk_id
+                self._rows[chunk_id] = row
+                self._alive[row] = True
+            self._columns.clear()
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """
+        Remove vectors by chunk ID.
+
+        Args:
+            ids: Chunk IDs
+
+        Returns:
+            Number of removed vectors
+        """
+        with self._lock:
+            rows = [self._rows[c] for c in ids if c in self._rows and self._alive[self._rows[c]]]
+            if not rows:
+                return 0
+
+            conn = self._get_connection()
+            try:
+                conn.executemany("UPDATE rows SET alive = 0 WHERE row = ?", [(r,) for r in rows])
+                conn.commit()
+            finally:
+                conn.close()
+
+            self._alive[rows] = False
+            tombstones = len(self._ids) - len(self)
+            if tombstones > self.compact_ratio * len(self._ids):
+                self.compact()
+            return len(rows)
+
+    def compact(self) -> int:
+        """
+        Drop deleted rows by rewriting the matrix and side table with the
+        live rows packed at the front. Searches holding a snapshot of the
+        old matrix keep reading the replaced file until they finish.
+
+        Returns:
+            Number of dropped rows
+        """
+        with self._lock:
+            keep = np.flatnonzero(self._alive)
+            dropped = len(self._ids) - keep.size
+            if dropped == 0:
+                return 0
+
+            capacity = max(keep.size, self.initial_capacity)
+            compacted_path = self.vectors_path.with_suffix(".compact")
+            matrix = np.memmap(
+                compacted_path, dtype=self.dtype, mode="w+", shape=(capacity, self.dim)
+            )
+            for start in range(0, keep.size, self.BLOCK_ROWS):
+                block = keep[start:start + self.BLOCK_ROWS]
+                matrix[start:start + block.size] = self._matrix[block]
+            matrix.flush()
+            del matrix
+
+            conn = self._get_connection()
+            try:
+                rows = conn.execute(
+                    "SELECT row, chunk_id, metadata, document FROM rows "
+                    "WHERE alive = 1 ORDER BY row"
+                ).fetchall()
+                conn.execute("DELETE FROM rows")
+                conn.executemany(
+                    "INSERT INTO rows (row, chunk_id, alive, metadata, document) "
+                    "VALUES (?, ?, 1, ?, ?)",
+                    [(i, *row[1:]) for i, row in enumerate(rows)],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('capacity', ?)",
+                    (str(capacity),),
+                )
+                os.replace(compacted_path, self.vectors_path)
+                conn.commit()
+            finally:
+                conn.close()
+
+            self._columns.clear()
+            self._load()
+            logger.info(f"Compacted local index: dropped {dropped} rows, {len(self)} remain")
+            return dropped
+
+    def clear(self) -> None:
+        """Remove all vectors and reset the matrix."""
+        with self._lock:
+            self._matrix = None
+            conn = self._get_connection()
+            try:
+                conn.execute("DELETE FROM rows")
+                conn.execute("DELETE FROM meta")
+                conn.commit()
+            finally:
+                conn.close()
+            self.vectors_path.unlink(missing_ok=True)
+            self._columns.clear()
+            self._load()
+
+    def _column(self, key: str) -> np.ndarray:
+        """
+        Get a metadata column as an object array, read from the side table
+        and cached until the next write. Only filtered keys are held in memory.
+
+        Args:
+            key: Metadata key
+
+        Returns:
+            Array of values (None where missing)
+        """
+        column = self._columns.get(key)
+        if column is None:
+            column = np.empty(len(self._ids), dtype=object)
+            conn = self._get_connection()
+            try:
+                for row, value in conn.execute(
+                    "SELECT row, json_extract(metadata, ?) FROM rows", (f'$."{key}"',)
+                ):
+                    column[row] = value
+            finally:
+                conn.close()
+            self._columns[key] = column
+        return column
+
+    def _fetch(self, chunk_ids: Sequence[str]) -> Dict[str, Tuple[Dict[str, Any], str]]:
+        """
+        Read metadata and text of chunks from the side table.
+
+        Args:
+            chunk_ids: Chunk IDs
+
+        Returns:
+            Mapping of chunk ID to (metadata, text) for chunks still present
+        """
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(
+                f"SELECT chunk_id, metadata, document FROM rows "
+                f"WHERE alive = 1 AND chunk_id IN ({','.join('?' * len(chunk_ids))})",
+                list(chunk_ids),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {chunk_id: (json.loads(metadata), document) for chunk_id, metadata, document in rows}
+
+    def _filter_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """
+        Build a boolean row mask from a Chroma-style metadata filter.
+        Supports equality, $eq, $ne, $in, $nin, $and and $or.
+
+        Args:
+            where: Metadata filter
+
+        Returns:
+            Boolean mask over all rows
+        """
+        mask = np.ones(len(self._ids), dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for sub in condition:
+                    mask &= self._filter_mask(sub)
+            elif key == "$or":
+                any_mask = np.zeros(len(self._ids), dtype=bool)
+                for sub in condition:
+                    any_mask |= self._filter_mask(sub)
+                mask &= any_mask
+            else:
+                column = self._column(key)
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                for op, value in condition.items():
+                    if op == "$eq":
+                        mask &= column == value
+                    elif op == "$ne":
+                        mask &= column != value
+                    elif op == "$in":
+                        mask &= np.isin(column, list(value))
+                    elif op == "$nin":
+                        mask &= ~np.isin(column, list(value))
+                    else:
+                        raise ValueError(f"Unsupported filter operator: {op}")
+        return mask
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        k: int = 4,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[str, Document, float]]:
+        """
+        Exact top-k search by cosine similarity.
+
+        Args:
+            query_embedding: Query embedding
+            k: Number of results
+            where: Optional Chroma-style metadata filter
+
+        Returns:
+            List of (chunk ID, document, distance) with distance = 2 - 2 * cosine,
+            i.e. squared L2 distance between unit vectors like Chroma's default space
+        """
+        with self._lock:
+            # Snapshot under the lock, score outside it. Writers append rows or
+            # replace these objects (compaction, growth), so the snapshot stays
+            # consistent for the first n rows.
+            n = len(self._ids)
+            matrix, codes, ids = self._matrix, self._codes, self._ids
+            if n == 0 or matrix is None:
+                return []
+
+            mask = self._alive.copy()
+            if where:
+                mask &= self._filter_mask(where)
+
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        rows, scores = self._top_k(query, matrix, codes, candidates, n, k)
+
+        # Chunks deleted since the snapshot are missing from the side table
+        stored = self._fetch([ids[row] for row in rows])
+        results = []
+        for row, score in zip(rows, scores):
+            if ids[row] not in stored:
+                continue
+            metadata, text = stored[ids[row]]
+            document = Document(id=ids[row], page_content=text, metadata=metadata)
+            results.append((ids[row], document, max(0.0, float(2.0 - 2.0 * score))))
+        return results
+
+    def _top_k(
+        self,
+        query: np.ndarray,
+        matrix: np.ndarray,
+        codes: Optional[QuantizedCodes],
+        candidates: np.ndarray,
+        n: int,
+        k: int,
+        rerank_candidates: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Select the top-k candidate rows for a query.
+
+        Args:
+            query: Normalized query vector
+            matrix: Full-precision matrix
+            codes: Quantized codes to pre-select with, or None for an exact scan
+            candidates: Candidate row indices
+            n: Number of used rows
+            k: Number of results
+            rerank_candidates: Rescored candidates (default: index setting)
+
+        Returns:
+            Tuple of (rows, exact similarities), best first
+        """
+        if codes is not None:
+            shortlist = max(rerank_candidates or self.rerank_candidates, k)
+            if shortlist < candidates.size:
+                approx = codes.score(query, candidates)
+                candidates = candidates[np.argpartition(-approx, shortlist - 1)[:shortlist]]
+            candidates = np.sort(candidates)  # Sequential reads from the memory map
+            scores = matrix[candidates].astype(np.float32, copy=False) @ query
+        else:
+            scores = self._score(query, matrix, candidates, n)
+
+        k = min(k, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return candidates[top], scores[top]
+
+    def calibrate(
+        self,
+        k: int = 10,
+        recall_target: float = 0.95,
+        sample_size: int = 50,
+        seed: int = 0,
+        shadow_bytes_per_vector: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Pick the smallest rerank candidate count that reaches the recall target
+        and report memory saved versus recall lost. Queries are synthesized as
+        normalized midpoints of random stored vectors.
+
+        The saving compares the codes actually allocated against an in-memory
+        float32 index; memory held elsewhere for the same vectors (e.g. the
+        Chroma collection's HNSW index) counts on both sides.
+
+        Args:
+            k: Result count recall is measured at
+            recall_target: Required mean recall@k versus exact search
+            sample_size: Number of sample queries
+            seed: Random seed for query sampling
+            shadow_bytes_per_vector: Bytes per vector held in memory outside the index
+
+        Returns:
+            Report dictionary (also kept as quantization_report)
+        """
+        if self._codes is None:
+            raise ValueError("Calibration requires a quantized index")
+
+        with self._lock:
+            n = len(self._ids)
+            alive = np.flatnonzero(self._alive)
+            k = min(k, alive.size)
+            rng = np.random.default_rng(seed)
+            pairs = rng.choice(alive, size=(sample_size, 2))
+            queries = self._matrix[pairs.ravel()].astype(np.float32)
+            queries = queries.reshape(sample_size, 2, -1).sum(axis=1)
+            queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+            matrix, codes = self._matrix, self._codes
+            truths = [set(self._top_k(q, matrix, None, alive, n, k)[0].tolist()) for q in queries]
+
+            def recall_at(shortlist: int) -> float:
+                hits = []
+                for q, truth in zip(queries, truths):
+                    rows, _ = self._top_k(q, matrix, codes, alive, n, k, shortlist)
+                    hits.append(len(truth & set(rows.tolist())) / k)
+                return float(np.mean(hits))
+
+            shortlist = k
+            recall_without_rerank = recall = recall_at(shortlist)
+            while recall < recall_target and shortlist < alive.size:
+                shortlist = min(shortlist * 2, alive.size)
+                recall = recall_at(shortlist)
+
+            self.rerank_candidates = shortlist
+            full_bytes = alive.size * self.dim * 4
+            quantized_bytes = self._codes.nbytes
+            shadow_bytes = alive.size * shadow_bytes_per_vector
+            self.quantization_report = {
+                "quantization": self.quantization,
+                "vectors": int(alive.size),
+                "k": k,
+                "full_precision_bytes": full_bytes,
+                "quantized_bytes": quantized_bytes,
+                "shadow_bytes": shadow_bytes,
+                "memory_saved_ratio": round(
+                    1 - (quantized_bytes + shadow_bytes) / (full_bytes + shadow_bytes), 4
+                ),
+                "recall_without_rerank": round(recall_without_rerank, 4),
+                "rerank_candidates": shortlist,
+                "recall": round(recall, 4),
+                "recall_lost": round(1 - recall, 4),
+                "recall_target": recall_target,
+            }
+            logger.info(f"Calibrated {self.quantization} quantization: {self.quantization_report}")
+            return self.quantization_report
+
+    def _score(
+        self, query: np.ndarray, matrix: np.ndarray, candidates: np.ndarray, n: int
+    ) -> np.ndarray:
+        """
+        Compute cosine similarities for candidate rows.
+
+        Args:
+            query: Normalized query vector
+            matrix: Full-precision matrix
+            candidates: Candidate row indices
+            n: Number of used rows
+
+        Returns:
+            Similarity per candidate
+        """
+        if candidates.size == n:
+            # No filtering: scan contiguous blocks of the matrix
+            scores = np.empty(n, dtype=np.float32)
+            for start in range(0, n, self.BLOCK_ROWS):
+                block = matrix[start:start + self.BLOCK_ROWS][: n - start]
+                scores[start:start + len(block)] = block.astype(np.float32, copy=False) @ query
+            return scores
+        return matrix[candidates].astype(np.float32, copy=False) @ query
+
+    def sync_from_collection(self, collection, page_size: int = 1000) -> int:
+        """
+        Mirror all vectors of a Chroma collection into the index.
+
+        Args:
+            collection: ChromaDB collection
+            page_size: Vectors fetched per request
+
+        Returns:
+            Number of mirrored vectors
+        """
+        total = collection.count()
+        for offset in range(0, total, page_size):
+            page = collection.get(
+                include=["embeddings", "metadatas", "documents"],
+                limit=page_size,
+                offset=offset,
+            )
+            self.add(
+                page["ids"],
+                page["embeddings"],
+                [metadata or {} for metadata in page["metadatas"]],
+                [text or "" for text in page["documents"]],
+            )
+        logger.info(f"Mirrored {total} vectors from Chroma into local index")
+        return total
+
+
+class LocalIndexRetriever(BaseRetriever):
+    """
+    Retriever that answers dense queries from the local index.
+    """
+
+    vector_store: Any
+    k: int = 4
+    filter: Optional[Dict[str, Any]] = None
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        """
+        Retrieve documents for a query.
+
+        Args:
+            query: Query text
+            run_manager: Callback manager
+
+        Returns:
+            Top-k documents
+        """
+        return self.vector_store.similarity_search(query, k=self.k, filter=self.filter)
+
+
+# Global local index instance
+_local_index: Optional[LocalVectorIndex] = None
+
+
+def get_local_index() -> LocalVectorIndex:
+    """
+    Get global local vector index instance.
+
+    Returns:
+        LocalVectorIndex instance
+    """
+    global _local_index
+    if _local_index is None:
+        settings = get_settings()
+        _local_index = LocalVectorIndex(
+            settings.local_index_dir,
+            dtype=settings.local_index_dtype,
+            quantization=settings.vector_quantization,
+            rerank_candidates=settings.quantization_rerank_candidates,
+            compact_ratio=settings.local_index_compact_ratio,
+        )
+    return _local_index
@@ -0,0 +1,477 @@
+"""
+Near-duplicate chunk detection module.
+MinHash signatures with LSH banding collapse repeated slide templates,
+disclaimers and agenda text into one stored chunk per document, and
+optionally across the whole collection (at query time).
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.config import get_settings
+from app.services.metrics import connect_sqlite
+from app.services.rag.german_text import tokenize
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def shingles(text: str, size: int = 3) -> List[int]:
+    """
+    Hash the word n-grams of a text to 32-bit integers.
+
+    Args:
+        text: Input text
+        size: Words per shingle
+
+    Returns:
+        List of unique shingle hashes
+    """
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return list({
+        int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "little")
+        for gram in grams
+    })
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick LSH (bands, rows) whose S-curve midpoint is closest to the threshold.
+
+    Args:
+        num_perm: Signature length
+        threshold: Jaccard similarity threshold
+
+    Returns:
+        Tuple of (bands, rows per band)
+    """
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures with universal hashing (a * x + b) mod p.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """
+        Initialize the hasher.
+
+        Args:
+            num_perm: Signature length
+            shingle_size: Words per shingle
+            seed: Seed for the permutation parameters
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            uint32 array of length num_perm
+        """
+        hashes = np.array(shingles(text, self.shingle_size), dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """
+        Estimate the Jaccard similarity of two signatures.
+
+        Args:
+            first: MinHash signature
+            second: MinHash signature
+
+        Returns:
+            Estimated Jaccard similarity
+        """
+        return float(np.mean(first == second))
+
+
+class MinHashLSH:
+    """
+    In-memory LSH index over MinHash signatures.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Jaccard similarity for near-duplicates
+            num_perm: Signature length
+        """
+        self.threshold = threshold
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+        self._signatures: List[np.ndarray] = []
+
+    def band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Split a signature into its band keys."""
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def query(self, signature: np.ndarray) -> Optional[int]:
+        """
+        Find a stored near-duplicate.
+
+        Args:
+            signature: MinHash signature
+
+        Returns:
+            Position of the most similar stored signature above the threshold, or None
+        """
+        candidates = {
+            position
+            for band, key in enumerate(self.band_keys(signature))
+            for position in self._buckets.get((band, key), ())
+        }
+        best, best_similarity = None, self.threshold
+        for position in candidates:
+            similarity = MinHasher.similarity(signature, self._signatures[position])
+            if similarity >= best_similarity:
+                best, best_similarity = position, similarity
+        return best
+
+    def insert(self, signature: np.ndarray) -> int:
+        """
+        Store a signature.
+
+        Args:
+            signature: MinHash signature
+
+        Returns:
+            Position of the stored signature
+        """
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        for band, key in enumerate(self.band_keys(signature)):
+            self._buckets[(band, key)].append(position)
+        return position
+
+
+def page_label(metadata: Dict) -> Optional[int]:
+    """
+    Get the 1-indexed page number of a chunk.
+
+    Args:
+        metadata: Chunk metadata (PyPDF "page" is 0-indexed, Unstructured "page_number" 1-indexed)
+
+    Returns:
+        Page number or None
+    """
+    if isinstance(metadata.get("page"), int):
+        return metadata["page"] + 1
+    if isinstance(metadata.get("page_number"), int):
+        return metadata["page_number"]
+    return None
+
+
+def merge_pages(metadata: Dict, pages: Sequence[int]) -> None:
+    """
+    Add pages to a chunk's comma-separated source_pages list.
+
+    Args:
+        metadata: Chunk metadata (modified in place)
+        pages: 1-indexed page numbers
+    """
+    current = {int(p) for p in str(metadata.get("source_pages", "")).split(",") if p}
+    own = page_label(metadata)
+    if own is not None:
+        current.add(own)
+    current.update(pages)
+    metadata["source_pages"] = ",".join(str(p) for p in sorted(current))
+
+
+def collapse_near_duplicates(
+    chunks: List[Document],
+    threshold: float = 0.85,
+    hasher: Optional[MinHasher] = None,
+) -> List[Document]:
+    """
+    Collapse near-duplicate chunks into their first occurrence.
+    The kept chunk records all pages in "source_pages" (e.g. "1,4,9") and
+    the number of collapsed copies in "duplicate_count".
+
+    Args:
+        chunks: Chunks in document order
+        threshold: Jaccard similarity for near-duplicates
+        hasher: MinHasher instance (default: 128 permutations)
+
+    Returns:
+        Kept chunks in document order
+    """
+    hasher = hasher or MinHasher()
+    lsh = MinHashLSH(threshold=threshold, num_perm=hasher.num_perm)
+    kept: List[Document] = []
+
+    for chunk in chunks:
+        signature = hasher.signature(chunk.page_content)
+        match = lsh.query(signature)
+        if match is None:
+            lsh.insert(signature)
+            kept.append(chunk)
+            continue
+
+        representative = kept[match].metadata
+        page = page_label(chunk.metadata)
+        merge_pages(representative, [page] if page is not None else [])
+        representative["duplicate_count"] = representative.get("duplicate_count", 0) + 1
+
+    if len(kept) < len(chunks):
+        logger.info(f"Collapsed {len(chunks) - len(kept)} near-duplicate chunks ({len(kept)} kept)")
+    return kept
+
+
+def collapse_duplicate_hits(documents: List[Document]) -> List[Document]:
+    """
+    Collapse retrieved chunks that near-duplicate each other across documents.
+    Chunks marked with "duplicate_of" at ingest form a group with the chunk
+    they duplicate; only the best-ranked chunk of a group is kept and lists
+    the other hits' file and page in "duplicate_sources" (e.g. "b.pdf:3,c.pdf:1").
+    Groups survive the deletion of their first chunk, since every copy stays stored.
+
+    Args:
+        documents: Retrieved chunks, best first
+
+    Returns:
+        Kept chunks in rank order
+    """
+    kept: Dict[str, Document] = {}
+    for doc in documents:
+        key = doc.metadata.get("duplicate_of") or doc.id or str(id(doc))
+        first = kept.get(key)
+        if first is None:
+            kept[key] = doc
+            continue
+
+        sources = [s for s in str(first.metadata.get("duplicate_sources", "")).split(",") if s]
+        sources.append(f"{doc.metadata.get('source_file', '')}:{page_label(doc.metadata) or ''}")
+        kept[key] = Document(
+            id=first.id,
+            page_content=first.page_content,
+            metadata={**first.metadata, "duplicate_sources": ",".join(dict.fromkeys(sources))},
+        )
+    return list(kept.values())
+
+
+def deduplicate_chunks(chunks: List[Document]) -> List[Document]:
+    """
+    Collapse near-duplicates within a document according to the settings.
+
+    Args:
+        chunks: Chunks of one document
+
+    Returns:
+        Kept chunks (unchanged list if disabled)
+    """
+    settings = get_settings()
+    if not settings.near_duplicate_enabled:
+        return chunks
+    return collapse_near_duplicates(
+        chunks,
+        threshold=settings.near_duplicate_threshold,
+        hasher=MinHasher(num_perm=settings.near_duplicate_num_perm),
+    )
+
+
+class NearDuplicateIndex:
+    """
+    Persisted LSH index over stored chunks, for collapsing near-duplicates
+    across documents of the collection.
+    """
+
+    def __init__(self, db_path: Path, threshold: float = 0.85, num_perm: int = 128):
+        """
+        Initialize the index.
+
+        Args:
+            db_path: Path to the SQLite database file
+            threshold: Jaccard similarity for near-duplicates
+            num_perm: Signature length
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _init_database(self) -> None:
+        """Initialize database schema."""
+        conn = self._get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                chunk_id TEXT PRIMARY KEY,
+                document_id TEXT NOT NULL,
+                signature BLOB NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                bucket BLOB NOT NULL,
+                chunk_id TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bands ON bands(band, bucket)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_chunk ON bands(chunk_id)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_signatures_document ON signatures(document_id)"
+        )
+        conn.commit()
+        conn.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get database connection.
+
+        Returns:
+            SQLite connection
+        """
+        return connect_sqlite(self.db_path, timeout=30)
+
+    def find(self, signature: np.ndarray, exclude_document: Optional[str] = None) -> Optional[str]:
+        """
+        Find a stored near-duplicate chunk from another document.
+
+        Args:
+            signature: MinHash signature
+            exclude_document: Document whose chunks are ignored
+
+        Returns:
+            Chunk ID of the most similar stored chunk above the threshold, or None
+        """
+        conn = self._get_connection()
+        try:
+            candidates = set()
+            for band, key in enumerate(self.lsh.band_keys(signature)):
+                candidates.update(
+                    row[0] for row in conn.execute(
+                        "SELECT chunk_id FROM bands WHERE band = ? AND bucket = ?", (band, key)
+                    )
+                )
+            best, best_similarity = None, self.lsh.threshold
+            for chunk_id in candidates:
+                row = conn.execute(
+                    "SELECT document_id, signature FROM signatures WHERE chunk_id = ?", (chunk_id,)
+                ).fetchone()
+                if row is None or row[0] == exclude_document:
+                    continue
+                similarity = MinHasher.similarity(signature, np.frombuffer(row[1], dtype=np.uint32))
+                if similarity >= best_similarity:
+                    best, best_similarity = chunk_id, similarity
+            return best
+        finally:
+            conn.close()
+
+    def add(
+        self, chunk_ids: Sequence[str], document_id: str, signatures: Sequence[np.ndarray]
+    ) -> None:
+        """
+        Store signatures of stored chunks.
+
+        Args:
+            chunk_ids: Vector store chunk IDs
+            document_id: Owning document
+            signatures: MinHash signatures in the same order
+        """
+        with self._lock:
+            conn = self._get_connection()
+            try:
+                conn.executemany("DELETE FROM bands WHERE chunk_id = ?", [(c,) for c in chunk_ids])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO signatures (chunk_id, document_id, signature) "
+                    "VALUES (?, ?, ?)",
+                    [(c, document_id, s.tobytes()) for c, s in zip(chunk_ids, signatures)],
+                )
+                conn.executemany(
+                    "INSERT INTO bands (band, bucket, chunk_id) VALUES (?, ?, ?)",
+                    [
+                        (band, key, chunk_id)
+                        for chunk_id, signature in zip(chunk_ids, signatures)
+                        for band, key in enumerate(self.lsh.band_keys(signature))
+                    ],
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def remove_chunks(self, chunk_ids: Sequence[str]) -> None:
+        """
+        Forget deleted chunks.
+
+        Args:
+            chunk_ids: Vector store chunk IDs
+        """
+        with self._lock:
+            conn = self._get_connection()
+            try:
+                conn.executemany(
+                    "DELETE FROM signatures WHERE chunk_id = ?", [(c,) for c in chunk_ids]
+                )
+                conn.executemany("DELETE FROM bands WHERE chunk_id = ?", [(c,) for c in chunk_ids])
+                conn.commit()
+            finally:
+                conn.close()
+
+    def clear(self) -> None:
+        """Remove all signatures."""
+        with self._lock:
+            conn = self._get_connection()
+            try:
+                conn.execute("DELETE FROM signatures")
+                conn.execute("DELETE FROM bands")
+                conn.commit()
+            finally:
+                conn.close()
+
+
+# Global near-duplicate index instance
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """
+    Get global near-duplicate index instance.
+
+    Returns:
+        NearDuplicateIndex instance
+    """
+    global _near_duplicate_index
+    if _near_duplicate_index is None:
+        settings = get_settings()
+        _near_duplicate_index = NearDuplicateIndex(
+            settings.near_duplicate_index_path,
+            threshold=settings.near_duplicate_threshold,
+            num_perm=settings.near_duplicate_num_perm,
+        )
+    return _near_duplicate_index
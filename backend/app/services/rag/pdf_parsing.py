@@ -0,0 +1,337 @@
+"""
+Parallel PDF text extraction.
+Runs the configured text extractor (pypdf, pdfium or PyMuPDF) in a process
+pool, so CPU-bound text extraction neither holds the API process's GIL nor
+blocks its event loop. PDFs longer than one task are split into page
+ranges that are parsed in parallel and reassembled in page order.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import multiprocessing
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from langchain_core.documents import Document
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class PdfTextExtractor(ABC):
+    """
+    Abstract base class for PDF text extraction backends.
+    """
+
+    # Module that must be importable for the backend to be used
+    module: str = ""
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Check whether the backend's library is installed."""
+        return importlib.util.find_spec(cls.module) is not None
+
+    @abstractmethod
+    def extract_pages(self, path: str, start: int, end: int) -> Tuple[int, List[str]]:
+        """
+        Extract the text of a page range.
+
+        Args:
+            path: PDF file path
+            start: First page (0-based)
+            end: Page after the last one; clipped to the page count
+
+        Returns:
+            Tuple of (total page count, texts of the pages in the range)
+        """
+        pass
+
+
+class PypdfExtractor(PdfTextExtractor):
+    """
+    Pure-Python extraction with pypdf; the text matches PyPDFLoader's.
+    """
+
+    module = "pypdf"
+
+    def extract_pages(self, path: str, start: int, end: int) -> Tuple[int, List[str]]:
+        from pypdf import PdfReader
+
+        reader = PdfReader(path)
+        total = len(reader.pages)
+        pages = range(start, min(end, total))
+        return total, [reader.pages[i].extract_text(extraction_mode="plain") for i in pages]
+
+
+class PdfiumExtractor(PdfTextExtractor):
+    """
+    Native extraction with pdfium (pypdfium2), the engine of Chrome's PDF viewer.
+    """
+
+    module = "pypdfium2"
+
+    def extract_pages(self, path: str, start: int, end: int) -> Tuple[int, List[str]]:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(path)
+        try:
+            total = len(pdf)
+            texts = []
+            for i in range(start, min(end, total)):
+                page = pdf[i]
+                text_page = page.get_textpage()
+                texts.append(text_page.get_text_range().replace("\r\n", "\n"))
+                text_page.close()
+                page.close()
+            return total, texts
+        finally:
+            pdf.close()
+
+
+class PymupdfExtractor(PdfTextExtractor):
+    """
+    Native extraction with MuPDF (PyMuPDF).
+    """
+
+    module = "pymupdf"
+
+    def extract_pages(self, path: str, start: int, end: int) -> Tuple[int, List[str]]:
+        import pymupdf
+
+        with pymupdf.open(path) as pdf:
+            total = pdf.page_count
+            return total, [pdf[i].get_text() for i in range(start, min(end, total))]
+
+
+PDF_EXTRACTORS: Dict[str, Type[PdfTextExtractor]] = {
+    "pypdf": PypdfExtractor,
+    "pdfium": PdfiumExtractor,
+    "pymupdf": PymupdfExtractor,
+}
+
+
+def resolve_extractor(name: str) -> str:
+    """
+    Validate an extractor name, falling back to pypdf if its library is missing.
+
+    Args:
+        name: Extractor name (key of PDF_EXTRACTORS)
+
+    Returns:
+        Name of the extractor to use
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name not in PDF_EXTRACTORS:
+        raise ValueError(
+            f"Unknown PDF extractor '{name}' (choose from {', '.join(PDF_EXTRACTORS)})"
+        )
+    if not PDF_EXTRACTORS[name].is_available():
+        logger.warning(
+            f"PDF extractor '{name}' requires {PDF_EXTRACTORS[name].module}, falling back to pypdf"
+        )
+        return "pypdf"
+    return name
+
+
+def extract_pages(extractor: str, path: str, start: int, end: int) -> Tuple[int, List[str]]:
+    """
+    Extract the text of a page range (runs in a worker process).
+
+    Args:
+        extractor: Extractor name (key of PDF_EXTRACTORS)
+        path: PDF file path
+        start: First page (0-based)
+        end: Page after the last one; clipped to the page count
+
+    Returns:
+        Tuple of (total page count, texts of the pages in the range)
+    """
+    return PDF_EXTRACTORS[extractor]().extract_pages(path, start, end)
+
+
+def page_ranges(start: int, page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    """
+    Split pages [start, page_count) into consecutive ranges.
+
+    Args:
+        start: First page
+        page_count: Total number of pages
+        pages_per_task: Maximum pages per range
+
+    Returns:
+        List of (start, end) tuples
+    """
+    return [
+        (first, min(first + pages_per_task, page_count))
+        for first in range(start, page_count, pages_per_task)
+    ]
+
+
+class PdfParser:
+    """
+    Extracts page texts of PDFs in a pool of worker processes.
+    Produces the same documents as PyPDFLoader with every extractor: one
+    per page with "source" and 0-based "page" metadata.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        pages_per_task: Optional[int] = None,
+        extractor: Optional[str] = None,
+    ):
+        """
+        Initialize the parser; the pool is started on first use.
+
+        Args:
+            workers: Worker processes, 0 for a single thread (default: from settings)
+            pages_per_task: Pages parsed per task (default: from settings)
+            extractor: Text extractor name (default: from settings)
+        """
+        settings = get_settings()
+        self.workers = settings.pdf_parse_workers if workers is None else workers
+        self.pages_per_task = pages_per_task or settings.pdf_parse_pages_per_task
+        self.extractor = resolve_extractor(extractor or settings.pdf_extractor)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        """Lazily started worker pool."""
+        with self._lock:
+            if self._executor is None:
+                if self.workers:
+                    # Forking a process that runs Chroma and HTTP client threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                    logger.info(
+                        f"Started PDF parsing pool with {self.workers} processes ({self.extractor})"
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="pdf-parse"
+                    )
+            return self._executor
+
+    def _submit_first(self, path: Path) -> Future:
+        """Parse the first page range; its result also yields the page count."""
+        return self.executor.submit(
+            extract_pages, self.extractor, str(path), 0, self.pages_per_task
+        )
+
+    def _submit_rest(self, path: Path, page_count: int) -> List[Future]:
+        """Parse the remaining page ranges in parallel."""
+        return [
+            self.executor.submit(extract_pages, self.extractor, str(path), start, end)
+            for start, end in page_ranges(self.pages_per_task, page_count, self.pages_per_task)
+        ]
+
+    @staticmethod
+    def _documents(path: Path, texts: List[str]) -> List[Document]:
+        """One document per page, numbered in order."""
+        return [
+            Document(page_content=text, metadata={"source": str(path), "page": page})
+            for page, text in enumerate(texts)
+        ]
+
+    def parse(self, path: Path) -> List[Document]:
+        """
+        Parse a PDF, blocking the calling thread (not the pool).
+
+        Args:
+            path: PDF file path
+
+        Returns:
+            One document per page
+        """
+        return self.parse_many([path])[0]
+
+    def parse_many(self, paths: Sequence[Path]) -> List[Union[List[Document], Exception]]:
+        """
+        Parse several PDFs concurrently.
+
+        Args:
+            paths: PDF file paths
+
+        Returns:
+            Per path, its page documents or the exception raised while parsing;
+            a single path re-raises instead
+        """
+        firsts = [self._submit_first(path) for path in paths]
+        pending = []
+        for path, first in zip(paths, firsts):
+            try:
+                page_count, texts = first.result()
+                pending.append((texts, self._submit_rest(path, page_count)))
+            except Exception as e:
+                if len(paths) == 1:
+                    raise
+                pending.append(e)
+
+        results: List[Union[List[Document], Exception]] = []
+        for path, item in zip(paths, pending):
+            if isinstance(item, Exception):
+                results.append(item)
+                continue
+            texts, rest = item
+            try:
+                for future in rest:
+                    texts.extend(future.result()[1])
+                results.append(self._documents(path, texts))
+            except Exception as e:
+                if len(paths) == 1:
+                    raise
+                results.append(e)
+        return results
+
+    async def aparse(self, path: Path) -> List[Document]:
+        """
+        Parse a PDF without blocking the event loop.
+
+        Args:
+            path: PDF file path
+
+        Returns:
+            One document per page
+        """
+        page_count, texts = await asyncio.wrap_future(self._submit_first(path))
+        ranges = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in self._submit_rest(path, page_count))
+        )
+        for _, range_texts in ranges:
+            texts.extend(range_texts)
+        logger.info(f"Parsed {page_count} pages of {path.name} in {len(ranges) + 1} tasks")
+        return self._documents(path, texts)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Global parser instance
+_pdf_parser: Optional[PdfParser] = None
+
+
+def get_pdf_parser() -> PdfParser:
+    """Get or create the PDF parser instance."""
+    global _pdf_parser
+    if _pdf_parser is None:
+        _pdf_parser = PdfParser()
+    return _pdf_parser
+
+
+def shutdown_pdf_parser() -> None:
+    """Stop the PDF parser's worker pool (on application shutdown)."""
+    if _pdf_parser is not None:
+        _pdf_parser.shutdown()
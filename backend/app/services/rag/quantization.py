@@ -0,0 +1,187 @@
+"""
+Embedding quantization module.
+Compact in-memory codes for first-pass vector search (int8 and binary),
+rescored against full-precision vectors afterwards. The codes shrink the
+local index only; Chroma still holds its own float32 HNSW copy.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Set bits per byte value, for Hamming distances on packed codes
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class QuantizedCodes(ABC):
+    """
+    Growable array of quantized vectors supporting approximate scoring.
+    Scores are comparable within one query only (higher is better).
+    """
+
+    name = "none"
+
+    # Rows scored per block (bounds the float32 temporaries)
+    BLOCK_ROWS = 16384
+
+    def __init__(self, dim: int, capacity: int = 0):
+        """
+        Initialize empty codes.
+
+        Args:
+            dim: Embedding dimension
+            capacity: Initially allocated rows
+        """
+        self.dim = dim
+        self.capacity = 0
+        self.resize(capacity)
+
+    @abstractmethod
+    def resize(self, capacity: int) -> None:
+        """
+        Grow storage to the given number of rows.
+
+        Args:
+            capacity: New number of rows
+        """
+        pass
+
+    @abstractmethod
+    def set(self, rows, vectors: np.ndarray) -> None:
+        """
+        Encode vectors into the given rows.
+
+        Args:
+            rows: Row indices
+            vectors: Normalized float32 vectors
+        """
+        pass
+
+    def score(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Approximate similarity between the query and stored codes.
+
+        Args:
+            query: Normalized float32 query vector
+            rows: Row indices to score
+
+        Returns:
+            Approximate similarity per row
+        """
+        prepared = self._prepare_query(query)
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), self.BLOCK_ROWS):
+            block = rows[start:start + self.BLOCK_ROWS]
+            scores[start:start + len(block)] = self._score_block(prepared, block)
+        return scores
+
+    def _prepare_query(self, query: np.ndarray):
+        """Convert the query into the form compared against codes."""
+        return query
+
+    @abstractmethod
+    def _score_block(self, query, rows: np.ndarray) -> np.ndarray:
+        """Score one block of rows."""
+        pass
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        """Memory held by the codes."""
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def bytes_per_vector(dim: int) -> int:
+        """Memory per stored vector."""
+        pass
+
+
+class Int8Codes(QuantizedCodes):
+    """
+    Symmetric int8 quantization with one float32 scale per vector
+    (about 4x smaller than float32).
+    """
+
+    name = "int8"
+
+    def resize(self, capacity: int) -> None:
+        codes = np.zeros((capacity, self.dim), dtype=np.int8)
+        scales = np.zeros(capacity, dtype=np.float32)
+        if self.capacity:
+            codes[:self.capacity] = self.codes
+            scales[:self.capacity] = self.scales
+        self.codes, self.scales, self.capacity = codes, scales, capacity
+
+    def set(self, rows, vectors: np.ndarray) -> None:
+        max_abs = np.abs(vectors).max(axis=1)
+        scales = np.where(max_abs == 0, 1.0, max_abs / 127.0).astype(np.float32)
+        self.codes[rows] = np.round(vectors / scales[:, None]).astype(np.int8)
+        self.scales[rows] = scales
+
+    def _score_block(self, query, rows: np.ndarray) -> np.ndarray:
+        return (self.codes[rows].astype(np.float32) @ query) * self.scales[rows]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scales.nbytes
+
+    @staticmethod
+    def bytes_per_vector(dim: int) -> int:
+        return dim + 4
+
+
+class BinaryCodes(QuantizedCodes):
+    """
+    Sign-bit quantization scored by Hamming distance (32x smaller than float32).
+    Coarse, so it relies on a larger rerank candidate set.
+    """
+
+    name = "binary"
+
+    def resize(self, capacity: int) -> None:
+        codes = np.zeros((capacity, (self.dim + 7) // 8), dtype=np.uint8)
+        if self.capacity:
+            codes[:self.capacity] = self.codes
+        self.codes, self.capacity = codes, capacity
+
+    def set(self, rows, vectors: np.ndarray) -> None:
+        self.codes[rows] = np.packbits(vectors > 0, axis=1)
+
+    def _prepare_query(self, query: np.ndarray):
+        return np.packbits(query > 0)
+
+    def _score_block(self, query, rows: np.ndarray) -> np.ndarray:
+        distances = _POPCOUNT[self.codes[rows] ^ query].sum(axis=1, dtype=np.int32)
+        return -distances.astype(np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+    @staticmethod
+    def bytes_per_vector(dim: int) -> int:
+        return (dim + 7) // 8
+
+
+QUANTIZERS = {cls.name: cls for cls in (Int8Codes, BinaryCodes)}
+
+
+def create_codes(quantization: str, dim: int, capacity: int = 0) -> QuantizedCodes:
+    """
+    Create quantized codes for a quantization scheme.
+
+    Args:
+        quantization: "int8" or "binary"
+        dim: Embedding dimension
+        capacity: Initially allocated rows
+
+    Returns:
+        QuantizedCodes instance
+    """
+    if quantization not in QUANTIZERS:
+        raise ValueError(f"Unsupported vector quantization: {quantization}")
+    return QUANTIZERS[quantization](dim, capacity)
@@ -0,0 +1,314 @@
+"""
+Query embedding module with an in-process LRU cache and a micro-batcher.
+Removes repeated and concurrent query-embedding round trips from the search path.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from app.services.rag.embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingCache:
+    """
+    Thread-safe LRU cache with TTL for query embeddings.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl_seconds: float = 3600.0):
+        """
+        Initialize the query embedding cache.
+
+        Args:
+            max_size: Maximum number of cached queries
+            ttl_seconds: Time-to-live of a cached embedding
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Get a cached embedding if present and not expired.
+
+        Args:
+            key: Normalized query text
+
+        Returns:
+            Embedding or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: List[float]) -> None:
+        """
+        Store an embedding, evicting the least recently used entry if full.
+
+        Args:
+            key: Normalized query text
+            vector: Query embedding
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, hits, misses and hit rate
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class QueryEmbeddingBatcher:
+    """
+    Merges query-embedding requests arriving within a short window
+    into a single batched embeddings call.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        window_ms: float = 5.0,
+        max_batch_size: int = 64,
+    ):
+        """
+        Initialize the micro-batcher.
+
+        Args:
+            embed_fn: Batched embedding function (e.g. embed_documents)
+            window_ms: How long to wait for more requests before flushing
+            max_batch_size: Flush immediately once this many requests are pending
+        """
+        self.embed_fn = embed_fn
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.batches_sent = 0
+        self.requests_batched = 0
+        self._pending: List[Tuple[str, Future]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a query for embedding.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Future resolving to the query embedding
+        """
+        future: Future = Future()
+        flush_now = False
+
+        with self._lock:
+            self._pending.append((text, future))
+            if len(self._pending) >= self.max_batch_size:
+                flush_now = True
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window_seconds, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            self._flush()
+        return future
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Embed a query, blocking until its batch has been sent.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        return self.submit(text).result()
+
+    async def aembed(self, text: str) -> List[float]:
+        """
+        Embed a query without blocking the event loop.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _flush(self) -> None:
+        """Send all pending queries as one batched request."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not batch:
+            return
+
+        # Identical concurrent queries are embedded once
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+
+        try:
+            vectors = self.embed_fn(unique_texts)
+        except Exception as e:
+            logger.error(f"Error embedding query batch: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            future.set_result(by_text[text])
+
+        self.batches_sent += 1
+        self.requests_batched += len(batch)
+        logger.debug(f"Embedded {len(batch)} queries in one batch ({len(unique_texts)} unique)")
+
+
+class QueryCachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves queries from an LRU cache and
+    micro-batches cache misses. Document embedding is passed through.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: QueryEmbeddingCache,
+        batcher: Optional[QueryEmbeddingBatcher] = None,
+        query_embeddings: Optional[Embeddings] = None,
+    ):
+        """
+        Initialize the query embedding wrapper.
+
+        Args:
+            embeddings: Underlying embeddings implementation
+            cache: Query embedding cache
+            batcher: Optional micro-batcher for cache misses
+            query_embeddings: Uncached embeddings for queries, so they stay out
+                of the persistent chunk cache (default: embeddings)
+        """
+        self.embeddings = embeddings
+        self.query_embeddings = query_embeddings or embeddings
+        self.cache = cache
+        self.batcher = batcher
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents via the underlying embeddings."""
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed documents via the underlying embeddings."""
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a query, using the cache and batcher where possible.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        key = normalize_text(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            if self.batcher is not None:
+                vector = self.batcher.embed(text)
+            else:
+                vector = self.query_embeddings.embed_query(text)
+            self.cache.put(key, vector)
+        return vector
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many queries, sending all cache misses in one batched call.
+
+        Args:
+            texts: Query texts
+
+        Returns:
+            Query embeddings in input order
+        """
+        keys = [normalize_text(text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            vector = self.cache.get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                vectors[key] = vector
+
+        if missing:
+            batch = self.query_embeddings.embed_documents(list(missing.values()))
+            for key, vector in zip(missing, batch):
+                self.cache.put(key, vector)
+                vectors[key] = vector
+            logger.debug(f"Embedded {len(missing)} of {len(texts)} queries in one batch")
+
+        return [vectors[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Asynchronously embed a query, using the cache and batcher where possible.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        key = normalize_text(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            if self.batcher is not None:
+                vector = await self.batcher.aembed(text)
+            else:
+                vector = await self.query_embeddings.aembed_query(text)
+            self.cache.put(key, vector)
+        return vector
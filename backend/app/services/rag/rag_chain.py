@@ -3,26 +3,42 @@ RAG Chain module for question answering with source citations.
 Implements conversation memory and multi-document reasoning.
 """
 
+import asyncio
 import logging
+import re
+import threading
+import time
 import warnings
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any, Tuple, TypeVar
 
 from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
+from langchain.chains.conversational_retrieval.base import _get_chat_history
 from langchain.prompts import PromptTemplate
 from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage
 from langchain_openai import ChatOpenAI
 
 from app.config import get_settings
+from app.services.document_catalog import get_document_catalog
+from app.services.llm_clients import create_chat_model
+from app.services.llm_scheduler import llm_priority, PRIORITY_BACKGROUND
+from app.services.rag.conversation_store import ConversationStore, get_conversation_store
+from app.services.rag.history_compactor import HistoryCompactor
+from app.services.rag.near_duplicates import collapse_duplicate_hits
 from app.services.rag.vector_store import VectorStore
 
 # Suppress LangChain deprecation warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="langchain")
-# Specifically suppress ConversationBufferMemory deprecation warning
-warnings.filterwarnings("ignore", message=".*migrating_memory.*")
 
 logger = logging.getLogger(__name__)
 
+# Conversation used when a request carries no conversation ID
+DEFAULT_CONVERSATION_ID = "default"
+
+T = TypeVar("T")
+
 
 # Custom prompt template for German study assistant
 PROMPT_TEMPLATE = """Du bist ein hilfreicher Studienassistent für deutsche Studierende.
@@ -59,23 +75,62 @@ Folgefrage: {question}
 Eigenständige Frage:"""
 
 
+def question_overlap(first: str, second: str) -> float:
+    """
+    Word-level Jaccard similarity of two questions.
+
+    Args:
+        first: First question
+        second: Second question
+
+    Returns:
+        Similarity between 0.0 and 1.0
+    """
+    first_words = set(re.findall(r"\w+", first.lower()))
+    second_words = set(re.findall(r"\w+", second.lower()))
+    if not first_words and not second_words:
+        return 1.0
+    return len(first_words & second_words) / len(first_words | second_words)
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() start value."""
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
 class RAGChain:
     """
-    Manages the RAG pipeline with conversation memory and citations.
+    Manages the RAG pipeline with per-conversation memory and citations.
     """
 
-    def __init__(self, vector_store: VectorStore):
+    def __init__(
+        self, vector_store: VectorStore, conversation_store: Optional[ConversationStore] = None
+    ):
         """
         Initialize the RAG chain.
 
         Args:
             vector_store: VectorStore instance for document retrieval
+            conversation_store: Optional store of chat histories (default: global store)
         """
         self.settings = get_settings()
         self.vector_store = vector_store
+        self.conversations = conversation_store or get_conversation_store()
         self._llm = None
-        self._memory = None
         self._chain = None
+        self._compactor = None
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rag-speculative")
+
+        # Blocking work of the async path (Chroma, query embeddings, SQLite)
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self.settings.rag_thread_pool_size, thread_name_prefix="rag-io"
+        )
+        self.speculation_stats = {"hits": 0, "misses": 0}
+
+        # Summaries run after the answer is returned, one at a time
+        self._summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-summary")
+        self._compacting: set = set()
+        self._compacting_lock = threading.Lock()
 
     @property
     def llm(self) -> ChatOpenAI:
@@ -86,31 +141,29 @@ class RAGChain:
             ChatOpenAI instance
         """
         if self._llm is None:
-            self._llm = ChatOpenAI(
-                model=self.settings.llm_model,
+            self._llm = create_chat_model(
                 temperature=self.settings.temperature,
                 max_tokens=self.settings.max_tokens,
-                openai_api_key=self.settings.openai_api_key,
             )
             logger.info(f"Initialized LLM: {self.settings.llm_model}")
         return self._llm
 
     @property
-    def memory(self) -> ConversationBufferMemory:
+    def compactor(self) -> HistoryCompactor:
         """
-        Lazy initialization of conversation memory.
+        Lazy initialization of the history compactor.
 
         Returns:
-            ConversationBufferMemory instance
+            HistoryCompactor instance
         """
-        if self._memory is None:
-            self._memory = ConversationBufferMemory(
-                memory_key="chat_history",
-                return_messages=True,
-                output_key="answer",
+        if self._compactor is None:
+            self._compactor = HistoryCompactor(
+                self.llm,
+                keep_turns=self.settings.chat_history_keep_turns,
+                token_budget=self.settings.chat_history_token_budget,
+                model=self.settings.llm_model,
             )
-            logger.info("Initialized conversation memory")
-        return self._memory
+        return self._compactor
 
     def _create_chain(self) -> ConversationalRetrievalChain:
         """
@@ -130,16 +183,18 @@ class RAGChain:
             input_variables=["chat_history", "question"],
         )
 
-        # Get retriever from vector store
-        retriever = self.vector_store.get_retriever(
-            search_kwargs={"k": self.settings.retrieval_k}
-        )
+        # Get retriever from vector store (hybrid BM25 + dense if enabled)
+        if self.settings.hybrid_search_enabled:
+            retriever = self.vector_store.get_hybrid_retriever(k=self.settings.retrieval_k)
+        else:
+            retriever = self.vector_store.get_retriever(
+                search_kwargs={"k": self.settings.retrieval_k}
+            )
 
-        # Create conversational retrieval chain
+        # Create conversational retrieval chain (chat history is passed per call)
         chain = ConversationalRetrievalChain.from_llm(
             llm=self.llm,
             retriever=retriever,
-            memory=self.memory,
             return_source_documents=True,
             combine_docs_chain_kwargs={"prompt": qa_prompt},
             condense_question_prompt=condense_prompt,
@@ -161,42 +216,415 @@ class RAGChain:
             self._chain = self._create_chain()
         return self._chain
 
-    def ask(self, question: str) -> Dict[str, Any]:
+    async def _run_blocking(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking call on the dedicated thread pool.
+
+        Args:
+            func: Blocking function
+            *args: Positional arguments
+
+        Returns:
+            Result of the call
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, partial(func, *args))
+
+    def _history_text(self, conversation_id: str) -> str:
+        """
+        Get the chat history of a conversation as prompt text.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Rolling summary plus recent turns within the token budget,
+            or the full history if compaction is disabled
+        """
+        summary, messages = self.conversations.get_history(conversation_id)
+        if not self.settings.chat_history_compaction_enabled:
+            return _get_chat_history(messages)
+        return self.compactor.format_history(summary, messages)
+
+    def _save_turn(self, conversation_id: str, question: str, answer: str) -> None:
+        """Append a question and its answer to the conversation history and schedule compaction."""
+        self.conversations.append(
+            conversation_id, [HumanMessage(content=question), AIMessage(content=answer)]
+        )
+
+        if self.settings.chat_history_compaction_enabled:
+            with self._compacting_lock:
+                if conversation_id in self._compacting:
+                    return
+                self._compacting.add(conversation_id)
+            self._summary_executor.submit(self._compact_history, conversation_id)
+
+    def _compact_history(self, conversation_id: str) -> None:
+        """
+        Fold turns that no longer fit verbatim into the rolling summary.
+
+        Args:
+            conversation_id: Conversation ID
+        """
+        try:
+            summary, messages = self.conversations.get_history(conversation_id)
+            count = self.compactor.messages_to_fold(summary, messages)
+            if count:
+                start = time.perf_counter()
+                with llm_priority(PRIORITY_BACKGROUND):
+                    new_summary = self.compactor.summarize(summary, messages[:count])
+                self.conversations.fold(conversation_id, new_summary, count)
+                logger.info(
+                    f"Folded {count} messages of conversation {conversation_id} into summary "
+                    f"in {_elapsed_ms(start)} ms"
+                )
+        except Exception as e:
+            logger.error(f"Error compacting conversation {conversation_id}: {str(e)}")
+        finally:
+            with self._compacting_lock:
+                self._compacting.discard(conversation_id)
+
+    def _reuse_speculative_docs(self, question: str, standalone_question: str) -> bool:
+        """
+        Decide whether documents retrieved for the raw question can be kept.
+
+        Args:
+            question: Question as asked
+            standalone_question: Condensed question
+
+        Returns:
+            True if the condensed question is close enough to the raw one
+        """
+        threshold = self.settings.speculative_retrieval_threshold
+        reuse = question_overlap(question, standalone_question) >= threshold
+        self.speculation_stats["hits" if reuse else "misses"] += 1
+        return reuse
+
+    def _condense_and_retrieve(
+        self, question: str, chat_history: str
+    ) -> Tuple[str, List[Document], Dict[str, float]]:
+        """
+        Condense a follow-up question and retrieve its documents.
+
+        Without history the question is used as is. With speculative
+        retrieval enabled, retrieval for the raw question runs concurrently
+        with the condense LLM call and is only repeated if the condensed
+        question differs too much.
+
+        Args:
+            question: User question
+            chat_history: Formatted chat history
+
+        Returns:
+            Tuple of (standalone question, documents, stage timings in ms)
+        """
+        chain = self.chain
+        timings: Dict[str, float] = {}
+
+        def condense() -> str:
+            start = time.perf_counter()
+            result = chain.question_generator.invoke(
+                {"question": question, "chat_history": chat_history}
+            )
+            timings["condense_ms"] = _elapsed_ms(start)
+            return result[chain.question_generator.output_key]
+
+        def retrieve(query: str, stage: str) -> List[Document]:
+            start = time.perf_counter()
+            documents = self._collapse_duplicates(chain.retriever.invoke(query))
+            timings[stage] = _elapsed_ms(start)
+            return documents
+
+        if not chat_history:
+            return question, retrieve(question, "retrieve_ms"), timings
+
+        if not self.settings.speculative_retrieval_enabled:
+            standalone_question = condense()
+            return standalone_question, retrieve(standalone_question, "retrieve_ms"), timings
+
+        speculative = self._executor.submit(retrieve, question, "retrieve_ms")
+        standalone_question = condense()
+        documents = speculative.result()
+        if not self._reuse_speculative_docs(question, standalone_question):
+            documents = retrieve(standalone_question, "re_retrieve_ms")
+        return standalone_question, documents, timings
+
+    async def _acondense_and_retrieve(
+        self, question: str, chat_history: str
+    ) -> Tuple[str, List[Document], Dict[str, float]]:
+        """
+        Async variant of _condense_and_retrieve().
+
+        LLM calls are awaited natively; retrieval runs on the dedicated
+        thread pool so the event loop stays free.
+
+        Args:
+            question: User question
+            chat_history: Formatted chat history
+
+        Returns:
+            Tuple of (standalone question, documents, stage timings in ms)
+        """
+        chain = self.chain
+        timings: Dict[str, float] = {}
+
+        async def condense() -> str:
+            start = time.perf_counter()
+            result = await chain.question_generator.ainvoke(
+                {"question": question, "chat_history": chat_history}
+            )
+            timings["condense_ms"] = _elapsed_ms(start)
+            return result[chain.question_generator.output_key]
+
+        async def retrieve(query: str, stage: str) -> List[Document]:
+            start = time.perf_counter()
+            documents = await self._run_blocking(chain.retriever.invoke, query)
+            documents = self._collapse_duplicates(documents)
+            timings[stage] = _elapsed_ms(start)
+            return documents
+
+        if not chat_history:
+            return question, await retrieve(question, "retrieve_ms"), timings
+
+        if not self.settings.speculative_retrieval_enabled:
+            standalone_question = await condense()
+            return standalone_question, await retrieve(standalone_question, "retrieve_ms"), timings
+
+        standalone_question, documents = await asyncio.gather(
+            condense(), retrieve(question, "retrieve_ms")
+        )
+        if not self._reuse_speculative_docs(question, standalone_question):
+            documents = await retrieve(standalone_question, "re_retrieve_ms")
+        return standalone_question, documents, timings
+
+    def ask(self, question: str, conversation_id: str = DEFAULT_CONVERSATION_ID) -> Dict[str, Any]:
         """
         Ask a question and get an answer with sources.
 
         Args:
             question: User question
+            conversation_id: Conversation whose history is used and extended
 
         Returns:
-            Dictionary with answer, sources, and metadata
+            Dictionary with answer, sources, stage timings and metadata
         """
         try:
             logger.info(f"Processing question: {question}")
+            start = time.perf_counter()
 
-            # Invoke the chain
-            result = self.chain.invoke({"question": question})
+            chat_history = self._history_text(conversation_id)
+            standalone_question, source_docs, timings = self._condense_and_retrieve(
+                question, chat_history
+            )
 
-            # Extract source documents
-            source_docs = result.get("source_documents", [])
+            answer_start = time.perf_counter()
+            result = self.chain.combine_docs_chain.invoke({
+                "input_documents": source_docs,
+                "question": standalone_question,
+                "chat_history": chat_history,
+            })
+            answer = result[self.chain.combine_docs_chain.output_key]
+            timings["answer_ms"] = _elapsed_ms(answer_start)
+            timings["total_ms"] = _elapsed_ms(start)
+
+            self._save_turn(conversation_id, question, answer)
 
             # Format sources with page numbers
             sources = self._format_sources(source_docs)
 
             response = {
-                "answer": result["answer"],
+                "answer": answer,
                 "sources": sources,
                 "source_documents": source_docs,
                 "question": question,
+                "timings": timings,
             }
 
-            logger.info(f"Generated answer with {len(sources)} sources")
+            logger.info(f"Generated answer with {len(sources)} sources, timings: {timings}")
             return response
 
         except Exception as e:
             logger.error(f"Error processing question: {str(e)}")
             raise
 
+    async def aask(
+        self, question: str, conversation_id: str = DEFAULT_CONVERSATION_ID
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ask() that never blocks the event loop.
+
+        Args:
+            question: User question
+            conversation_id: Conversation whose history is used and extended
+
+        Returns:
+            Dictionary with answer, sources, stage timings and metadata
+        """
+        try:
+            logger.info(f"Processing question: {question}")
+            start = time.perf_counter()
+
+            chat_history = await self._run_blocking(self._history_text, conversation_id)
+            standalone_question, source_docs, timings = await self._acondense_and_retrieve(
+                question, chat_history
+            )
+
+            answer_start = time.perf_counter()
+            result = await self.chain.combine_docs_chain.ainvoke({
+                "input_documents": source_docs,
+                "question": standalone_question,
+                "chat_history": chat_history,
+            })
+            answer = result[self.chain.combine_docs_chain.output_key]
+            timings["answer_ms"] = _elapsed_ms(answer_start)
+            timings["total_ms"] = _elapsed_ms(start)
+
+            await self._run_blocking(self._save_turn, conversation_id, question, answer)
+
+            sources = self._format_sources(source_docs)
+
+            logger.info(f"Generated answer with {len(sources)} sources, timings: {timings}")
+            return {
+                "answer": answer,
+                "sources": sources,
+                "source_documents": source_docs,
+                "question": question,
+                "timings": timings,
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing question: {str(e)}")
+            raise
+
+    async def abatch(
+        self, questions: List[str], concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer independent questions, yielding results in completion order.
+
+        All questions are embedded in one batched call and searched
+        together; the answer LLM calls then run with bounded concurrency
+        at background priority. Batch questions use no conversation history.
+
+        Args:
+            questions: Questions to answer
+            concurrency: Maximum concurrent LLM calls (default: from settings)
+
+        Yields:
+            {"index", "question", "answer", "sources", "timings"} per question,
+            or {"index", "question", "error"} if answering it failed
+        """
+        start = time.perf_counter()
+        documents = await self._run_blocking(self.vector_store.retrieve_many, questions)
+        documents = [self._collapse_duplicates(docs) for docs in documents]
+        retrieve_ms = _elapsed_ms(start)
+        logger.info(f"Retrieved documents for {len(questions)} batch questions in {retrieve_ms} ms")
+
+        qa_chain = self.chain.combine_docs_chain
+        semaphore = asyncio.Semaphore(concurrency or self.settings.batch_query_concurrency)
+
+        async def answer(index: int) -> Dict[str, Any]:
+            question = questions[index]
+            async with semaphore:
+                answer_start = time.perf_counter()
+                try:
+                    result = await qa_chain.ainvoke({
+                        "input_documents": documents[index],
+                        "question": question,
+                        "chat_history": "",
+                    })
+                except Exception as e:
+                    logger.error(f"Error answering batch question {index}: {str(e)}")
+                    return {"index": index, "question": question, "error": str(e)}
+
+            return {
+                "index": index,
+                "question": question,
+                "answer": result[qa_chain.output_key],
+                "sources": self._format_sources(documents[index]),
+                "timings": {
+                    "retrieve_ms": retrieve_ms,
+                    "answer_ms": _elapsed_ms(answer_start),
+                    "total_ms": _elapsed_ms(start),
+                },
+            }
+
+        # Batch answers yield to interactive queries at the LLM scheduler
+        with llm_priority(PRIORITY_BACKGROUND):
+            tasks = [asyncio.create_task(answer(i)) for i in range(len(questions))]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Stop pending answers if the consumer goes away (e.g. client disconnect)
+            for task in tasks:
+                task.cancel()
+
+        logger.info(f"Answered {len(questions)} batch questions in {_elapsed_ms(start)} ms")
+
+    async def astream(
+        self, question: str, conversation_id: str = DEFAULT_CONVERSATION_ID
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer a question, streaming sources first and then answer tokens.
+
+        Runs the same steps as ask() but streams the final LLM call, so the
+        first tokens reach the client while the rest of the answer is still
+        being generated.
+
+        Args:
+            question: User question
+            conversation_id: Conversation whose history is used and extended
+
+        Yields:
+            Events {"type": "sources", "sources": [...]}, then
+            {"type": "token", "content": str} per token and finally
+            {"type": "done", "answer": str, "timings": {...}}
+        """
+        start = time.perf_counter()
+        chat_history = await self._run_blocking(self._history_text, conversation_id)
+        standalone_question, source_docs, timings = await self._acondense_and_retrieve(
+            question, chat_history
+        )
+        yield {"type": "sources", "sources": self._format_sources(source_docs)}
+
+        answer_start = time.perf_counter()
+        qa_chain = self.chain.combine_docs_chain
+        prompt = qa_chain.llm_chain.prompt.format(
+            context=qa_chain.document_separator.join(doc.page_content for doc in source_docs),
+            chat_history=chat_history,
+            question=standalone_question,
+        )
+
+        parts = []
+        async for chunk in self.llm.astream(prompt):
+            if chunk.content:
+                if not parts:
+                    timings["first_token_ms"] = _elapsed_ms(start)
+                parts.append(chunk.content)
+                yield {"type": "token", "content": chunk.content}
+
+        answer = "".join(parts)
+        timings["answer_ms"] = _elapsed_ms(answer_start)
+        timings["total_ms"] = _elapsed_ms(start)
+        await self._run_blocking(self._save_turn, conversation_id, question, answer)
+        logger.info(f"Streamed answer with {len(source_docs)} source documents, timings: {timings}")
+        yield {"type": "done", "answer": answer, "timings": timings}
+
+    def _collapse_duplicates(self, documents: List[Document]) -> List[Document]:
+        """
+        Collapse retrieved near-duplicates of other documents' chunks.
+
+        Args:
+            documents: Retrieved documents, best first
+
+        Returns:
+            Documents with one chunk per near-duplicate group
+        """
+        if self.settings.near_duplicate_scope != "collection":
+            return documents
+        return collapse_duplicate_hits(documents)
+
     def _format_sources(self, documents: List[Document]) -> List[Dict[str, Any]]:
         """
         Format source documents with page numbers and metadata.
@@ -218,32 +646,46 @@ class RAGChain:
             source_id = f"{source_file}:{page}"
 
             if source_id not in seen_sources:
-                sources.append(
-                    {
-                        "file": source_file,
-                        "page": page + 1 if isinstance(page, int) else page,  # 0-indexed to 1-indexed
-                        "content_preview": doc.page_content[:200] + "..."
-                        if len(doc.page_content) > 200
-                        else doc.page_content,
-                    }
-                )
+                source = {
+                    "file": source_file,
+                    "page": page + 1 if isinstance(page, int) else page,  # 0-indexed to 1-indexed
+                    "content_preview": doc.page_content[:200] + "..."
+                    if len(doc.page_content) > 200
+                    else doc.page_content,
+                }
+                # Collapsed near-duplicates: all pages carrying this text
+                if doc.metadata.get("source_pages"):
+                    source["pages"] = [
+                        int(p) for p in str(doc.metadata["source_pages"]).split(",") if p
+                    ]
+                sources.append(source)
                 seen_sources.add(source_id)
 
         return sources
 
-    def clear_memory(self) -> None:
-        """Clear the conversation memory."""
-        self.memory.clear()
-        logger.info("Cleared conversation memory")
+    def clear_memory(self, conversation_id: str = DEFAULT_CONVERSATION_ID) -> None:
+        """
+        Clear the memory of a conversation.
 
-    def get_chat_history(self) -> List[Dict[str, str]]:
+        Args:
+            conversation_id: Conversation ID
+        """
+        self.conversations.clear(conversation_id)
+        logger.info(f"Cleared conversation memory: {conversation_id}")
+
+    def get_chat_history(
+        self, conversation_id: str = DEFAULT_CONVERSATION_ID
+    ) -> List[Dict[str, str]]:
         """
-        Get the current chat history.
+        Get the chat history of a conversation (turns not yet folded into its summary).
+
+        Args:
+            conversation_id: Conversation ID
 
         Returns:
             List of chat messages
         """
-        messages = self.memory.chat_memory.messages
+        messages = self.conversations.get_messages(conversation_id)
         history = []
 
         for msg in messages:
@@ -257,10 +699,9 @@ class RAGChain:
         return history
 
     def reset(self) -> None:
-        """Reset the chain and memory."""
+        """Reset the chain (conversation histories are kept)."""
         self._chain = None
-        self._memory = None
-        logger.info("Reset RAG chain and memory")
+        logger.info("Reset RAG chain")
 
 
 class RAGAssistant:
@@ -288,34 +729,87 @@ class RAGAssistant:
         ids = self.vector_store.add_documents(documents)
         return len(ids)
 
-    def ask(self, question: str) -> Dict[str, Any]:
+    def ask(self, question: str, conversation_id: str = DEFAULT_CONVERSATION_ID) -> Dict[str, Any]:
         """
         Ask a question.
 
         Args:
             question: User question
+            conversation_id: Conversation ID
 
         Returns:
             Dictionary with answer and sources
         """
-        return self.rag_chain.ask(question)
+        return self.rag_chain.ask(question, conversation_id)
+
+    def abatch(self, questions: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer a batch of independent questions.
+
+        Args:
+            questions: Questions to answer
+
+        Returns:
+            Async iterator of per-question results in completion order
+        """
+        return self.rag_chain.abatch(questions)
+
+    async def aask(
+        self, question: str, conversation_id: str = DEFAULT_CONVERSATION_ID
+    ) -> Dict[str, Any]:
+        """
+        Ask a question without blocking the event loop.
 
-    def clear_conversation(self) -> None:
-        """Clear the conversation history."""
-        self.rag_chain.clear_memory()
+        Args:
+            question: User question
+            conversation_id: Conversation ID
 
-    def get_stats(self) -> Dict[str, Any]:
+        Returns:
+            Dictionary with answer and sources
+        """
+        return await self.rag_chain.aask(question, conversation_id)
+
+    def astream(
+        self, question: str, conversation_id: str = DEFAULT_CONVERSATION_ID
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Ask a question and stream the answer.
+
+        Args:
+            question: User question
+            conversation_id: Conversation ID
+
+        Returns:
+            Async iterator of sources, token and done events
+        """
+        return self.rag_chain.astream(question, conversation_id)
+
+    def clear_conversation(self, conversation_id: str = DEFAULT_CONVERSATION_ID) -> None:
+        """
+        Clear the history of a conversation.
+
+        Args:
+            conversation_id: Conversation ID
+        """
+        self.rag_chain.clear_memory(conversation_id)
+
+    def get_stats(self, conversation_id: str = DEFAULT_CONVERSATION_ID) -> Dict[str, Any]:
         """
         Get system statistics.
 
+        Args:
+            conversation_id: Conversation whose length is reported
+
         Returns:
             Dictionary with system stats
         """
         collection_stats = self.vector_store.get_collection_stats()
-        chat_history = self.rag_chain.get_chat_history()
+        chat_history = self.rag_chain.get_chat_history(conversation_id)
 
         return {
             "collection": collection_stats,
+            "conversations": self.rag_chain.conversations.get_stats(),
+            "speculative_retrieval": dict(self.rag_chain.speculation_stats),
             "conversation_length": len(chat_history),
             "model": self.rag_chain.settings.llm_model,
         }
@@ -331,12 +825,28 @@ class RAGAssistant:
 
     def get_all_documents(self) -> Dict[str, Dict[str, Any]]:
         """
-        Get all documents from the vector store.
+        Get all documents from the document catalog.
 
         Returns:
             Dictionary with document names and metadata
         """
-        return self.vector_store.get_all_documents()
+        return {
+            doc["filename"]: {
+                "document_id": doc["id"],
+                "chunk_count": doc["chunk_count"],
+                "page_count": doc["page_count"],
+            }
+            for doc in get_document_catalog().list_documents(limit=None)
+        }
+
+    def get_document_count(self) -> int:
+        """
+        Get the number of documents in the knowledge base.
+
+        Returns:
+            Number of documents
+        """
+        return get_document_catalog().count_documents()
 
 
 def create_rag_assistant() -> RAGAssistant:
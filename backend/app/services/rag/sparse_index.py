@@ -0,0 +1,374 @@
+"""
+Sparse BM25 index module.
+Persisted inverted index with compact varint-encoded postings in SQLite.
+"""
+
+import heapq
+import logging
+import math
+import sqlite3
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config import get_settings
+from app.services.metrics import connect_sqlite
+from app.services.rag.german_text import analyze
+
+logger = logging.getLogger(__name__)
+
+
+def encode_postings(postings: Iterable[Tuple[int, int]], last_doc: int = 0) -> bytes:
+    """
+    Encode (doc_id, term_frequency) pairs as delta-coded varints.
+
+    Args:
+        postings: Pairs with strictly increasing doc IDs
+        last_doc: Doc ID the first delta is relative to
+
+    Returns:
+        Encoded bytes
+    """
+    out = bytearray()
+    for doc_id, tf in postings:
+        for value in (doc_id - last_doc, tf):
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        last_doc = doc_id
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> List[Tuple[int, int]]:
+    """
+    Decode delta-coded varint postings.
+
+    Args:
+        data: Encoded bytes
+
+    Returns:
+        List of (doc_id, term_frequency) pairs
+    """
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+
+    postings = []
+    doc_id = 0
+    for i in range(0, len(values), 2):
+        doc_id += values[i]
+        postings.append((doc_id, values[i + 1]))
+    return postings
+
+
+class SparseIndex:
+    """
+    Incremental BM25 inverted index keyed by vector store chunk IDs.
+    Deleted chunks are tombstoned and purged from postings on compaction.
+    """
+
+    # Compact once this share of indexed documents has been deleted
+    COMPACT_RATIO = 0.2
+
+    def __init__(
+        self,
+        db_path: Path,
+        k1: float = 1.2,
+        b: float = 0.75,
+        postings_cache_size: int = 4096,
+    ):
+        """
+        Initialize the sparse index.
+
+        Args:
+            db_path: Path to the SQLite database file
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+            postings_cache_size: Number of decoded postings lists kept in memory
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self.postings_cache_size = postings_cache_size
+        self._lock = threading.RLock()
+        self._postings_cache: "OrderedDict[str, Tuple[int, List[Tuple[int, int]]]]" = OrderedDict()
+        self._init_database()
+        self._load_documents()
+        logger.info(f"Initialized sparse index at {self.db_path} ({len(self._chunk_ids)} chunks)")
+
+    def _init_database(self) -> None:
+        """Initialize database schema."""
+        conn = self._get_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chunk_id TEXT NOT NULL UNIQUE,
+                length INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL,
+                last_doc INTEGER NOT NULL,
+                postings BLOB NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get database connection.
+
+        Returns:
+            SQLite connection
+        """
+        return connect_sqlite(self.db_path, timeout=30)
+
+    def _load_documents(self) -> None:
+        """Load live document IDs and lengths into memory."""
+        conn = self._get_connection()
+        rows = conn.execute("SELECT doc_id, chunk_id, length FROM docs").fetchall()
+        deleted = conn.execute("SELECT value FROM meta WHERE key = 'deleted'").fetchone()
+        conn.close()
+
+        self._chunk_ids: Dict[int, str] = {doc_id: chunk_id for doc_id, chunk_id, _ in rows}
+        self._doc_ids: Dict[str, int] = {chunk_id: doc_id for doc_id, chunk_id, _ in rows}
+        self._lengths: Dict[int, int] = {doc_id: length for doc_id, _, length in rows}
+        self._total_length = sum(self._lengths.values())
+        self._deleted = deleted[0] if deleted else 0
+
+    def __len__(self) -> int:
+        return len(self._chunk_ids)
+
+    def add(self, chunk_ids: Sequence[str], texts: Sequence[str]) -> None:
+        """
+        Index chunks. Chunks whose ID is already indexed are replaced.
+
+        Args:
+            chunk_ids: Vector store chunk IDs
+            texts: Chunk texts in the same order
+        """
+        if not chunk_ids:
+            return
+
+        with self._lock:
+            existing = [chunk_id for chunk_id in chunk_ids if chunk_id in self._doc_ids]
+            if existing:
+                self.delete(existing)
+
+            conn = self._get_connection()
+            try:
+                new_postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+                added = []
+
+                for chunk_id, text in zip(chunk_ids, texts):
+                    terms = analyze(text)
+                    cursor = conn.execute(
+                        "INSERT INTO docs (chunk_id, length) VALUES (?, ?)",
+                        (chunk_id, len(terms)),
+                    )
+                    doc_id = cursor.lastrowid
+                    added.append((doc_id, chunk_id, len(terms)))
+                    for term, tf in Counter(terms).items():
+                        new_postings[term].append((doc_id, tf))
+
+                for term, postings in new_postings.items():
+                    row = conn.execute(
+                        "SELECT df, last_doc, postings FROM terms WHERE term = ?", (term,)
+                    ).fetchone()
+                    if row:
+                        df, last_doc, blob = row
+                        blob += encode_postings(postings, last_doc)
+                        df += len(postings)
+                    else:
+                        df, blob = len(postings), encode_postings(postings)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO terms (term, df, last_doc, postings) "
+                        "VALUES (?, ?, ?, ?)",
+                        (term, df, postings[-1][0], blob),
+                    )
+                    self._postings_cache.pop(term, None)
+
+                conn.commit()
+            finally:
+                conn.close()
+
+            for doc_id, chunk_id, length in added:
+                self._chunk_ids[doc_id] = chunk_id
+                self._doc_ids[chunk_id] = doc_id
+                self._lengths[doc_id] = length
+                self._total_length += length
+
+    def delete(self, chunk_ids: Sequence[str]) -> int:
+        """
+        Remove chunks from the index.
+
+        Args:
+            chunk_ids: Vector store chunk IDs
+
+        Returns:
+            Number of removed chunks
+        """
+        with self._lock:
+            doc_ids = [self._doc_ids[c] for c in chunk_ids if c in self._doc_ids]
+            if not doc_ids:
+                return 0
+
+            conn = self._get_connection()
+            try:
+                conn.executemany("DELETE FROM docs WHERE doc_id = ?", [(d,) for d in doc_ids])
+                self._deleted += len(doc_ids)
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('deleted', ?)",
+                    (self._deleted,),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            for doc_id in doc_ids:
+                chunk_id = self._chunk_ids.pop(doc_id)
+                del self._doc_ids[chunk_id]
+                self._total_length -= self._lengths.pop(doc_id)
+
+            if self._deleted > self.COMPACT_RATIO * max(len(self._chunk_ids), 1):
+                self.compact()
+
+            return len(doc_ids)
+
+    def compact(self) -> None:
+        """Purge deleted documents from all postings lists."""
+        with self._lock:
+            conn = self._get_connection()
+            try:
+                rows = conn.execute("SELECT term, postings FROM terms").fetchall()
+                for term, blob in rows:
+                    postings = [p for p in decode_postings(blob) if p[0] in self._chunk_ids]
+                    if postings:
+                        conn.execute(
+                            "UPDATE terms SET df = ?, last_doc = ?, postings = ? WHERE term = ?",
+                            (len(postings), postings[-1][0], encode_postings(postings), term),
+                        )
+                    else:
+                        conn.execute("DELETE FROM terms WHERE term = ?", (term,))
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('deleted', 0)")
+                conn.commit()
+            finally:
+                conn.close()
+
+            self._deleted = 0
+            self._postings_cache.clear()
+            logger.info(f"Compacted sparse index ({len(rows)} terms)")
+
+    def clear(self) -> None:
+        """Remove all documents and terms."""
+        with self._lock:
+            conn = self._get_connection()
+            try:
+                conn.execute("DELETE FROM docs")
+                conn.execute("DELETE FROM terms")
+                conn.execute("DELETE FROM meta")
+                conn.commit()
+            finally:
+                conn.close()
+            self._postings_cache.clear()
+            self._load_documents()
+
+    def _get_postings(
+        self, conn: sqlite3.Connection, term: str
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Get document frequency and decoded postings for a term (LRU-cached).
+
+        Args:
+            conn: Open SQLite connection
+            term: Index term
+
+        Returns:
+            Tuple of (document frequency, postings)
+        """
+        cached = self._postings_cache.get(term)
+        if cached is not None:
+            self._postings_cache.move_to_end(term)
+            return cached
+
+        row = conn.execute("SELECT df, postings FROM terms WHERE term = ?", (term,)).fetchone()
+        entry = (row[0], decode_postings(row[1])) if row else (0, [])
+        self._postings_cache[term] = entry
+        if len(self._postings_cache) > self.postings_cache_size:
+            self._postings_cache.popitem(last=False)
+        return entry
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank chunks for a query with BM25.
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            List of (chunk_id, score) sorted by descending score
+        """
+        terms = list(dict.fromkeys(analyze(query)))
+        if not terms or not self._chunk_ids:
+            return []
+
+        with self._lock:
+            n_docs = len(self._chunk_ids)
+            avg_length = self._total_length / n_docs if n_docs else 1.0
+            scores: Dict[int, float] = defaultdict(float)
+
+            conn = self._get_connection()
+            try:
+                for term in terms:
+                    df, postings = self._get_postings(conn, term)
+                    if not df:
+                        continue
+                    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                    for doc_id, tf in postings:
+                        length = self._lengths.get(doc_id)
+                        if length is None:
+                            continue  # Deleted, not yet compacted
+                        norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                        scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+            finally:
+                conn.close()
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(self._chunk_ids[doc_id], score) for doc_id, score in top]
+
+
+# Global sparse index instance
+_sparse_index: Optional[SparseIndex] = None
+
+
+def get_sparse_index() -> SparseIndex:
+    """
+    Get global sparse index instance.
+
+    Returns:
+        SparseIndex instance
+    """
+    global _sparse_index
+    if _sparse_index is None:
+        _sparse_index = SparseIndex(get_settings().sparse_index_path)
+    return _sparse_index
@@ -0,0 +1,71 @@
+"""
+Token counting helpers based on tiktoken.
+Falls back to a conservative character heuristic when no encoding is available.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Callable, Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Conservative estimate for German text when tiktoken is unavailable
+_CHARS_PER_TOKEN = 3
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    """
+    Resolve the tiktoken encoding for a model.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        Encoding or None if it cannot be loaded (e.g. offline)
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding for {model}: {str(e)}")
+        return None
+
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding cl100k_base: {str(e)}")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count tokens of a text for the given model.
+
+    Args:
+        text: Text to count
+        model: OpenAI model name
+
+    Returns:
+        Number of tokens (estimated if tiktoken is unavailable)
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // _CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def get_token_counter(model: str) -> Callable[[str], int]:
+    """
+    Get a token counting function bound to a model.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        Function mapping text to its token count
+    """
+    return lambda text: count_tokens(text, model)
@@ -5,16 +5,33 @@ Integrates ChromaDB with OpenAI embeddings.
 
 import logging
 import os
+import uuid
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 from chromadb.config import Settings as ChromaSettings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 
 from app.config import get_settings
-from app.services.shared_chroma import get_chroma_client
+from app.services.llm_clients import create_embeddings
+from app.services.metrics import EXTERNAL_CALL_SECONDS
+from app.services.rag.embedding_cache import CachedEmbeddings, get_embedding_cache
+from app.services.rag.hybrid_retriever import HybridRetriever
+from app.services.rag.local_index import LocalIndexRetriever, LocalVectorIndex, get_local_index
+from app.services.rag.query_embeddings import (
+    QueryCachedEmbeddings,
+    QueryEmbeddingBatcher,
+    QueryEmbeddingCache,
+)
+from app.services.rag.sparse_index import SparseIndex, get_sparse_index
+from app.services.shared_chroma import (
+    EmbeddingMismatchError,
+    embedding_metadata,
+    get_chroma_client,
+    get_collection,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,19 +47,46 @@ class VectorStore:
         self._embeddings = None
         self._vectorstore = None
         self._chroma_client = None
+        self._sparse_index = None
+        self._local_index = None
 
     @property
-    def embeddings(self) -> OpenAIEmbeddings:
+    def embeddings(self) -> QueryCachedEmbeddings:
         """
         Lazy initialization of OpenAI embeddings.
+        Chunk embeddings go through the persistent embedding cache (when enabled),
+        query embeddings through an in-process LRU cache and micro-batcher.
 
         Returns:
-            OpenAIEmbeddings instance
+            QueryCachedEmbeddings instance
         """
         if self._embeddings is None:
-            self._embeddings = OpenAIEmbeddings(
-                model=self.settings.embedding_model,
-                openai_api_key=self.settings.openai_api_key,
+            base = create_embeddings()
+            documents_embeddings: Embeddings = base
+            if self.settings.embedding_cache_enabled:
+                documents_embeddings = CachedEmbeddings(
+                    embeddings=base,
+                    cache=get_embedding_cache(),
+                    model=self.settings.embedding_model,
+                    dimensions=self.settings.embedding_dimensions,
+                )
+
+            batcher = None
+            if self.settings.query_embedding_batch_window_ms > 0:
+                batcher = QueryEmbeddingBatcher(
+                    embed_fn=base.embed_documents,
+                    window_ms=self.settings.query_embedding_batch_window_ms,
+                    max_batch_size=self.settings.query_embedding_max_batch_size,
+                )
+
+            self._embeddings = QueryCachedEmbeddings(
+                embeddings=documents_embeddings,
+                cache=QueryEmbeddingCache(
+                    max_size=self.settings.query_embedding_cache_size,
+                    ttl_seconds=self.settings.query_embedding_cache_ttl_seconds,
+                ),
+                batcher=batcher,
+                query_embeddings=base,
             )
             logger.info(f"Initialized OpenAI embeddings with model: {self.settings.embedding_model}")
         return self._embeddings
@@ -65,19 +109,89 @@ class VectorStore:
     def vectorstore(self) -> Chroma:
         """
         Lazy initialization of ChromaDB vector store.
+        The collection must match the configured embedding model and dimensions.
 
         Returns:
             Chroma vector store instance
+
+        Raises:
+            EmbeddingMismatchError: If the collection uses another embedding space
         """
         if self._vectorstore is None:
+            get_collection()
             self._vectorstore = Chroma(
                 client=self.chroma_client,
                 collection_name=self.settings.collection_name,
                 embedding_function=self.embeddings,
+                collection_metadata=embedding_metadata(),
             )
             logger.info(f"Initialized Chroma vectorstore with collection: {self.settings.collection_name}")
         return self._vectorstore
 
+    @property
+    def sparse_index(self) -> Optional[SparseIndex]:
+        """
+        Lazy initialization of the sparse BM25 index (None if hybrid search is disabled).
+        An empty index is backfilled from the existing collection.
+
+        Returns:
+            SparseIndex instance or None
+        """
+        if self._sparse_index is None and self.settings.hybrid_search_enabled:
+            index = get_sparse_index()
+            if len(index) == 0:
+                self._backfill_sparse_index(index)
+            self._sparse_index = index
+        return self._sparse_index
+
+    def _backfill_sparse_index(self, index: SparseIndex, page_size: int = 1000) -> None:
+        """
+        Index all chunks already stored in the collection.
+
+        Args:
+            index: Sparse index to fill
+            page_size: Chunks fetched per Chroma request
+        """
+        collection = self.vectorstore._collection
+        total = collection.count()
+        if total == 0:
+            return
+
+        logger.info(f"Backfilling sparse index from {total} existing chunks")
+        for offset in range(0, total, page_size):
+            page = collection.get(include=["documents"], limit=page_size, offset=offset)
+            index.add(page["ids"], [text or "" for text in page["documents"]])
+
+    @property
+    def local_index(self) -> Optional[LocalVectorIndex]:
+        """
+        Lazy initialization of the local vector index (None unless search_backend is "local").
+        An empty index is mirrored from the existing collection; a quantized
+        index is calibrated to the configured recall target.
+
+        Returns:
+            LocalVectorIndex instance or None
+        """
+        if self._local_index is None and self.settings.search_backend == "local":
+            index = get_local_index()
+            dimensions = embedding_metadata()["embedding_dimensions"]
+            if index.dim is not None and dimensions and index.dim != dimensions:
+                logger.warning("Local index dimension differs from the collection, rebuilding")
+                index.clear()
+            if len(index) == 0:
+                index.sync_from_collection(self.vectorstore._collection)
+            if self.settings.vector_quantization != "none" and len(index) > 0:
+                index.calibrate(
+                    k=self.settings.hybrid_candidate_k
+                    if self.settings.hybrid_search_enabled
+                    else self.settings.retrieval_k,
+                    recall_target=self.settings.quantization_recall_target,
+                    # The collection keeps its own float32 copy in the HNSW index
+                    shadow_bytes_per_vector=index.dim * 4,
+                )
+            self._local_index = index
+        return self._local_index
+
     def add_documents(self, documents: List[Document]) -> List[str]:
         """
         Add documents to the vector store.
@@ -93,7 +207,8 @@ class VectorStore:
         """
         try:
             logger.info(f"Adding {len(documents)} documents to vector store")
-            ids = self.vectorstore.add_documents(documents)
+            embeddings = self.embeddings.embed_documents([doc.page_content for doc in documents])
+            ids = self.add_embedded_documents(documents, embeddings)
             logger.info(f"Successfully added {len(ids)} documents")
             return ids
 
@@ -101,6 +216,96 @@ class VectorStore:
             logger.error(f"Error adding documents to vector store: {str(e)}")
             raise
 
+    def add_embedded_documents(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]],
+    ) -> List[str]:
+        """
+        Add documents whose embeddings have already been computed.
+        Documents with an ID (see make_chunk_id) are upserted, so retried or
+        repeated writes replace instead of duplicating chunks; documents
+        without one get a random ID.
+
+        Args:
+            documents: List of documents to add
+            embeddings: Embeddings in the same order as documents
+
+        Returns:
+            List of document IDs
+
+        Raises:
+            EmbeddingMismatchError: If the embeddings do not match the collection's dimensions
+        """
+        dimensions = embedding_metadata()["embedding_dimensions"]
+        if embeddings and dimensions and len(embeddings[0]) != dimensions:
+            raise EmbeddingMismatchError(
+                f"Got {len(embeddings[0])}-dimensional embeddings, collection expects {dimensions}"
+            )
+
+        try:
+            ids = [doc.id or str(uuid.uuid4()) for doc in documents]
+            with EXTERNAL_CALL_SECONDS.labels("chroma", "add").time():
+                self.vectorstore._collection.upsert(
+                    ids=ids,
+                    embeddings=embeddings,
+                    metadatas=[doc.metadata for doc in documents],
+                    documents=[doc.page_content for doc in documents],
+                )
+            if self.sparse_index is not None:
+                self.sparse_index.add(ids, [doc.page_content for doc in documents])
+            if self.local_index is not None:
+                self.local_index.add(
+                    ids,
+                    embeddings,
+                    [doc.metadata for doc in documents],
+                    [doc.page_content for doc in documents],
+                )
+            return ids
+
+        except Exception as e:
+            logger.error(f"Error adding embedded documents to vector store: {str(e)}")
+            raise
+
+    def update_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """
+        Replace the metadata of stored chunks, keeping their embeddings.
+
+        Args:
+            ids: Chunk IDs
+            metadatas: New metadata in the same order
+        """
+        if not ids:
+            return
+
+        collection = self.vectorstore._collection
+        stored = collection.get(ids=ids, include=["embeddings", "metadatas", "documents"])
+        replaced = dict(zip(ids, metadatas))
+        new_metadatas = [replaced[chunk_id] for chunk_id in stored["ids"]]
+
+        # Chroma's update() merges keys, so stale ones (e.g. source_pages) would
+        # survive; the chunks are written anew with their stored vectors instead
+        collection.delete(ids=stored["ids"])
+        try:
+            collection.add(
+                ids=stored["ids"],
+                embeddings=stored["embeddings"],
+                metadatas=new_metadatas,
+                documents=stored["documents"],
+            )
+        except Exception:
+            collection.add(
+                ids=stored["ids"],
+                embeddings=stored["embeddings"],
+                metadatas=stored["metadatas"],
+                documents=stored["documents"],
+            )
+            raise
+        if self.local_index is not None:
+            self.local_index.add(
+                stored["ids"], stored["embeddings"], new_metadatas, stored["documents"]
+            )
+
     def similarity_search(
         self,
         query: str,
@@ -123,11 +328,15 @@ class VectorStore:
 
         try:
             logger.info(f"Performing similarity search for: '{query}' (k={k})")
-            results = self.vectorstore.similarity_search(
-                query=query,
-                k=k,
-                filter=filter,
-            )
+            if self.local_index is not None:
+                results = [doc for _, doc, _ in self.similarity_search_with_ids(query, k, filter)]
+            else:
+                with EXTERNAL_CALL_SECONDS.labels("chroma", "query").time():
+                    results = self.vectorstore.similarity_search(
+                        query=query,
+                        k=k,
+                        filter=filter,
+                    )
             logger.info(f"Found {len(results)} similar documents")
             return results
 
@@ -157,11 +366,18 @@ class VectorStore:
 
         try:
             logger.info(f"Performing similarity search with scores for: '{query}' (k={k})")
-            results = self.vectorstore.similarity_search_with_score(
-                query=query,
-                k=k,
-                filter=filter,
-            )
+            if self.local_index is not None:
+                results = [
+                    (doc, distance)
+                    for _, doc, distance in self.similarity_search_with_ids(query, k, filter)
+                ]
+            else:
+                with EXTERNAL_CALL_SECONDS.labels("chroma", "query").time():
+                    results = self.vectorstore.similarity_search_with_score(
+                        query=query,
+                        k=k,
+                        filter=filter,
+                    )
             logger.info(f"Found {len(results)} documents with scores")
             return results
 
@@ -169,6 +385,186 @@ class VectorStore:
             logger.error(f"Error during similarity search with scores: {str(e)}")
             raise
 
+    def similarity_search_with_ids(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[tuple[str, Document, float]]:
+        """
+        Perform similarity search returning chunk IDs alongside documents.
+
+        Args:
+            query: Search query
+            k: Number of results to return (default: from settings)
+            filter: Metadata filter dictionary
+
+        Returns:
+            List of tuples (chunk ID, document, distance)
+        """
+        if k is None:
+            k = self.settings.retrieval_k
+
+        query_embedding = self.embeddings.embed_query(query)
+        return self.similarity_search_by_vectors([query_embedding], k, filter)[0]
+
+    def similarity_search_by_vectors(
+        self,
+        query_embeddings: List[List[float]],
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[tuple[str, Document, float]]]:
+        """
+        Search several query embeddings in one request.
+
+        Args:
+            query_embeddings: Query embeddings
+            k: Number of results per query (default: from settings)
+            filter: Metadata filter dictionary
+
+        Returns:
+            Per query, a list of tuples (chunk ID, document, distance)
+        """
+        if k is None:
+            k = self.settings.retrieval_k
+        if not query_embeddings:
+            return []
+
+        if self.local_index is not None:
+            return [
+                self.local_index.search(vector, k=k, where=filter) for vector in query_embeddings
+            ]
+
+        with EXTERNAL_CALL_SECONDS.labels("chroma", "query").time():
+            results = self.vectorstore._collection.query(
+                query_embeddings=query_embeddings,
+                n_results=k,
+                where=filter,
+                include=["documents", "metadatas", "distances"],
+            )
+        return [
+            [
+                (
+                    chunk_id,
+                    Document(id=chunk_id, page_content=text or "", metadata=metadata or {}),
+                    distance,
+                )
+                for chunk_id, text, metadata, distance in zip(ids, texts, metadatas, distances)
+            ]
+            for ids, texts, metadatas, distances in zip(
+                results["ids"], results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
+
+    def similarity_search_many(
+        self,
+        queries: List[str],
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[tuple[str, Document, float]]]:
+        """
+        Embed many queries in one batched call and search them together.
+
+        Args:
+            queries: Search queries
+            k: Number of results per query (default: from settings)
+            filter: Metadata filter dictionary
+
+        Returns:
+            Per query, a list of tuples (chunk ID, document, distance)
+        """
+        if not queries:
+            return []
+        logger.info(f"Performing batched similarity search for {len(queries)} queries")
+        return self.similarity_search_by_vectors(self.embeddings.embed_queries(queries), k, filter)
+
+    def retrieve_many(
+        self,
+        queries: List[str],
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Document]]:
+        """
+        Retrieve documents for many queries the way the RAG retriever does.
+
+        Args:
+            queries: Questions
+            k: Number of documents per query (default: from settings)
+            filter: Metadata filter dictionary
+
+        Returns:
+            Retrieved documents per query, in input order
+        """
+        k = k or self.settings.retrieval_k
+        if self.settings.hybrid_search_enabled:
+            return self.get_hybrid_retriever(k=k, filter=filter).retrieve_many(queries)
+        return [
+            [doc for _, doc, _ in hits] for hits in self.similarity_search_many(queries, k, filter)
+        ]
+
+    def get_documents_by_ids(self, ids: List[str]) -> List[Document]:
+        """
+        Fetch stored chunks by ID, preserving the requested order.
+
+        Args:
+            ids: Chunk IDs
+
+        Returns:
+            List of documents (missing IDs are skipped)
+        """
+        if not ids:
+            return []
+
+        results = self.vectorstore._collection.get(ids=ids, include=["documents", "metadatas"])
+        by_id = {
+            chunk_id: Document(id=chunk_id, page_content=text or "", metadata=metadata or {})
+            for chunk_id, text, metadata in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            )
+        }
+        return [by_id[chunk_id] for chunk_id in ids if chunk_id in by_id]
+
+    def filter_ids(self, ids: List[str], where: Dict[str, Any]) -> List[str]:
+        """
+        Keep the chunk IDs whose metadata matches a filter, preserving order.
+
+        Args:
+            ids: Chunk IDs
+            where: Metadata filter dictionary
+
+        Returns:
+            Matching chunk IDs
+        """
+        if not ids:
+            return []
+        matching = set(self.vectorstore._collection.get(ids=ids, where=where, include=[])["ids"])
+        return [chunk_id for chunk_id in ids if chunk_id in matching]
+
+    def get_hybrid_retriever(
+        self,
+        k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> HybridRetriever:
+        """
+        Get a retriever fusing sparse BM25 and dense results.
+
+        Args:
+            k: Number of documents to retrieve (default: from settings)
+            filter: Metadata filter applied to both searches
+
+        Returns:
+            HybridRetriever instance
+        """
+        return HybridRetriever(
+            vector_store=self,
+            sparse_index=self.sparse_index,
+            k=k or self.settings.retrieval_k,
+            candidate_k=self.settings.hybrid_candidate_k,
+            rrf_k=self.settings.hybrid_rrf_k,
+            sparse_shortcut=self.settings.hybrid_sparse_shortcut,
+            filter=filter,
+        )
+
     def get_retriever(self, search_kwargs: Optional[Dict[str, Any]] = None):
         """
         Get a retriever for RAG chains.
@@ -177,11 +573,18 @@ class VectorStore:
             search_kwargs: Additional search parameters
 
         Returns:
-            VectorStoreRetriever instance
+            VectorStoreRetriever instance (LocalIndexRetriever for the local backend)
         """
         if search_kwargs is None:
             search_kwargs = {"k": self.settings.retrieval_k}
 
+        if self.local_index is not None:
+            return LocalIndexRetriever(
+                vector_store=self,
+                k=search_kwargs.get("k", self.settings.retrieval_k),
+                filter=search_kwargs.get("filter"),
+            )
+
         return self.vectorstore.as_retriever(search_kwargs=search_kwargs)
 
     def delete_collection(self) -> None:
@@ -192,6 +595,10 @@ class VectorStore:
             logger.warning(f"Deleting collection: {self.settings.collection_name}")
             self.vectorstore.delete_collection()
             self._vectorstore = None  # Reset to force reinitialization
+            if self.sparse_index is not None:
+                self.sparse_index.clear()
+            if self.local_index is not None:
+                self.local_index.clear()
             logger.info("Collection deleted successfully")
 
         except Exception as e:
@@ -209,11 +616,20 @@ class VectorStore:
             collection = self.vectorstore._collection
             count = collection.count()
 
-            return {
+            stats = {
                 "collection_name": self.settings.collection_name,
                 "document_count": count,
                 "persist_directory": str(self.settings.chroma_persist_dir),
+                "search_backend": self.settings.search_backend,
             }
+            if self.local_index is not None:
+                stats["local_index_count"] = len(self.local_index)
+                if self.local_index.quantization_report:
+                    stats["quantization"] = self.local_index.quantization_report
+            stats["query_embedding_cache"] = self.embeddings.cache.get_stats()
+            if self.settings.embedding_cache_enabled:
+                stats["embedding_cache"] = get_embedding_cache().get_stats()
+            return stats
 
         except Exception as e:
             logger.error(f"Error getting collection stats: {str(e)}")
@@ -244,6 +660,10 @@ class VectorStore:
             if results and results['ids']:
                 # Delete by IDs
                 collection.delete(ids=results['ids'])
+                if self.sparse_index is not None:
+                    self.sparse_index.delete(results['ids'])
+                if self.local_index is not None:
+                    self.local_index.delete(results['ids'])
                 logger.info(f"Deleted {len(results['ids'])} documents from {source_file}")
             else:
                 logger.info(f"No documents found for source: {source_file}")
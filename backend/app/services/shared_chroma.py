@@ -3,9 +3,10 @@ Shared ChromaDB Client
 Provides a singleton ChromaDB client to avoid multiple instances with different settings.
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional
 import chromadb
 from chromadb.api import ClientAPI
+from chromadb.api.models.Collection import Collection
 from chromadb.config import Settings as ChromaSettings
 from loguru import logger
 
@@ -14,6 +15,17 @@ from app.config import get_settings
 
 _chroma_client: Optional[ClientAPI] = None
 
+# Native output dimensions of the OpenAI embedding models
+MODEL_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+
+class EmbeddingMismatchError(ValueError):
+    """Raised when a collection holds embeddings of another model or dimension."""
+
 
 def get_chroma_client() -> ClientAPI:
     """
@@ -40,3 +52,95 @@ def reset_chroma_client() -> None:
     global _chroma_client
     _chroma_client = None
     logger.info("Reset shared ChromaDB client")
+
+
+def embedding_metadata(
+    model: Optional[str] = None, dimensions: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Collection metadata describing the embedding space.
+
+    Args:
+        model: Embedding model (default: from settings)
+        dimensions: Embedding dimensions (default: from settings, else the model's native size)
+
+    Returns:
+        Metadata dictionary with embedding_model and embedding_dimensions
+    """
+    settings = get_settings()
+    model = model or settings.embedding_model
+    if dimensions is None:
+        dimensions = settings.embedding_dimensions if model == settings.embedding_model else None
+    return {
+        "embedding_model": model,
+        "embedding_dimensions": dimensions or MODEL_DIMENSIONS.get(model, 0),
+    }
+
+
+def verify_embedding_metadata(collection: Collection, expected: Dict[str, Any]) -> None:
+    """
+    Ensure a collection matches the expected embedding space.
+    Collections created before the metadata existed are checked against a
+    stored vector and then stamped with the expected metadata.
+
+    Args:
+        collection: ChromaDB collection
+        expected: Metadata from embedding_metadata()
+
+    Raises:
+        EmbeddingMismatchError: If the collection uses another model or dimension
+    """
+    metadata = collection.metadata or {}
+    if "embedding_dimensions" in metadata:
+        recorded = {key: metadata.get(key) for key in expected}
+        if recorded != expected:
+            raise EmbeddingMismatchError(
+                f"Collection '{collection.name}' stores {recorded}, but {expected} is configured. "
+                f"Migrate it with 'python -m app.cli.migrate_embeddings' or use another collection."
+            )
+        return
+
+    if collection.count():
+        sample = collection.get(limit=1, include=["embeddings"])
+        stored_dimensions = len(sample["embeddings"][0])
+        configured = expected["embedding_dimensions"]
+        if configured and stored_dimensions != configured:
+            raise EmbeddingMismatchError(
+                f"Collection '{collection.name}' stores {stored_dimensions}-dimensional "
+                f"embeddings, but {configured} are configured. "
+                f"Migrate it with 'python -m app.cli.migrate_embeddings' "
+                f"or use another collection."
+            )
+
+    # hnsw:* keys cannot be passed to modify()
+    kept = {key: value for key, value in metadata.items() if not key.startswith("hnsw:")}
+    collection.modify(metadata={**kept, **expected})
+    logger.info(f"Recorded embedding metadata on collection '{collection.name}': {expected}")
+
+
+def get_collection(
+    name: Optional[str] = None,
+    model: Optional[str] = None,
+    dimensions: Optional[int] = None,
+) -> Collection:
+    """
+    Get or create a collection and verify its embedding space.
+
+    Args:
+        name: Collection name (default: from settings)
+        model: Embedding model (default: from settings)
+        dimensions: Embedding dimensions (default: from settings)
+
+    Returns:
+        ChromaDB collection
+
+    Raises:
+        EmbeddingMismatchError: If the collection uses another model or dimension
+    """
+    expected = embedding_metadata(model, dimensions)
+    collection = get_chroma_client().get_or_create_collection(
+        name=name or get_settings().collection_name,
+        metadata=expected,
+    )
+    verify_embedding_metadata(collection, expected)
+    return collection
@@ -0,0 +1,143 @@
+"""
+Benchmark: concurrent RAG queries, synchronous vs. async query path.
+
+Fires N simultaneous queries at a RAGChain with a stubbed LLM (fixed
+latency, no network) and a stubbed retriever (fixed blocking latency,
+standing in for Chroma and the query embedding). "sync" calls ask()
+from a coroutine, as the route did before, which serializes every query
+on the event loop; "async" awaits aask(). A heartbeat task records the
+worst event-loop stall, i.e. how long health checks and SSE keepalives
+would have waited.
+
+Usage:
+    python benchmarks/bench_async_query.py --concurrency 50 --llm-ms 500 --retrieval-ms 30
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.language_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, BaseMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+from langchain_core.retrievers import BaseRetriever  # noqa: E402
+
+from app.services.rag.conversation_store import ConversationStore  # noqa: E402
+from app.services.rag.rag_chain import RAGChain  # noqa: E402
+from bench_vector_index import percentile  # noqa: E402
+
+
+class StubChatModel(BaseChatModel):
+    """Chat model answering after a fixed delay, blocking or awaiting."""
+
+    latency: float
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _result(self) -> ChatResult:
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content="Antwort laut Seite 3."))]
+        )
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+
+class StubRetriever(BaseRetriever):
+    """Retriever blocking for a fixed time, like a Chroma query."""
+
+    latency: float
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        time.sleep(self.latency)
+        return [Document(page_content="Kontext", metadata={"source_file": "skript.pdf", "page": 2})]
+
+
+class StubVectorStore:
+    def __init__(self, latency: float):
+        self.retriever = StubRetriever(latency=latency)
+
+    def get_retriever(self, **kwargs):
+        return self.retriever
+
+    def get_hybrid_retriever(self, **kwargs):
+        return self.retriever
+
+
+async def heartbeat(interval: float, stalls: List[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes up a periodic task."""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        stalls.append(max(time.perf_counter() - expected, 0.0))
+
+
+async def run(mode: str, chain: RAGChain, concurrency: int) -> None:
+    latencies: List[float] = []
+    stalls: List[float] = []
+    stop = asyncio.Event()
+
+    async def one_query(i: int) -> None:
+        if mode == "sync":
+            chain.ask(f"Frage {i}", f"{mode}-{i}")
+        else:
+            await chain.aask(f"Frage {i}", f"{mode}-{i}")
+        # All queries arrive at once, so latency counts from the common start
+        latencies.append(time.perf_counter() - start)
+
+    monitor = asyncio.create_task(heartbeat(0.01, stalls, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one_query(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+
+    print(
+        f"{mode:<6} {concurrency} queries in {elapsed:6.2f}s "
+        f"({concurrency / elapsed:6.1f} q/s) "
+        f"p50={percentile(latencies, 50):8.1f}ms "
+        f"p95={percentile(latencies, 95):8.1f}ms "
+        f"max loop stall={max(stalls, default=0.0) * 1000:8.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--llm-ms", type=float, default=500.0)
+    parser.add_argument("--retrieval-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ConversationStore(Path(tmp) / "conversations.db")
+        chain = RAGChain(StubVectorStore(args.retrieval_ms / 1000), store)
+        chain._llm = StubChatModel(latency=args.llm_ms / 1000)
+        for mode in ("sync", "async"):
+            asyncio.run(run(mode, chain, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: PDF text extractors (pypdf vs. pdfium vs. PyMuPDF).
+
+Extracts a set of synthetic lecture scripts with every installed backend
+and reports pages/second and peak memory. Each backend runs in a fresh
+process, so peak RSS (which includes the native libraries' allocations)
+is not inflated by earlier runs; in-process runs report the peak above
+the baseline after importing the library. With --workers, the parsing
+pool used by the backend (PdfParser) is measured as well, reporting the
+largest worker's total peak RSS.
+
+Usage:
+    python benchmarks/bench_pdf_extractors.py --pages 5 40 200 --copies 3
+    python benchmarks/bench_pdf_extractors.py --extractors pypdf pdfium --workers 4
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.services.rag.pdf_parsing import PDF_EXTRACTORS, PdfParser, extract_pages  # noqa: E402
+from synthetic_pdfs import write_corpus  # noqa: E402
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """Peak resident set size (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(
+    extractor: str, paths: List[str], repeats: int, workers: Optional[int]
+) -> Dict[str, float]:
+    """
+    Extract all PDFs (runs in a fresh process).
+
+    Args:
+        extractor: Extractor name
+        paths: PDF file paths
+        repeats: Passes over the corpus
+        workers: Parsing pool size, or None to extract in this process
+
+    Returns:
+        Pages, characters, seconds and peak memory (MB)
+    """
+    # Warm up: import the library and parse one page before taking the baseline
+    extract_pages(extractor, paths[0], 0, 1)
+    baseline = peak_rss_mb()
+    pages = chars = 0
+
+    start = time.perf_counter()
+    if workers is None:
+        for _ in range(repeats):
+            for path in paths:
+                _, texts = extract_pages(extractor, path, 0, sys.maxsize)
+                pages += len(texts)
+                chars += sum(len(text) for text in texts)
+        seconds = time.perf_counter() - start
+        return {
+            "pages": pages,
+            "chars": chars,
+            "seconds": seconds,
+            "peak_mb": peak_rss_mb() - baseline,
+        }
+
+    parser = PdfParser(workers=workers, extractor=extractor)
+    for future in [
+        parser.executor.submit(extract_pages, extractor, paths[0], 0, 1) for _ in range(workers)
+    ]:
+        future.result()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for documents in parser.parse_many([Path(path) for path in paths]):
+            pages += len(documents)
+            chars += sum(len(doc.page_content) for doc in documents)
+    seconds = time.perf_counter() - start
+    # Reap the workers so their peak shows up in RUSAGE_CHILDREN
+    parser.executor.shutdown(wait=True)
+    parser.shutdown()
+    return {
+        "pages": pages,
+        "chars": chars,
+        "seconds": seconds,
+        "peak_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def run(extractor: str, paths: List[str], repeats: int, workers: Optional[int]) -> Dict[str, float]:
+    """Run measure() in a spawned process."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(measure, extractor, paths, repeats, workers).result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--pages", type=int, nargs="+", default=[5, 40, 200], help="Page counts of the scripts"
+    )
+    parser.add_argument("--copies", type=int, default=3, help="Scripts per page count")
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument(
+        "--extractors", nargs="+", choices=list(PDF_EXTRACTORS), default=list(PDF_EXTRACTORS)
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Also measure the parsing pool with this many processes"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [str(path) for path in write_corpus(Path(tmp), args.pages, args.copies)]
+        total_pages = sum(args.pages) * args.copies
+        print(f"Corpus: {len(paths)} PDFs, {total_pages} pages")
+
+        pool = [(f"pool x{args.workers}", args.workers)] if args.workers else []
+        modes = [("in-process", None)] + pool
+        for extractor in args.extractors:
+            if not PDF_EXTRACTORS[extractor].is_available():
+                print(f"{extractor:<8} skipped ({PDF_EXTRACTORS[extractor].module} not installed)")
+                continue
+            for label, workers in modes:
+                result = run(extractor, paths, args.repeats, workers)
+                print(
+                    f"{extractor:<8} {label:<11} "
+                    f"pages/s={result['pages'] / result['seconds']:9.1f} "
+                    f"time={result['seconds']:7.2f}s "
+                    f"peak={result['peak_mb']:7.1f}MB "
+                    f"chars/page={result['chars'] / max(result['pages'], 1):7.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
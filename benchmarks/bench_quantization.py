@@ -0,0 +1,79 @@
+"""
+Benchmark: quantized first-pass search with full-precision rerank.
+
+For each corpus size and quantization scheme, calibrates the rerank
+candidate count to the recall target and reports memory saved versus
+recall lost, plus query latency against the unquantized index.
+
+Usage:
+    python benchmarks/bench_quantization.py --sizes 10000 50000 --dim 1536 --recall-target 0.95
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.services.rag.local_index import LocalVectorIndex  # noqa: E402
+from bench_vector_index import make_corpus, percentile  # noqa: E402
+
+
+def query_latencies(index: LocalVectorIndex, queries: np.ndarray, k: int) -> list:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k=k)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(size: int, dim: int, n_queries: int, k: int, recall_target: float) -> None:
+    vectors, metadatas = make_corpus(size, dim, n_docs=max(size // 500, 2))
+    ids = [str(i) for i in range(size)]
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, size, size=n_queries)]
+    queries = queries + 0.3 * rng.normal(size=queries.shape).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for quantization in ("none", "int8", "binary"):
+            index = LocalVectorIndex(Path(tmp) / quantization, quantization=quantization)
+            index.add(ids, vectors, metadatas, [""] * size)
+
+            if quantization == "none":
+                report = {"memory_saved_ratio": 0.0, "recall": 1.0, "rerank_candidates": "-"}
+            else:
+                report = index.calibrate(k=k, recall_target=recall_target)
+
+            timings = query_latencies(index, queries, k)
+            print(
+                f"{size:>8} {quantization:<7} "
+                f"saved={report['memory_saved_ratio'] * 100:5.1f}% "
+                f"recall@{k}={report['recall']:.3f} "
+                f"rerank={report['rerank_candidates']!s:>6} "
+                f"p50={percentile(timings, 50):8.2f}ms "
+                f"p95={percentile(timings, 95):8.2f}ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--recall-target", type=float, default=0.95)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.dim, args.queries, args.k, args.recall_target)
+
+
+if __name__ == "__main__":
+    main()
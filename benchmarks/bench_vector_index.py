@@ -0,0 +1,134 @@
+"""
+Benchmark: local memory-mapped vector index vs. ChromaDB.
+
+Measures per-query latency (p50/p95) and recall@k against exact
+brute-force results for several corpus sizes, with and without a
+metadata filter. Uses synthetic clustered embeddings, no API calls.
+
+Usage:
+    python benchmarks/bench_vector_index.py --sizes 1000 10000 50000 --dim 1536
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import chromadb  # noqa: E402
+from chromadb.config import Settings as ChromaSettings  # noqa: E402
+
+from app.services.rag.local_index import LocalVectorIndex  # noqa: E402
+
+CHROMA_BATCH = 5000
+
+
+def make_corpus(n: int, dim: int, n_docs: int, seed: int = 0):
+    """Clustered unit vectors (one cluster per lecture document) plus metadata."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_docs, dim)).astype(np.float32)
+    assignment = rng.integers(0, n_docs, size=n)
+    vectors = centers[assignment] + 0.8 * rng.normal(size=(n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    metadatas = [{"source_file": f"doc_{d}.pdf", "page": i % 300} for i, d in enumerate(assignment)]
+    return vectors, metadatas
+
+
+def exact_top_k(vectors, metadatas, query, k, source_file=None):
+    scores = vectors @ query
+    if source_file is not None:
+        mask = np.array([m["source_file"] == source_file for m in metadatas])
+        scores = np.where(mask, scores, -np.inf)
+    return set(np.argsort(-scores)[:k].tolist())
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000
+
+
+def run(size: int, dim: int, n_queries: int, k: int, dtype: str) -> None:
+    vectors, metadatas = make_corpus(size, dim, n_docs=max(size // 500, 2))
+    ids = [str(i) for i in range(size)]
+    documents = [""] * size
+    rng = np.random.default_rng(1)
+    query_rows = rng.integers(0, size, size=n_queries)
+    queries = vectors[query_rows] + 0.3 * rng.normal(size=(n_queries, dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        local = LocalVectorIndex(Path(tmp) / "local", dtype=dtype)
+        local.add(ids, vectors, metadatas, documents)
+        local_build = time.perf_counter() - start
+
+        client = chromadb.PersistentClient(
+            path=str(Path(tmp) / "chroma"), settings=ChromaSettings(anonymized_telemetry=False)
+        )
+        collection = client.create_collection("bench")
+        start = time.perf_counter()
+        for offset in range(0, size, CHROMA_BATCH):
+            collection.add(
+                ids=ids[offset:offset + CHROMA_BATCH],
+                embeddings=vectors[offset:offset + CHROMA_BATCH].tolist(),
+                metadatas=metadatas[offset:offset + CHROMA_BATCH],
+                documents=documents[offset:offset + CHROMA_BATCH],
+            )
+        chroma_build = time.perf_counter() - start
+
+        for label, use_filter in (("unfiltered", False), ("filtered", True)):
+            timings = {"local": [], "chroma": []}
+            recall = {"local": [], "chroma": []}
+
+            for row, query in zip(query_rows, queries):
+                source_file = metadatas[row]["source_file"] if use_filter else None
+                where = {"source_file": source_file} if use_filter else None
+                truth = exact_top_k(vectors, metadatas, query, k, source_file)
+
+                start = time.perf_counter()
+                hits = local.search(query, k=k, where=where)
+                timings["local"].append(time.perf_counter() - start)
+                recall["local"].append(len(truth & {int(h[0]) for h in hits}) / k)
+
+                start = time.perf_counter()
+                result = collection.query(
+                    query_embeddings=[query.tolist()],
+                    n_results=k,
+                    where=where,
+                    include=["distances"],
+                )
+                timings["chroma"].append(time.perf_counter() - start)
+                recall["chroma"].append(len(truth & {int(i) for i in result["ids"][0]}) / k)
+
+            for backend in ("local", "chroma"):
+                build = local_build if backend == "local" else chroma_build
+                print(
+                    f"{size:>8} {label:<11} {backend:<7} "
+                    f"p50={percentile(timings[backend], 50):8.2f}ms "
+                    f"p95={percentile(timings[backend], 95):8.2f}ms "
+                    f"recall@{k}={statistics.mean(recall[backend]):.3f} "
+                    f"build={build:6.1f}s"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.dim, args.queries, args.k, args.dtype)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+In-memory stand-in for the Neo4j GraphBuilder.
+
+Implements the GraphBuilder methods used by the pipeline and the graph
+routes on plain dictionaries, so load tests need no Neo4j server.
+Install it with install() before the first request reaches the app.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.graph import graph_builder as graph_builder_module
+from app.services.graph.entity_extractor import Entity, GraphData, Relationship
+
+
+class InMemoryGraphBuilder:
+    """
+    Dictionary-backed replacement for GraphBuilder.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._relationships: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        pass
+
+    def add_graph_data(self, graph_data: GraphData) -> Dict[str, int]:
+        return {
+            "nodes_created": self.add_entities_batch(graph_data.entities),
+            "relationships_created": self.add_relationships_batch(graph_data.relationships),
+        }
+
+    def add_entities_batch(self, entities: List[Entity]) -> int:
+        with self._lock:
+            for entity in entities:
+                node = self._nodes.setdefault(
+                    entity.name, {"name": entity.name, "labels": [entity.type]}
+                )
+                node.update(entity.properties)
+                node["description"] = entity.description
+        return len(entities)
+
+    def add_relationships_batch(self, relationships: List[Relationship]) -> int:
+        with self._lock:
+            created = 0
+            for rel in relationships:
+                if rel.source in self._nodes and rel.target in self._nodes:
+                    self._relationships[(rel.source, rel.target, rel.type)] = dict(rel.properties)
+                    created += 1
+        return created
+
+    def _concepts(self, subject: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            node for node in self._nodes.values()
+            if "Concept" in node["labels"] and (subject is None or node.get("subject") == subject)
+        ]
+
+    def get_all_concepts(self, subject: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted(
+                (
+                    {"name": node["name"], "description": node.get("description"),
+                     "difficulty": node.get("difficulty"), "labels": node["labels"]}
+                    for node in self._concepts(subject)
+                ),
+                key=lambda concept: concept["name"],
+            )
+
+    def get_graph_data(self, subject: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            names = {
+                name for name, node in self._nodes.items()
+                if subject is None or node.get("subject") in (None, subject)
+            }
+            nodes = [
+                {"name": name, "description": self._nodes[name].get("description"),
+                 "labels": self._nodes[name]["labels"], "properties": dict(self._nodes[name])}
+                for name in sorted(names)
+            ]
+            relationships = [
+                {
+                    "source": source,
+                    "target": target,
+                    "type": rel_type,
+                    "properties": dict(properties),
+                }
+                for (source, target, rel_type), properties in self._relationships.items()
+                if source in names and target in names
+            ]
+        return {"nodes": nodes, "relationships": relationships}
+
+    def get_concept(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            node = self._nodes.get(name)
+            if node is None or "Concept" not in node["labels"]:
+                return None
+            return {"name": name, "description": node.get("description"),
+                    "difficulty": node.get("difficulty"), "properties": dict(node)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [node["labels"] for node in self._nodes.values()]
+            return {
+                "total_nodes": len(self._nodes),
+                "total_relationships": len(self._relationships),
+                "concepts": sum("Concept" in node_labels for node_labels in labels),
+                "topics": sum("Topic" in node_labels for node_labels in labels),
+                "people": sum("Person" in node_labels for node_labels in labels),
+            }
+
+    def _delete_nodes(self, names: List[str]) -> int:
+        for name in names:
+            del self._nodes[name]
+        for key in [key for key in self._relationships if key[0] in names or key[1] in names]:
+            del self._relationships[key]
+        return len(names)
+
+    def delete_by_document(self, document_id: str) -> Dict[str, int]:
+        with self._lock:
+            names = [
+                name for name, node in self._nodes.items() if node.get("document_id") == document_id
+            ]
+            return {"nodes_deleted": self._delete_nodes(names), "relationships_deleted": 0}
+
+    def delete_all(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "nodes_deleted": self._delete_nodes(list(self._nodes)),
+                "relationships_deleted": 0,
+            }
+
+
+def install() -> InMemoryGraphBuilder:
+    """
+    Make get_graph_builder() return an in-memory graph.
+
+    Returns:
+        The installed graph builder
+    """
+    builder = InMemoryGraphBuilder()
+    graph_builder_module._graph_builder = builder
+    return builder
@@ -0,0 +1,359 @@
+"""
+Fake OpenAI-compatible API for load tests.
+
+Serves /v1/embeddings and /v1/chat/completions (plain and streaming) with
+configurable latency and RPM/TPM limits, so the backend can be driven at
+full concurrency without network access or API cost. Point the backend
+at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+Embeddings are deterministic hashed bags of words (or token IDs), so
+similar texts get similar vectors and retrieval behaves plausibly. Chat
+replies are canned: graph JSON for entity extraction prompts, a JSON
+array for flashcard prompts, and a German answer otherwise.
+
+Usage:
+    python benchmarks/loadtest/fake_openai.py --port 8100 --latency-ms 300 --token-ms 5 --rpm 500
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+WORD_RE = re.compile(r"\w{3,}")
+
+ANSWER_TEMPLATE = (
+    "Laut den Unterlagen (Seite 1) beschreibt {topic} einen zentralen Zusammenhang "
+    "des Fachgebiets. Die Kernaussage lässt sich in wenigen Schritten zusammenfassen "
+    "und an einem Beispiel erläutern. "
+)
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """Behaviour of the fake API."""
+
+    latency_ms: float = 200.0  # Time to first token / embedding response
+    token_ms: float = 0.0  # Additional time per generated token
+    rpm: Optional[int] = None  # Requests per minute before 429 (None = unlimited)
+    tpm: Optional[int] = None  # Tokens per minute before 429 (None = unlimited)
+    answer_words: int = 60
+    default_dimensions: int = 1536
+
+
+@dataclass
+class FakeOpenAIStats:
+    """Counters exposed on /stats."""
+
+    requests: Dict[str, int] = field(default_factory=lambda: {"embeddings": 0, "chat": 0})
+    rate_limited: int = 0
+    embedded_inputs: int = 0
+
+
+class MinuteWindow:
+    """Sliding one-minute window of request and token usage."""
+
+    def __init__(self, rpm: Optional[int], tpm: Optional[int]):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._events: Deque[Tuple[float, int]] = deque()
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def admit(self, tokens: int) -> Tuple[bool, Dict[str, str]]:
+        """
+        Record a request if it fits into the limits.
+
+        Returns:
+            Tuple of (admitted, rate-limit headers)
+        """
+        now = time.monotonic()
+        with self._lock:
+            while self._events and self._events[0][0] <= now - 60:
+                self._tokens -= self._events.popleft()[1]
+
+            reset = 60 - (now - self._events[0][0]) if self._events else 0.0
+            over_requests = self.rpm is not None and len(self._events) + 1 > self.rpm
+            over_tokens = self.tpm is not None and self._events and self._tokens + tokens > self.tpm
+            admitted = not (over_requests or over_tokens)
+            if admitted:
+                self._events.append((now, tokens))
+                self._tokens += tokens
+
+            headers = {}
+            if self.rpm is not None:
+                headers["x-ratelimit-limit-requests"] = str(self.rpm)
+                headers["x-ratelimit-remaining-requests"] = str(
+                    max(self.rpm - len(self._events), 0)
+                )
+                headers["x-ratelimit-reset-requests"] = f"{reset:.3f}s"
+            if self.tpm is not None:
+                headers["x-ratelimit-limit-tokens"] = str(self.tpm)
+                headers["x-ratelimit-remaining-tokens"] = str(max(self.tpm - self._tokens, 0))
+                headers["x-ratelimit-reset-tokens"] = f"{reset:.3f}s"
+            if not admitted:
+                headers["retry-after-ms"] = str(int(max(reset, 0.05) * 1000))
+            return admitted, headers
+
+
+def embed_text(item: Any, dimensions: int) -> np.ndarray:
+    """
+    Deterministic unit vector of a text or token-ID list.
+
+    Args:
+        item: Input string or list of token IDs
+        dimensions: Vector size
+
+    Returns:
+        Normalized float32 vector
+    """
+    features = (
+        WORD_RE.findall(item.lower()) if isinstance(item, str) else [str(token) for token in item]
+    )
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for feature in features or ["<leer>"]:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def prompt_text(messages: List[Dict[str, Any]]) -> str:
+    """Concatenate the text content of chat messages."""
+    parts = []
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(content)
+    return "\n".join(parts)
+
+
+def canned_reply(prompt: str, answer_words: int) -> str:
+    """
+    Reply matching what the calling service parses.
+
+    Args:
+        prompt: Full prompt text
+        answer_words: Length of free-text answers
+
+    Returns:
+        Reply text
+    """
+    user_part = prompt.rsplit("Text:**", 1)[-1]
+    words = [word for word in WORD_RE.findall(user_part) if len(word) > 6][:3] or ["Grundbegriff"]
+
+    if '"entities"' in prompt:
+        entities = [
+            {
+                "name": word.capitalize(),
+                "type": "Concept",
+                "description": f"Begriff {word}",
+                "properties": {},
+            }
+            for word in dict.fromkeys(words)
+        ]
+        relationships = [
+            {"source": a["name"], "target": b["name"], "type": "RELATES_TO", "properties": {}}
+            for a, b in zip(entities, entities[1:])
+        ]
+        return json.dumps(
+            {"entities": entities, "relationships": relationships}, ensure_ascii=False
+        )
+
+    if "JSON-Array" in prompt:
+        cards = [
+            {
+                "question": f"Was versteht man unter {word}?",
+                "answer": f"{word} ist ein Fachbegriff.",
+                "difficulty": 2,
+                "tags": ["loadtest"],
+            }
+            for word in words
+        ]
+        return json.dumps(cards, ensure_ascii=False)
+
+    text = ANSWER_TEMPLATE.format(topic=words[0])
+    repeated = (text.split() * (answer_words // len(text.split()) + 1))[:answer_words]
+    return " ".join(repeated)
+
+
+def create_app(config: FakeOpenAIConfig) -> FastAPI:
+    """
+    Create the fake API application.
+
+    Args:
+        config: Latency and rate-limit behaviour
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="Fake OpenAI")
+    window = MinuteWindow(config.rpm, config.tpm)
+    stats = FakeOpenAIStats()
+
+    def rate_limited(headers: Dict[str, str]) -> JSONResponse:
+        stats.rate_limited += 1
+        return JSONResponse(
+            status_code=429,
+            headers=headers,
+            content={
+                "error": {
+                    "message": "Rate limit reached",
+                    "type": "requests",
+                    "code": "rate_limit_exceeded",
+                }
+            },
+        )
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body["input"]
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        tokens = sum(len(item) // 4 if isinstance(item, str) else len(item) for item in inputs)
+
+        admitted, headers = window.admit(tokens)
+        if not admitted:
+            return rate_limited(headers)
+
+        stats.requests["embeddings"] += 1
+        stats.embedded_inputs += len(inputs)
+        await asyncio.sleep(config.latency_ms / 1000)
+
+        dimensions = body.get("dimensions") or config.default_dimensions
+        data = []
+        for index, item in enumerate(inputs):
+            vector = embed_text(item, dimensions)
+            if body.get("encoding_format") == "base64":
+                embedding: Any = base64.b64encode(vector.astype("<f4").tobytes()).decode("ascii")
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        return JSONResponse(
+            headers=headers,
+            content={
+                "object": "list",
+                "data": data,
+                "model": body.get("model", "text-embedding-3-small"),
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            },
+        )
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        prompt = prompt_text(body.get("messages", []))
+        reply = canned_reply(prompt, config.answer_words)
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(reply) // 4
+
+        admitted, headers = window.admit(prompt_tokens + completion_tokens)
+        if not admitted:
+            return rate_limited(headers)
+
+        stats.requests["chat"] += 1
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "gpt-4o-mini")
+        created = int(time.time())
+
+        if body.get("stream"):
+            async def events():
+                await asyncio.sleep(config.latency_ms / 1000)
+                for word in reply.split(" "):
+                    await asyncio.sleep(config.token_ms / 1000)
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [
+                            {"index": 0, "delta": {"content": word + " "}, "finish_reason": None}
+                        ],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                final = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+        await asyncio.sleep((config.latency_ms + config.token_ms * completion_tokens) / 1000)
+        return JSONResponse(
+            headers=headers,
+            content={
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": reply},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    @app.get("/stats")
+    async def get_stats():
+        return {
+            "requests": stats.requests,
+            "rate_limited": stats.rate_limited,
+            "embedded_inputs": stats.embedded_inputs,
+        }
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--token-ms", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=None)
+    parser.add_argument("--tpm", type=int, default=None)
+    parser.add_argument("--answer-words", type=int, default=60)
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig(
+        latency_ms=args.latency_ms, token_ms=args.token_ms, rpm=args.rpm, tpm=args.tpm,
+        answer_words=args.answer_words,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
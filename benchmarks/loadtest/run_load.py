@@ -0,0 +1,351 @@
+"""
+End-to-end load test of the FastAPI backend, fully offline.
+
+Starts the fake OpenAI API (fake_openai.py) and the real backend on local
+ports, replaces Neo4j with the in-memory graph (fake_graph.py) and keeps
+all data in a temporary directory. Virtual users then run for a fixed
+duration, each in a closed loop:
+
+- query users ask RAG questions, alternating /query and /query/stream
+- upload users upload generated PDFs and wait until ingestion completes
+- review users fetch the next due flashcard and answer it
+
+The report lists requests, errors, throughput and p50/p95/p99 latency
+per endpoint; --json writes the same numbers for comparison in CI.
+
+Usage:
+    python benchmarks/loadtest/run_load.py --duration 60 --query-users 20 --upload-users 2 \
+        --review-users 10
+    python benchmarks/loadtest/run_load.py --latency-ms 800 --rpm 300 --json loadtest.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parents[1] / "backend"))
+sys.path.insert(0, str(HERE.parent))
+sys.path.insert(0, str(HERE))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from bench_vector_index import percentile  # noqa: E402
+from fake_openai import FakeOpenAIConfig, create_app as create_fake_openai  # noqa: E402
+from synthetic_pdfs import TOPICS, lecture_pdf  # noqa: E402
+
+
+API = "/api"
+
+
+class Recorder:
+    """Latencies and errors per endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, start: float, ok: bool) -> None:
+        if ok:
+            self.latencies[name].append(time.perf_counter() - start)
+        else:
+            self.errors[name] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            values = self.latencies[name]
+            summary[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50), 1) if values else None,
+                "p95_ms": round(percentile(values, 95), 1) if values else None,
+                "p99_ms": round(percentile(values, 99), 1) if values else None,
+            }
+        return summary
+
+
+def configure_environment(data_dir: Path, openai_url: str) -> None:
+    """Point the backend at the fake API and a scratch data directory."""
+    from app.config import Settings
+
+    os.environ["ANONYMIZED_TELEMETRY"] = "False"
+    os.environ["OPENAI_API_KEY"] = "loadtest"
+    os.environ["OPENAI_BASE_URL"] = openai_url
+    for name, field in Settings.model_fields.items():
+        if isinstance(field.default, Path):
+            os.environ[name.upper()] = str(data_dir / field.default.relative_to("data"))
+
+
+def check_tokenizer() -> None:
+    """Fail early if tiktoken cannot load its encoding (OpenAIEmbeddings tokenizes locally)."""
+    import tiktoken
+
+    try:
+        tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        raise SystemExit(
+            f"tiktoken could not load cl100k_base ({e}). Run once with network access "
+            "or point TIKTOKEN_CACHE_DIR at a directory with the cached encoding."
+        )
+
+
+def start_server(app: Any, port: int) -> Tuple[uvicorn.Server, threading.Thread]:
+    """Run an ASGI app with uvicorn in a daemon thread."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Server on port {port} failed to start")
+        time.sleep(0.05)
+    return server, thread
+
+
+async def wait_for_ingestion(client: httpx.AsyncClient, document_id: str, timeout: float) -> bool:
+    """Poll the progress endpoint until the document is processed."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        response = await client.get(f"{API}/progress/status/{document_id}")
+        status = response.json().get("status")
+        if status in ("completed", "error"):
+            return status == "completed"
+        await asyncio.sleep(0.2)
+    return False
+
+
+async def upload(
+    client: httpx.AsyncClient, recorder: Recorder, seed: int, pages: int, timeout: float
+) -> bool:
+    """Upload one generated PDF and wait for its ingestion."""
+    start = time.perf_counter()
+    files = {"file": (f"skript_{seed}.pdf", lecture_pdf(seed, pages), "application/pdf")}
+    try:
+        response = await client.post(
+            f"{API}/documents/upload", files=files, params={"subject": "Statistik"}
+        )
+        recorder.record("POST /documents/upload", start, response.status_code == 200)
+        if response.status_code != 200:
+            return False
+        completed = await wait_for_ingestion(client, response.json()["document_id"], timeout)
+    except httpx.HTTPError:
+        recorder.record("POST /documents/upload", start, False)
+        return False
+    recorder.record("ingestion (upload to indexed)", start, completed)
+    return completed
+
+
+async def query_user(client: httpx.AsyncClient, recorder: Recorder, user: int, stop: float) -> None:
+    """Ask questions in one conversation, alternating plain and streamed answers."""
+    rng = random.Random(user)
+    turn = 0
+    while time.perf_counter() < stop:
+        payload = {
+            "question": f"Was ist {rng.choice(TOPICS)} und wofuer wird es eingesetzt?",
+            "conversation_id": f"loadtest-{user}",
+        }
+        name = "POST /rag/query" if turn % 2 == 0 else "POST /rag/query/stream"
+        start = time.perf_counter()
+        try:
+            if turn % 2 == 0:
+                response = await client.post(f"{API}/rag/query", json=payload)
+                recorder.record(name, start, response.status_code == 200)
+            else:
+                first_token = False
+                async with client.stream(
+                    "POST", f"{API}/rag/query/stream", json=payload
+                ) as response:
+                    async for line in response.aiter_lines():
+                        if not first_token and line == "event: token":
+                            first_token = True
+                            recorder.record(f"{name} (first token)", start, True)
+                recorder.record(name, start, response.status_code == 200 and first_token)
+        except httpx.HTTPError:
+            recorder.record(name, start, False)
+        turn += 1
+
+
+async def upload_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    user: int,
+    stop: float,
+    pages: int,
+    timeout: float,
+) -> None:
+    """Upload documents back to back."""
+    seed = 1000 * (user + 1)
+    while time.perf_counter() < stop:
+        seed += 1
+        await upload(client, recorder, seed, pages, timeout)
+
+
+async def review_user(
+    client: httpx.AsyncClient, recorder: Recorder, user: int, stop: float
+) -> None:
+    """Review due flashcards."""
+    rng = random.Random(user)
+    while time.perf_counter() < stop:
+        start = time.perf_counter()
+        try:
+            response = await client.get(f"{API}/flashcards/next/due")
+            recorder.record("GET /flashcards/next/due", start, response.status_code == 200)
+            card = response.json() if response.status_code == 200 else None
+            if not card:
+                await asyncio.sleep(0.1)
+                continue
+            start = time.perf_counter()
+            response = await client.post(
+                f"{API}/flashcards/answer",
+                json={
+                    "flashcard_id": card["id"],
+                    "correct": rng.random() < 0.7,
+                    "time_spent_seconds": 5,
+                },
+            )
+            recorder.record("POST /flashcards/answer", start, response.status_code == 200)
+        except httpx.HTTPError:
+            recorder.record("GET /flashcards/next/due", start, False)
+
+
+async def seed_data(client: httpx.AsyncClient, flashcards: int, pages: int, timeout: float) -> None:
+    """Index one document and create flashcards before measuring."""
+    if not await upload(client, Recorder(), 0, pages, timeout):
+        raise RuntimeError("Seed document could not be ingested; check the backend log")
+    for i in range(flashcards):
+        await client.post(f"{API}/flashcards", json={
+            "subject": "Statistik",
+            "question": f"Was versteht man unter {TOPICS[i % len(TOPICS)]}? ({i})",
+            "answer": "Siehe Skript.",
+        })
+
+
+async def run(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        await seed_data(client, args.flashcards, args.pages, args.timeout)
+
+        start = time.perf_counter()
+        stop = start + args.duration
+        users = (
+            [query_user(client, recorder, i, stop) for i in range(args.query_users)]
+            + [
+                upload_user(client, recorder, i, stop, args.pages, args.timeout)
+                for i in range(args.upload_users)
+            ]
+            + [review_user(client, recorder, i, stop) for i in range(args.review_users)]
+        )
+        await asyncio.gather(*users)
+        elapsed = time.perf_counter() - start
+
+        scheduler = (await client.get("/health/llm")).json()
+
+    return {
+        "duration_s": round(elapsed, 1),
+        "endpoints": recorder.summary(elapsed),
+        "llm_scheduler": scheduler,
+    }
+
+
+def print_report(report: Dict[str, Any], fake_stats: Dict[str, Any]) -> None:
+    print(
+        f"\n{'endpoint':<38} {'req':>6} {'err':>5} {'req/s':>7} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for name, row in report["endpoints"].items():
+        cells = [
+            f"{row[key]:9.1f}" if row[key] is not None else f"{'-':>9}"
+            for key in ("p50_ms", "p95_ms", "p99_ms")
+        ]
+        print(
+            f"{name:<38} {row['requests']:6d} {row['errors']:5d} "
+            f"{row['throughput_rps']:7.2f} {' '.join(cells)}"
+        )
+
+    scheduler = report["llm_scheduler"]
+    print(
+        f"\nfake OpenAI: {fake_stats['requests']['chat']} chat, "
+        f"{fake_stats['requests']['embeddings']} embedding requests "
+        f"({fake_stats['embedded_inputs']} inputs), {fake_stats['rate_limited']} rate limited"
+    )
+    if scheduler.get("enabled"):
+        for priority in ("interactive", "background"):
+            stats = scheduler[priority]
+            print(
+                f"scheduler {priority:<11}: {stats['requests']} requests, "
+                f"avg wait {stats['avg_wait_seconds'] * 1000:.0f} ms, "
+                f"max wait {stats['max_wait_seconds'] * 1000:.0f} ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--query-users", type=int, default=10)
+    parser.add_argument("--upload-users", type=int, default=1)
+    parser.add_argument("--review-users", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=3, help="Pages per generated PDF")
+    parser.add_argument(
+        "--flashcards", type=int, default=50, help="Flashcards created before the run"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=200.0, help="Fake OpenAI response latency"
+    )
+    parser.add_argument(
+        "--token-ms", type=float, default=2.0, help="Fake OpenAI time per generated token"
+    )
+    parser.add_argument("--rpm", type=int, default=None, help="Fake OpenAI requests per minute")
+    parser.add_argument("--tpm", type=int, default=None, help="Fake OpenAI tokens per minute")
+    parser.add_argument("--openai-port", type=int, default=8100)
+    parser.add_argument("--app-port", type=int, default=8101)
+    parser.add_argument(
+        "--timeout", type=float, default=120.0, help="Per-request and ingestion timeout"
+    )
+    parser.add_argument("--json", type=Path, default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    check_tokenizer()
+    fake_config = FakeOpenAIConfig(
+        latency_ms=args.latency_ms, token_ms=args.token_ms, rpm=args.rpm, tpm=args.tpm
+    )
+    fake_app = create_fake_openai(fake_config)
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as data_dir:
+        configure_environment(Path(data_dir), f"http://127.0.0.1:{args.openai_port}/v1")
+
+        import fake_graph
+        from app.main import app
+
+        fake_graph.install()
+        start_server(fake_app, args.openai_port)
+        backend, backend_thread = start_server(app, args.app_port)
+
+        report = asyncio.run(run(args, f"http://127.0.0.1:{args.app_port}"))
+        fake_stats = httpx.get(f"http://127.0.0.1:{args.openai_port}/stats").json()
+        # Stop the backend (and its shutdown hooks) before the data directory is removed
+        backend.should_exit = True
+        backend_thread.join(timeout=30)
+
+    report["fake_openai"] = fake_stats
+    print_report(report, fake_stats)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Synthetic lecture PDFs for the benchmarks.
+
+Deterministic, text-only scripts in German (plain Helvetica, no embedded
+fonts or images), generated on the fly so no binary fixtures are bundled.
+"""
+
+import random
+from pathlib import Path
+from typing import List
+
+TOPICS = [
+    "Gradientenabstieg", "Regularisierung", "Entscheidungsbaum", "Kreuzvalidierung",
+    "Normalverteilung", "Hypothesentest", "Eigenwertzerlegung", "Backpropagation",
+    "Clusteranalyse", "Zeitreihenanalyse",
+]
+SENTENCES = [
+    "{topic} ist ein grundlegendes Verfahren, das in der Vorlesung ausfuehrlich behandelt wird.",
+    "Die Definition von {topic} setzt Kenntnisse der linearen Algebra und der Statistik voraus.",
+    "Ein typisches Beispiel fuer {topic} findet sich in der Uebung zu Kapitel {chapter}.",
+    "In der Klausur wird {topic} haeufig mit einer Rechenaufgabe abgefragt.",
+    "Die Vor- und Nachteile von {topic} werden im Vergleich zu anderen Methoden diskutiert.",
+]
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """
+    Build a minimal text PDF.
+
+    Args:
+        pages: Lines of text per page (Latin-1)
+
+    Returns:
+        PDF file content
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        text = "".join(
+            "({}) Tj T*\n".format(
+                line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            )
+            for line in lines
+        )
+        stream = f"BT /F1 11 Tf 14 TL 50 780 Td\n{text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{kid} 0 R" for kid in kids).encode(), len(kids)
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    trailer = b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+    output += trailer % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+def lecture_pdf(seed: int, page_count: int) -> bytes:
+    """Generate a distinct lecture script with a few paragraphs per page."""
+    rng = random.Random(seed)
+    pages = []
+    for page in range(page_count):
+        lines = [f"Skript {seed} - Kapitel {page + 1}"]
+        for _ in range(40):
+            lines.append(
+                rng.choice(SENTENCES).format(topic=rng.choice(TOPICS), chapter=rng.randint(1, 12))
+            )
+        pages.append(lines)
+    return make_pdf(pages)
+
+
+def write_corpus(directory: Path, page_counts: List[int], copies: int = 1) -> List[Path]:
+    """
+    Write a set of lecture scripts.
+
+    Args:
+        directory: Target directory
+        page_counts: Page count of each script
+        copies: Scripts per page count (with different text)
+
+    Returns:
+        Paths of the written PDFs
+    """
+    paths = []
+    for page_count in page_counts:
+        for copy in range(copies):
+            path = directory / f"skript_{page_count}p_{copy}.pdf"
+            path.write_bytes(lecture_pdf(seed=page_count * 100 + copy, page_count=page_count))
+            paths.append(path)
+    return paths
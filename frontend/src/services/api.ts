@@ -9,18 +9,32 @@ const api = axios.create({
   },
 });
 
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost);
+// over plain HTTP on the LAN fall back to a v4-style ID from Math.random
+const newConversationId = (): string =>
+  typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function'
+    ? crypto.randomUUID()
+    : 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, (c) => {
+        const r = (Math.random() * 16) | 0;
+        return (c === 'x' ? r : (r & 0x3) | 0x8).toString(16);
+      });
+
+// One conversation per browser tab, so chat histories are not shared
+const conversationId = sessionStorage.getItem('conversationId') ?? newConversationId();
+sessionStorage.setItem('conversationId', conversationId);
+
 // RAG API
 export const ragAPI = {
   query: async (question: string) => {
-    const response = await api.post('/rag/query', { question });
+    const response = await api.post('/rag/query', { question, conversation_id: conversationId });
     return response.data;
   },
   clear: async () => {
-    const response = await api.post('/rag/clear');
+    const response = await api.post('/rag/clear', null, { params: { conversation_id: conversationId } });
     return response.data;
   },
   getStats: async () => {
-    const response = await api.get('/rag/stats');
+    const response = await api.get('/rag/stats', { params: { conversation_id: conversationId } });
     return response.data;
   },
 };
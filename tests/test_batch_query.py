@@ -0,0 +1,164 @@
+"""
+Tests for batch question answering.
+"""
+
+import asyncio
+import time
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.retrievers import BaseRetriever
+
+from app import config
+from app.services import llm_scheduler
+from app.services.llm_scheduler import PRIORITY_BACKGROUND
+from app.services.rag.conversation_store import ConversationStore
+from app.services.rag.rag_chain import RAGChain
+
+DELAY = 0.1
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+    monkeypatch.setattr(config, "_settings", None)
+
+
+class EchoChatModel(BaseChatModel):
+    """Answers with the last prompt line after a delay proportional to the question number."""
+
+    priorities: List[int] = []
+    cancelled: List[int] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        raise NotImplementedError
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        question = [
+            line for line in messages[-1].content.splitlines() if line.startswith("Frage:")
+        ][0]
+        number = int(question.split()[-1].rstrip("?"))
+        self.priorities.append(llm_scheduler._priority.get())
+        if number == 3:
+            raise RuntimeError("LLM nicht erreichbar")
+        try:
+            await asyncio.sleep(DELAY * (2 if number == 0 else 1))
+        except asyncio.CancelledError:
+            self.cancelled.append(number)
+            raise
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=f"Antwort {number}"))]
+        )
+
+
+class UnusedRetriever(BaseRetriever):
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        raise AssertionError("Batch questions must be retrieved together")
+
+
+class BatchVectorStore:
+    def __init__(self):
+        self.batches = []
+
+    def retrieve_many(self, queries):
+        self.batches.append(list(queries))
+        return [
+            [Document(page_content=query, metadata={"source_file": "klausur.pdf", "page": i})]
+            for i, query in enumerate(queries)
+        ]
+
+    def get_hybrid_retriever(self, **kwargs):
+        return UnusedRetriever()
+
+    get_retriever = get_hybrid_retriever
+
+
+def make_chain(tmp_path):
+    chain = RAGChain(BatchVectorStore(), ConversationStore(tmp_path / "conversations.db"))
+    chain._llm = EchoChatModel()
+    return chain
+
+
+def run_batch(tmp_path, questions, concurrency):
+    chain = make_chain(tmp_path)
+
+    async def collect():
+        return [result async for result in chain.abatch(questions, concurrency=concurrency)]
+
+    start = time.perf_counter()
+    results = asyncio.run(collect())
+    return chain, results, time.perf_counter() - start
+
+
+class TestBatchQuery:
+    """Test cases for RAGChain.abatch."""
+
+    def test_retrieval_runs_once_for_all_questions(self, tmp_path):
+        questions = [f"Was gilt in Fall {i}?" for i in range(6)]
+        chain, results, _ = run_batch(tmp_path, questions, concurrency=6)
+
+        assert chain.vector_store.batches == [questions]
+        assert sorted(result["index"] for result in results) == list(range(6))
+        answered = {result["index"]: result for result in results if "answer" in result}
+        assert answered[5]["answer"] == "Antwort 5"
+        assert answered[5]["sources"][0]["page"] == 6
+
+    def test_results_in_completion_order(self, tmp_path):
+        _, results, _ = run_batch(
+            tmp_path, [f"Was gilt in Fall {i}?" for i in range(4)], concurrency=4
+        )
+
+        # Question 3 fails immediately, question 0 is the slowest
+        assert results[0] == {
+            "index": 3,
+            "question": "Was gilt in Fall 3?",
+            "error": "LLM nicht erreichbar",
+        }
+        assert results[-1]["index"] == 0
+
+    def test_wall_time_bounded_by_concurrency(self, tmp_path):
+        questions = [f"Was gilt in Fall {i}?" for i in [*range(1, 3), *range(4, 10)]]
+        _, results, elapsed = run_batch(tmp_path, questions, concurrency=4)
+
+        assert len(results) == 8
+        # Two rounds of four concurrent calls instead of eight sequential ones
+        assert 2 * DELAY <= elapsed < 5 * DELAY
+
+    def test_answers_run_at_background_priority(self, tmp_path):
+        chain, _, _ = run_batch(
+            tmp_path, [f"Was gilt in Fall {i}?" for i in range(3)], concurrency=3
+        )
+
+        assert chain._llm.priorities == [PRIORITY_BACKGROUND] * 3
+
+    def test_pending_answers_cancelled_when_consumer_stops(self, tmp_path):
+        chain = make_chain(tmp_path)
+
+        async def first_result():
+            batch = chain.abatch(["Was gilt in Fall 0?", "Was gilt in Fall 1?"], concurrency=2)
+            result = await batch.__anext__()
+            await batch.aclose()
+            await asyncio.sleep(0)
+            # Checked before asyncio.run() cancels leftover tasks on its own
+            return result, list(chain._llm.cancelled)
+
+        result, cancelled = asyncio.run(first_result())
+
+        # Question 1 finishes first; the slower question 0 must not keep running
+        assert result["index"] == 1
+        assert cancelled == [0]
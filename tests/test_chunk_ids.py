@@ -0,0 +1,70 @@
+"""
+Tests for deterministic chunk IDs and the duplicate cleanup job.
+"""
+
+import chromadb
+from chromadb.config import Settings as ChromaSettings
+from langchain_core.documents import Document
+
+from app.cli.dedupe_chunks import find_duplicate_chunks
+from app.services.rag.document_processor import assign_chunk_ids, make_chunk_id
+
+
+def chunk(text, page, start_index):
+    return Document(page_content=text, metadata={"page": page, "start_index": start_index})
+
+
+class TestChunkIds:
+    """Test cases for deterministic chunk IDs."""
+
+    def test_ids_depend_on_document_file_and_position(self):
+        assert make_chunk_id("d1", "abc", 1, 0) == make_chunk_id("d1", "abc", 1, 0)
+        assert make_chunk_id("d1", "abc", 1, 0) != make_chunk_id("d1", "abc", 1, 800)
+        assert make_chunk_id("d1", "abc", 1, 0) != make_chunk_id("d1", "abd", 1, 0)
+
+    def test_identical_files_in_two_documents_do_not_collide(self):
+        first = [chunk("Einleitung", 0, 0)]
+        second = [chunk("Einleitung", 0, 0)]
+        assign_chunk_ids(first, "d1", "hash")
+        assign_chunk_ids(second, "d2", "hash")
+
+        assert first[0].id != second[0].id
+
+    def test_reingest_yields_same_ids(self):
+        first = [chunk("Einleitung", 0, 0), chunk("Vertragsschluss", 0, 800)]
+        second = [chunk("Einleitung", 0, 0), chunk("Vertragsschluss", 0, 800)]
+        assign_chunk_ids(first, "d1", "hash")
+        assign_chunk_ids(second, "d1", "hash")
+
+        assert [doc.id for doc in first] == [doc.id for doc in second]
+
+    def test_reserved_ids_are_not_reused(self):
+        kept = make_chunk_id("d1", "hash", 0, 0)
+        added = [chunk("Neuer Text", 0, 0)]
+        assign_chunk_ids(added, "d1", "hash", reserved={kept})
+
+        assert added[0].id != kept
+
+
+class TestDedupeChunks:
+    """Test cases for the duplicate cleanup job."""
+
+    def test_groups_copies_per_document_and_page(self, tmp_path):
+        client = chromadb.PersistentClient(
+            path=str(tmp_path / "chroma"), settings=ChromaSettings(anonymized_telemetry=False)
+        )
+        collection = client.create_collection("chunks")
+        collection.add(
+            ids=["a", "b", "c", "d", "e"],
+            embeddings=[[0.1, 0.2]] * 5,
+            documents=["Folie 1", "Folie 1", "Folie 1", "Folie 1", "Folie 2"],
+            metadatas=[
+                {"document_id": "d1", "page": 0},
+                {"document_id": "d1", "page": 0},
+                {"document_id": "d1", "page": 0},
+                {"document_id": "d1", "page": 3},
+                {"document_id": "d1", "page": 0},
+            ],
+        )
+
+        assert find_duplicate_chunks(collection, page_size=2) == {"a": ["b", "c"]}
@@ -0,0 +1,68 @@
+"""
+Tests for the per-conversation memory store.
+"""
+
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app import config
+from app.services.rag.conversation_store import ConversationStore
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+    monkeypatch.setattr(config, "_settings", None)
+
+
+def turn(question, answer):
+    return [HumanMessage(content=question), AIMessage(content=answer)]
+
+
+class TestConversationStore:
+    """Test cases for ConversationStore."""
+
+    def test_conversations_are_isolated(self, tmp_path):
+        store = ConversationStore(tmp_path / "conversations.db", max_active=10)
+        store.append("anna", turn("Was ist ein Vertrag?", "Eine Einigung."))
+        store.append("ben", turn("Was ist Besitz?", "Tatsächliche Sachherrschaft."))
+        store.append("anna", turn("Und Eigentum?", "Rechtliche Sachherrschaft."))
+
+        assert [m.content for m in store.get_messages("anna")] == [
+            "Was ist ein Vertrag?", "Eine Einigung.", "Und Eigentum?", "Rechtliche Sachherrschaft."
+        ]
+        assert len(store.get_messages("ben")) == 2
+        assert store.get_messages("carla") == []
+
+    def test_evicted_conversations_load_from_disk(self, tmp_path):
+        store = ConversationStore(tmp_path / "conversations.db", max_active=2)
+        for i in range(5):
+            store.append(f"c{i}", turn(f"Frage {i}", f"Antwort {i}"))
+
+        assert store.get_stats()["active_conversations"] == 2
+        assert store.get_stats()["stored_conversations"] == 5
+        assert [m.content for m in store.get_messages("c0")] == ["Frage 0", "Antwort 0"]
+        assert isinstance(store.get_messages("c0")[1], AIMessage)
+
+        reopened = ConversationStore(tmp_path / "conversations.db", max_active=2)
+        assert len(reopened.get_messages("c3")) == 2
+
+    def test_idle_conversations_expire(self, tmp_path):
+        store = ConversationStore(tmp_path / "conversations.db", ttl_seconds=0.05)
+        store.append("alt", turn("Frage", "Antwort"))
+        time.sleep(0.1)
+        store.append("neu", turn("Frage", "Antwort"))
+
+        assert store.get_messages("alt") == []
+        assert store.purge_expired() == 1
+        assert store.get_stats()["stored_conversations"] == 1
+
+    def test_clear(self, tmp_path):
+        store = ConversationStore(tmp_path / "conversations.db")
+        store.append("anna", turn("Frage", "Antwort"))
+        store.clear("anna")
+
+        assert store.get_messages("anna") == []
+        assert ConversationStore(tmp_path / "conversations.db").get_messages("anna") == []
@@ -0,0 +1,76 @@
+"""
+Tests for the SQLite document catalog.
+"""
+
+import pytest
+
+from app.services.document_catalog import DocumentCatalog
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+    return DocumentCatalog(db_path=tmp_path / "catalog.db")
+
+
+class TestDocumentCatalog:
+    """Test cases for DocumentCatalog."""
+
+    def test_ingestion_lifecycle(self, catalog):
+        catalog.add_document("doc-1", "skript.pdf", 1024, content_hash="abc", subject="Mathe")
+        assert catalog.get_document("doc-1")["status"] == "processing"
+
+        catalog.mark_processed("doc-1", chunk_count=42, page_count=7)
+        document = catalog.get_document("doc-1")
+
+        assert document["processed"] is True
+        assert document["chunk_count"] == 42
+        assert document["page_count"] == 7
+
+    def test_mark_failed_keeps_error(self, catalog):
+        catalog.add_document("doc-1", "skript.pdf", 1024)
+        catalog.mark_failed("doc-1", "boom")
+
+        document = catalog.get_document("doc-1")
+        assert document["status"] == "error"
+        assert document["error"] == "boom"
+
+    def test_pagination_and_subject_filter(self, catalog):
+        for i in range(5):
+            catalog.add_document(f"doc-{i}", f"{i}.pdf", 1, subject="A" if i % 2 else "B")
+
+        assert catalog.count_documents() == 5
+        assert catalog.count_documents(subject="A") == 2
+        assert len(catalog.list_documents(limit=2, offset=4)) == 1
+        assert {d["subject"] for d in catalog.list_documents(subject="B")} == {"B"}
+
+    def test_totals_and_delete(self, catalog):
+        catalog.add_document("doc-1", "a.pdf", 1)
+        catalog.add_document("doc-2", "b.pdf", 1)
+        catalog.mark_processed("doc-1", chunk_count=10)
+        catalog.mark_processed("doc-2", chunk_count=5)
+
+        assert catalog.get_totals() == {"documents": 2, "chunks": 15}
+        assert catalog.delete_document("doc-1") is True
+        assert catalog.get_totals() == {"documents": 1, "chunks": 5}
+
+    def test_aliases_and_content_hash_lookup(self, catalog):
+        catalog.add_document("doc-1", "skript.pdf", 1024, content_hash="abc")
+        catalog.add_alias("doc-1", "skript_kopie.pdf")
+
+        assert catalog.get_by_content_hash("abc")["id"] == "doc-1"
+        assert catalog.get_by_filename("skript_kopie.pdf")["id"] == "doc-1"
+        assert catalog.get_document("doc-1")["aliases"] == ["skript_kopie.pdf"]
+        assert catalog.list_documents()[0]["aliases"] == ["skript_kopie.pdf"]
+
+        catalog.mark_failed("doc-1", "boom")
+        assert catalog.get_by_content_hash("abc") is None
+
+    def test_own_document_replaces_alias(self, catalog):
+        catalog.add_document("doc-1", "skript.pdf", 1024, content_hash="abc")
+        catalog.add_alias("doc-1", "kopie.pdf")
+        catalog.add_document("doc-2", "kopie.pdf", 2048, content_hash="def")
+
+        assert catalog.get_document("doc-1")["aliases"] == []
+        assert catalog.delete_document("doc-2") is True
+        assert catalog.get_by_filename("kopie.pdf") is None
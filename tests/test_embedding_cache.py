@@ -0,0 +1,83 @@
+"""
+Tests for the persistent embedding cache.
+"""
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from app.services.rag.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    make_cache_key,
+)
+
+
+class CountingEmbeddings(Embeddings):
+    """Fake embeddings that record every text sent to the provider."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(tmp_path / "embeddings.db", max_entries=3)
+
+
+class TestCacheKey:
+    """Test cases for cache key construction."""
+
+    def test_whitespace_is_normalized(self):
+        assert make_cache_key("m", None, "a  b\n c ") == make_cache_key("m", None, "a b c")
+
+    def test_model_and_dimensions_are_part_of_key(self):
+        base = make_cache_key("m", None, "text")
+        assert make_cache_key("other", None, "text") != base
+        assert make_cache_key("m", 512, "text") != base
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache."""
+
+    def test_bulk_lookup_counts_hits_and_misses(self, cache):
+        cache.put_many({"a": [1.0, 2.0]})
+
+        found = cache.get_many(["a", "b"])
+
+        assert found == {"a": [1.0, 2.0]}
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_eviction_keeps_size_bounded(self, cache):
+        for i in range(5):
+            cache.put_many({f"k{i}": [float(i)]})
+
+        assert len(cache) == 3
+        assert cache.get_many(["k0"]) == {}
+
+    def test_persists_across_instances(self, tmp_path):
+        EmbeddingCache(tmp_path / "c.db").put_many({"a": [0.25]})
+
+        assert EmbeddingCache(tmp_path / "c.db").get_many(["a"]) == {"a": [0.25]}
+
+
+class TestCachedEmbeddings:
+    """Test cases for the CachedEmbeddings wrapper."""
+
+    def test_only_misses_reach_provider(self, tmp_path):
+        inner = CountingEmbeddings()
+        embeddings = CachedEmbeddings(inner, EmbeddingCache(tmp_path / "c.db"), model="m")
+
+        first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+        second = embeddings.embed_documents(["beta", "gamma"])
+
+        assert inner.calls == [["alpha", "beta"], ["gamma"]]
+        assert first[0] == first[2]
+        assert second[0] == first[1]
@@ -0,0 +1,86 @@
+"""
+Tests for the token-aware ingestion embedding engine.
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+from langchain_core.documents import Document
+
+from app.services.rag.embedding_engine import EmbeddingEngine
+
+
+class SlowEmbeddings:
+    """Fake embeddings with random latency so batches finish out of order."""
+
+    def embed_documents(self, texts):
+        time.sleep(random.uniform(0.0, 0.02))
+        return [[float(len(text))] for text in texts]
+
+
+class RecordingVectorStore:
+    """Fake vector store that records the order of stored chunks."""
+
+    def __init__(self):
+        self.embeddings = SlowEmbeddings()
+        self.stored = []
+
+    def add_embedded_documents(self, documents, embeddings):
+        self.stored.extend(doc.page_content for doc in documents)
+        return [doc.page_content for doc in documents]
+
+
+def make_engine(store=None, **kwargs):
+    return EmbeddingEngine(
+        store or RecordingVectorStore(),
+        token_counter=lambda text: len(text.split()),
+        **kwargs,
+    )
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+
+
+class TestPackBatches:
+    """Test cases for token-based batch packing."""
+
+    def test_batches_respect_token_limit(self):
+        engine = make_engine(max_tokens_per_batch=5, max_inputs_per_batch=100, max_concurrency=1)
+        docs = [Document(page_content=text) for text in ["a b c", "d e", "f", "g h i j"]]
+
+        batches = engine.pack_batches(docs)
+
+        assert [[d.page_content for d in batch] for batch in batches] == [
+            ["a b c", "d e"], ["f", "g h i j"]
+        ]
+
+    def test_oversized_chunk_gets_own_batch(self):
+        engine = make_engine(max_tokens_per_batch=2, max_inputs_per_batch=100, max_concurrency=1)
+        docs = [Document(page_content=text) for text in ["a", "b c d e", "f"]]
+
+        assert [len(batch) for batch in engine.pack_batches(docs)] == [1, 1, 1]
+
+    def test_batches_respect_input_limit(self):
+        engine = make_engine(max_tokens_per_batch=1000, max_inputs_per_batch=2, max_concurrency=1)
+        docs = [Document(page_content="x") for _ in range(5)]
+
+        assert [len(batch) for batch in engine.pack_batches(docs)] == [2, 2, 1]
+
+
+class TestAddDocuments:
+    """Test cases for concurrent embedding with ordered writes."""
+
+    def test_results_are_written_in_input_order(self):
+        store = RecordingVectorStore()
+        engine = make_engine(store, max_tokens_per_batch=2, max_inputs_per_batch=100,
+                             max_concurrency=4)
+        texts = [f"chunk {i}" for i in range(20)]
+
+        ids = asyncio.run(engine.add_documents([Document(page_content=t) for t in texts]))
+
+        assert store.stored == texts
+        assert ids == texts
@@ -0,0 +1,81 @@
+"""
+Tests for token-budgeted chat history compaction.
+"""
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.services.rag.conversation_store import ConversationStore
+from app.services.rag.history_compactor import SUMMARY_PREFIX, HistoryCompactor
+from app.services.rag.rag_chain import RAGChain
+
+
+def conversation(turns, length=20):
+    messages = []
+    for i in range(turns):
+        messages += [
+            HumanMessage(content=f"Frage {i} " + "x" * length),
+            AIMessage(content=f"Antwort {i} " + "y" * length),
+        ]
+    return messages
+
+
+def make_compactor(responses=("Zusammenfassung",), keep_turns=2, token_budget=1000):
+    return HistoryCompactor(
+        FakeListChatModel(responses=list(responses)),
+        keep_turns=keep_turns,
+        token_budget=token_budget,
+        model="gpt-4o-mini",
+    )
+
+
+class TestHistoryCompactor:
+    """Test cases for HistoryCompactor."""
+
+    def test_keeps_last_turns_verbatim(self):
+        compactor = make_compactor(keep_turns=2)
+        messages = conversation(5)
+
+        history = compactor.format_history("Vertragsrecht besprochen.", messages)
+
+        assert history.startswith(f"\n{SUMMARY_PREFIX}Vertragsrecht besprochen.")
+        assert "Frage 3" in history and "Antwort 4" in history
+        assert "Frage 2" not in history
+        assert compactor.messages_to_fold("", messages) == 6
+
+    def test_token_budget_limits_verbatim_turns(self):
+        compactor = make_compactor(keep_turns=4, token_budget=150)
+        messages = conversation(4)
+        # Each turn alone exceeds the budget
+        messages[-4].content += " Willenserklärung" * 40
+        messages[-2].content += " Willenserklärung" * 40
+
+        assert compactor.verbatim_count("", messages) == 2
+        assert "Frage 3" in compactor.format_history("", messages)
+
+    def test_short_history_is_unchanged(self):
+        compactor = make_compactor(keep_turns=4)
+        messages = conversation(2)
+
+        assert compactor.messages_to_fold("", messages) == 0
+        assert "Frage 0" in compactor.format_history("", messages)
+
+
+class TestConversationCompaction:
+    """Test cases for background compaction in RAGChain."""
+
+    def test_turns_folded_after_answer(self, tmp_path):
+        store = ConversationStore(tmp_path / "conversations.db")
+        store.append("c", conversation(4))
+        chain = RAGChain(vector_store=None, conversation_store=store)
+        chain._compactor = make_compactor(responses=["Es ging um Verträge."], keep_turns=2)
+
+        chain._save_turn("c", "Neue Frage", "Neue Antwort")
+        chain._summary_executor.submit(lambda: None).result()
+
+        summary, messages = store.get_history("c")
+        assert summary == "Es ging um Verträge."
+        assert [m.content for m in messages] == ["Frage 3 " + "x" * 20, "Antwort 3 " + "y" * 20,
+                                                 "Neue Frage", "Neue Antwort"]
+        assert "Es ging um Verträge." in chain._history_text("c")
+        assert "Frage 0" not in chain._history_text("c")
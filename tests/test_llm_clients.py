@@ -0,0 +1,53 @@
+"""
+Tests for the shared OpenAI client layer.
+"""
+
+import asyncio
+
+from app.services import llm_clients
+
+
+class TestSharedClients:
+    """Test cases for pooled OpenAI clients."""
+
+    def teardown_method(self):
+        asyncio.run(llm_clients.close_clients())
+
+    def test_clients_share_one_pool(self):
+        chat = llm_clients.create_chat_model(temperature=0.1)
+        other_chat = llm_clients.create_chat_model(temperature=0.3, max_tokens=100)
+        embeddings = llm_clients.create_embeddings()
+
+        assert chat.root_client._client is llm_clients.get_http_client()
+        assert other_chat.root_client._client is llm_clients.get_http_client()
+        assert chat.root_async_client._client is llm_clients.get_async_http_client()
+        assert embeddings.http_client is llm_clients.get_http_client()
+        assert llm_clients.get_async_openai_client()._client is llm_clients.get_async_http_client()
+
+    def test_pool_limits_from_settings(self, monkeypatch):
+        settings = llm_clients.get_settings()
+        monkeypatch.setattr(settings, "openai_max_connections", 7)
+        monkeypatch.setattr(settings, "openai_connect_timeout_seconds", 2.0)
+
+        client = llm_clients.get_http_client()
+
+        assert client._transport.transport._pool._max_connections == 7
+        assert client.timeout.connect == 2.0
+
+    def test_close_recreates_clients(self):
+        first = llm_clients.get_http_client()
+        asyncio.run(llm_clients.close_clients())
+
+        assert first.is_closed
+        assert llm_clients.get_http_client() is not first
+
+    def test_base_url_from_settings(self, monkeypatch):
+        settings = llm_clients.get_settings()
+        monkeypatch.setattr(settings, "openai_base_url", "http://127.0.0.1:8100/v1")
+
+        chat = llm_clients.create_chat_model()
+        embeddings = llm_clients.create_embeddings()
+
+        assert str(chat.root_client.base_url) == "http://127.0.0.1:8100/v1/"
+        assert embeddings.openai_api_base == "http://127.0.0.1:8100/v1"
+        assert str(llm_clients.get_async_openai_client().base_url) == "http://127.0.0.1:8100/v1/"
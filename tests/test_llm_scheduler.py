@@ -0,0 +1,255 @@
+"""
+Tests for the priority-aware LLM scheduler.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.services.llm_scheduler import (
+    AsyncScheduledTransport,
+    LLMScheduler,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    ScheduledTransport,
+    TokenBucket,
+    estimate_request,
+    llm_priority,
+    parse_duration,
+    retry_delay,
+)
+
+
+def make_scheduler(rpm=600, tpm=60000, reserve=0.2):
+    return LLMScheduler(
+        rpm=rpm, tpm=tpm, embedding_rpm=rpm, embedding_tpm=tpm, interactive_reserve=reserve
+    )
+
+
+def chat_request(content="Hallo", max_tokens=100):
+    body = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": content}],
+        "max_tokens": max_tokens,
+    }
+    return httpx.Request("POST", "https://api.openai.com/v1/chat/completions", json=body)
+
+
+class TestTokenBucket:
+    """Test cases for the token bucket."""
+
+    def test_wait_time_until_refilled(self):
+        bucket = TokenBucket(60)
+        bucket.take(60)
+
+        assert bucket.wait_time(1) == 1.0
+        bucket.refill(bucket.updated + 1.0)
+        assert bucket.wait_time(1) == 0.0
+
+    def test_reserve_is_kept(self):
+        bucket = TokenBucket(100)
+        bucket.take(70)
+
+        assert bucket.wait_time(10) == 0.0
+        assert bucket.wait_time(10, reserve=0.3) > 0.0
+
+    def test_oversized_request_fits_full_bucket(self):
+        bucket = TokenBucket(100)
+
+        assert bucket.wait_time(500, reserve=0.2) == 0.0
+
+
+class TestRetryDelay:
+    """Test cases for rate-limit header handling."""
+
+    def test_parse_duration(self):
+        assert parse_duration("6m0s") == 360.0
+        assert parse_duration("1s") == 1.0
+        assert parse_duration("20ms") == 0.02
+        assert parse_duration("") is None
+
+    def test_retry_after_headers(self):
+        assert 2.0 <= retry_delay(httpx.Headers({"retry-after": "2"}), 0) <= 2.2
+        assert 0.3 <= retry_delay(httpx.Headers({"retry-after-ms": "300"}), 0) <= 0.33
+
+    def test_reset_headers(self):
+        headers = httpx.Headers(
+            {"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "3s"}
+        )
+
+        assert 3.0 <= retry_delay(headers, 0) <= 3.3
+
+    def test_exponential_backoff_capped(self):
+        assert 2.0 <= retry_delay(httpx.Headers(), 2) <= 2.2
+        assert retry_delay(httpx.Headers(), 20, max_delay=5.0) == 5.0
+
+
+class TestLLMScheduler:
+    """Test cases for admission control."""
+
+    def test_estimate_request(self):
+        model, tokens = estimate_request(chat_request("x" * 400, max_tokens=50))
+        embed = httpx.Request(
+            "POST", "https://api.openai.com/v1/embeddings",
+            json={"model": "text-embedding-3-small", "input": ["x" * 400]},
+        )
+
+        assert model == "gpt-4o-mini"
+        assert 150 <= tokens <= 200
+        assert 100 <= estimate_request(embed)[1] <= 120
+
+    def test_throttles_at_request_limit(self):
+        scheduler = make_scheduler(rpm=600)  # 10 requests per second
+        bucket = scheduler._buckets_for("gpt-4o-mini")[0]
+        bucket.level = 1
+
+        start = time.monotonic()
+        for _ in range(3):
+            scheduler.release(scheduler.acquire("gpt-4o-mini", 10))
+        elapsed = time.monotonic() - start
+
+        assert 0.15 <= elapsed < 1.0
+        assert scheduler.get_stats()["interactive"]["requests"] == 3
+
+    def test_background_leaves_reserve(self):
+        scheduler = make_scheduler(rpm=600, reserve=0.5)
+        scheduler._buckets_for("gpt-4o-mini")[0].level = 300
+
+        assert scheduler._try_acquire("gpt-4o-mini", 10, PRIORITY_BACKGROUND) > 0
+        assert scheduler._try_acquire("gpt-4o-mini", 10, PRIORITY_INTERACTIVE) == 0
+
+    def test_interactive_served_before_background(self):
+        scheduler = make_scheduler(rpm=600, reserve=0.0)
+        scheduler._buckets_for("gpt-4o-mini")[0].level = 0
+        order = []
+
+        def call(name, priority):
+            with llm_priority(priority):
+                scheduler.release(scheduler.acquire("gpt-4o-mini", 10))
+            order.append(name)
+
+        background = threading.Thread(target=call, args=("background", PRIORITY_BACKGROUND))
+        background.start()
+        time.sleep(0.02)
+        interactive = [
+            threading.Thread(target=call, args=(f"interactive-{i}", PRIORITY_INTERACTIVE))
+            for i in range(2)
+        ]
+        for thread in interactive:
+            thread.start()
+        for thread in [background, *interactive]:
+            thread.join(timeout=5)
+
+        assert order[-1] == "background"
+
+    def test_mixed_sync_and_async_callers(self):
+        scheduler = make_scheduler(rpm=600, reserve=0.0)  # 10 requests per second
+        scheduler._buckets_for("gpt-4o-mini")[0].level = 0
+        ticks = []
+
+        def sync_call():
+            scheduler.release(scheduler.acquire("gpt-4o-mini", 10))
+            return threading.current_thread()
+
+        async def async_call():
+            scheduler.release(await scheduler.aacquire("gpt-4o-mini", 10))
+
+        async def ticker():
+            for _ in range(10):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        async def main():
+            with pytest.raises(RuntimeError):
+                scheduler.acquire("gpt-4o-mini", 10)
+            interactive = [asyncio.ensure_future(async_call()) for _ in range(2)]
+            with llm_priority(PRIORITY_BACKGROUND):
+                background = asyncio.ensure_future(asyncio.to_thread(sync_call))
+            results = await asyncio.wait_for(
+                asyncio.gather(background, *interactive, ticker()), timeout=5
+            )
+            return results[0]
+
+        worker = asyncio.run(main())
+
+        assert worker is not threading.main_thread()
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+        stats = scheduler.get_stats()
+        # The sync caller inherits the background priority through to_thread
+        assert (stats["background"]["requests"], stats["interactive"]["requests"]) == (1, 2)
+        assert stats["background"]["queue_depth"] == stats["interactive"]["queue_depth"] == 0
+
+    def test_observe_syncs_buckets(self):
+        scheduler = make_scheduler(tpm=60000)
+        response = httpx.Response(
+            429,
+            headers={"x-ratelimit-remaining-tokens": "100", "x-ratelimit-remaining-requests": "5"},
+        )
+
+        scheduler.observe("gpt-4o-mini", response)
+
+        stats = scheduler.get_stats()
+        assert stats["rate_limited_responses"] == 1
+        assert stats["buckets"]["gpt-4o-mini"]["tokens_available"] == 100
+        assert stats["buckets"]["gpt-4o-mini"]["requests_available"] == 5
+
+
+class TestScheduledTransport:
+    """Test cases for the scheduling HTTP transports."""
+
+    def test_retries_rate_limited_request(self):
+        calls = []
+
+        def handler(request):
+            calls.append(json.loads(request.content)["model"])
+            if len(calls) == 1:
+                return httpx.Response(
+                    429, headers={"retry-after-ms": "10"}, json={"error": "rate limit"}
+                )
+            return httpx.Response(200, json={"ok": True})
+
+        scheduler = make_scheduler()
+        transport = ScheduledTransport(
+            httpx.MockTransport(handler), scheduler, max_retries=2, max_delay=1.0
+        )
+
+        with httpx.Client(transport=transport) as client:
+            response = client.send(chat_request())
+
+        assert response.status_code == 200
+        assert calls == ["gpt-4o-mini", "gpt-4o-mini"]
+        assert scheduler.get_stats()["retries"] == 1
+        assert scheduler.get_stats()["interactive"]["in_flight"] == 0
+
+    def test_gives_up_after_max_retries(self):
+        transport = ScheduledTransport(
+            httpx.MockTransport(
+                lambda request: httpx.Response(503, headers={"retry-after-ms": "1"})
+            ),
+            make_scheduler(),
+            max_retries=1,
+            max_delay=1.0,
+        )
+
+        with httpx.Client(transport=transport) as client:
+            assert client.send(chat_request()).status_code == 503
+
+    def test_async_transport_uses_context_priority(self):
+        scheduler = make_scheduler()
+        transport = AsyncScheduledTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200, json={})),
+            scheduler, max_retries=0, max_delay=1.0,
+        )
+
+        async def send():
+            async with httpx.AsyncClient(transport=transport) as client:
+                with llm_priority(PRIORITY_BACKGROUND):
+                    return await client.send(chat_request())
+
+        assert asyncio.run(send()).status_code == 200
+        assert scheduler.get_stats()["background"]["requests"] == 1
+        assert scheduler.get_stats()["interactive"]["requests"] == 0
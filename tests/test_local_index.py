@@ -0,0 +1,159 @@
+"""
+Tests for the memory-mapped local vector index.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.rag.local_index import LocalVectorIndex
+from app.services.rag.quantization import QuantizedCodes
+
+
+def random_vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+class TestLocalVectorIndex:
+    """Test cases for LocalVectorIndex."""
+
+    def make_index(self, tmp_path, n=50, **kwargs):
+        index = LocalVectorIndex(tmp_path / "index", initial_capacity=8, **kwargs)
+        vectors = random_vectors(n)
+        index.add(
+            [f"c{i}" for i in range(n)],
+            vectors,
+            [{"source_file": "a.pdf" if i % 2 else "b.pdf", "page": i} for i in range(n)],
+            [f"text {i}" for i in range(n)],
+        )
+        return index, vectors
+
+    def test_exact_top_k(self, tmp_path):
+        index, vectors = self.make_index(tmp_path)
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        query = vectors[7]
+
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        results = index.search(query, k=5)
+
+        assert [chunk_id for chunk_id, _, _ in results] == [f"c{i}" for i in expected]
+        assert results[0][1].page_content == "text 7"
+        assert results[0][2] == pytest.approx(0.0, abs=1e-5)
+
+    def test_metadata_filter(self, tmp_path):
+        index, vectors = self.make_index(tmp_path)
+
+        results = index.search(vectors[0], k=10, where={"source_file": "a.pdf"})
+        assert len(results) == 10
+        assert all(doc.metadata["source_file"] == "a.pdf" for _, doc, _ in results)
+
+        results = index.search(
+            vectors[0], k=10, where={"$and": [{"source_file": "b.pdf"}, {"page": {"$in": [0, 2]}}]}
+        )
+        assert {chunk_id for chunk_id, _, _ in results} == {"c0", "c2"}
+
+    def test_texts_and_metadata_read_from_side_table(self, tmp_path):
+        index, vectors = self.make_index(tmp_path)
+
+        assert not hasattr(index, "_metadatas") and not hasattr(index, "_documents")
+        reloaded = LocalVectorIndex(tmp_path / "index")
+        _, document, _ = reloaded.search(vectors[8], k=1, where={"page": {"$in": [8, 9]}})[0]
+        assert document.page_content == "text 8"
+        assert document.metadata == {"source_file": "b.pdf", "page": 8}
+
+    def test_delete_upsert_and_reload(self, tmp_path):
+        index, vectors = self.make_index(tmp_path)
+        index.delete(["c7"])
+        index.add(["c3"], [vectors[9]], [{"page": 3}], ["replaced"])
+
+        reloaded = LocalVectorIndex(tmp_path / "index")
+        assert len(reloaded) == 49
+        assert "c7" not in [chunk_id for chunk_id, _, _ in reloaded.search(vectors[7], k=49)]
+        top = [chunk_id for chunk_id, _, _ in reloaded.search(vectors[9], k=2)]
+        assert set(top) == {"c3", "c9"}
+
+    def test_compaction_drops_tombstones(self, tmp_path):
+        index, vectors = self.make_index(tmp_path, compact_ratio=0.2)
+        index.delete([f"c{i}" for i in range(0, 20, 2)])
+        assert len(index._ids) == 50
+
+        index.delete(["c1", "c3"])
+
+        assert len(index._ids) == len(index) == 38
+        assert index.search(vectors[5], k=1)[0][0] == "c5"
+        assert index.search(vectors[5], k=1)[0][1].metadata == {"source_file": "a.pdf", "page": 5}
+        reloaded = LocalVectorIndex(tmp_path / "index")
+        assert len(reloaded._ids) == 38
+        assert reloaded.search(vectors[49], k=1)[0][1].page_content == "text 49"
+
+    def test_search_scores_outside_lock(self, tmp_path, monkeypatch):
+        index, vectors = self.make_index(tmp_path)
+        original = LocalVectorIndex._top_k
+        owned = []
+
+        def top_k(self, *args, **kwargs):
+            owned.append(self._lock._is_owned())
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(LocalVectorIndex, "_top_k", top_k)
+        index.search(vectors[0], k=3)
+
+        assert owned == [False]
+
+    def test_float16_storage(self, tmp_path):
+        index, vectors = self.make_index(tmp_path, dtype="float16")
+
+        assert index.search(vectors[11], k=1)[0][0] == "c11"
+        assert index.vectors_path.stat().st_size == index.capacity * 16 * 2
+
+
+class TestQuantizedIndex:
+    """Test cases for quantized first-pass search with full-precision rerank."""
+
+    @pytest.mark.parametrize("quantization", ["int8", "binary"])
+    def test_rerank_returns_exact_top_hit(self, tmp_path, quantization):
+        index = LocalVectorIndex(
+            tmp_path / "index", quantization=quantization, rerank_candidates=20
+        )
+        vectors = random_vectors(300, dim=64)
+        index.add([f"c{i}" for i in range(300)], vectors, [{}] * 300, [""] * 300)
+
+        hits = index.search(vectors[42], k=3)
+
+        assert hits[0][0] == "c42"
+        assert hits[0][2] == pytest.approx(0.0, abs=1e-5)
+
+    def test_calibration_reaches_recall_target(self, tmp_path):
+        index = LocalVectorIndex(tmp_path / "index", quantization="binary", rerank_candidates=1)
+        vectors = random_vectors(500, dim=64)
+        index.add([f"c{i}" for i in range(500)], vectors, [{}] * 500, [""] * 500)
+
+        report = index.calibrate(k=10, recall_target=0.9, sample_size=20)
+
+        assert report["recall"] >= 0.9
+        assert report["quantized_bytes"] == index._codes.nbytes
+        expected = 1 - index._codes.nbytes / (500 * 256)
+        assert report["memory_saved_ratio"] == pytest.approx(expected, abs=1e-4)
+        assert index.rerank_candidates == report["rerank_candidates"]
+
+    def test_saving_counts_vectors_held_elsewhere(self, tmp_path):
+        index = LocalVectorIndex(tmp_path / "index", quantization="int8", initial_capacity=100)
+        vectors = random_vectors(100, dim=64)
+        index.add([f"c{i}" for i in range(100)], vectors, [{}] * 100, [""] * 100)
+
+        report = index.calibrate(k=5, sample_size=10, shadow_bytes_per_vector=256)
+
+        assert report["shadow_bytes"] == 100 * 256
+        assert report["memory_saved_ratio"] == pytest.approx(1 - (68 + 256) / (256 + 256), abs=1e-4)
+
+    def test_codes_require_concrete_scheme(self):
+        with pytest.raises(TypeError):
+            QuantizedCodes(16)
+
+    def test_codes_rebuilt_on_reload(self, tmp_path):
+        index = LocalVectorIndex(tmp_path / "index", quantization="int8", rerank_candidates=5)
+        vectors = random_vectors(100)
+        index.add([f"c{i}" for i in range(100)], vectors, [{}] * 100, [""] * 100)
+
+        reloaded = LocalVectorIndex(tmp_path / "index", quantization="int8", rerank_candidates=5)
+
+        assert reloaded.search(vectors[17], k=1)[0][0] == "c17"
@@ -0,0 +1,105 @@
+"""
+Tests for Prometheus metrics.
+"""
+
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.services.metrics import (
+    connect_sqlite,
+    openai_event_hooks,
+    timed,
+)
+from app.services.progress_tracker import ProgressTracker
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def external_count(service, operation):
+    return sample(
+        "studyrag_external_call_duration_seconds_count", service=service, operation=operation
+    )
+
+
+class TestExternalCallMetrics:
+    """Test cases for external call latency histograms."""
+
+    def test_sqlite_statements_timed_per_database(self, tmp_path):
+        before = external_count("sqlite", "metrics_test.insert")
+        conn = connect_sqlite(tmp_path / "metrics_test.db", timeout=30)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO t VALUES (1)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(2,), (3,)])
+        conn.commit()
+
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 3
+        conn.close()
+        assert external_count("sqlite", "metrics_test.insert") == before + 2
+        assert external_count("sqlite", "metrics_test.select") >= 1
+        assert external_count("sqlite", "metrics_test.commit") >= 1
+
+    def test_timed_decorator_sync_and_async(self):
+        @timed("neo4j", "metrics_test_sync")
+        def sync_call():
+            return 1
+
+        @timed("neo4j", "metrics_test_async")
+        async def async_call():
+            await asyncio.sleep(0.01)
+            return 2
+
+        assert sync_call() == 1
+        assert asyncio.run(async_call()) == 2
+        assert external_count("neo4j", "metrics_test_sync") == 1
+        assert external_count("neo4j", "metrics_test_async") == 1
+        assert (
+            sample(
+                "studyrag_external_call_duration_seconds_sum",
+                service="neo4j",
+                operation="metrics_test_async",
+            )
+            >= 0.01
+        )
+
+    def test_openai_requests_labelled_by_endpoint(self):
+        before = external_count("openai", "embeddings")
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+        with httpx.Client(transport=transport, event_hooks=openai_event_hooks()) as client:
+            client.post("https://api.openai.com/v1/embeddings", json={"input": "x"})
+
+        assert external_count("openai", "embeddings") == before + 1
+
+
+class TestGaugesAndEndpoint:
+    """Test cases for gauges and the /metrics endpoint."""
+
+    def test_progress_subscribers_gauge(self):
+        tracker = ProgressTracker()
+        before = sample("studyrag_sse_subscribers", stream="progress")
+
+        queue = asyncio.run(tracker.subscribe("doc-1"))
+        assert sample("studyrag_sse_subscribers", stream="progress") == before + 1
+
+        tracker.unsubscribe("doc-1", queue)
+        tracker.unsubscribe("doc-1", queue)
+        assert sample("studyrag_sse_subscribers", stream="progress") == before
+
+    def test_metrics_endpoint_reports_route_templates(self):
+        from app.main import app
+
+        client = TestClient(app)
+        assert client.get("/api/progress/status/abc").status_code == 200
+
+        body = client.get("/metrics").text
+        assert (
+            'studyrag_http_request_duration_seconds_count{method="GET",'
+            'route="/api/progress/status/{document_id}",status="200"}'
+        ) in body
+        assert "studyrag_ingestion_stage_duration_seconds" in body
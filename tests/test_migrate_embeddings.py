@@ -0,0 +1,121 @@
+"""
+Tests for embedding-space metadata and the dimension migration tool.
+"""
+
+import json
+
+import chromadb
+import numpy as np
+import pytest
+from chromadb.config import Settings as ChromaSettings
+
+from app import config
+from app.cli.migrate_embeddings import migrate_collection, reproject
+from app.services.shared_chroma import EmbeddingMismatchError, verify_embedding_metadata
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+    monkeypatch.setattr(config, "_settings", None)
+
+
+@pytest.fixture
+def client(tmp_path):
+    return chromadb.PersistentClient(
+        path=str(tmp_path / "chroma"), settings=ChromaSettings(anonymized_telemetry=False)
+    )
+
+
+def fill_source(client, n=25, dim=8, model="text-embedding-3-small"):
+    source = client.create_collection("source", metadata={"embedding_model": model})
+    vectors = np.random.default_rng(0).normal(size=(n, dim))
+    source.add(
+        ids=[f"c{i}" for i in range(n)],
+        embeddings=vectors.tolist(),
+        metadatas=[{"page": i} for i in range(n)],
+        documents=[f"text {i}" for i in range(n)],
+    )
+    return vectors
+
+
+class TestEmbeddingMetadata:
+    """Test cases for collection embedding metadata."""
+
+    def test_legacy_collection_is_stamped_or_rejected(self, client):
+        fill_source(client)
+        collection = client.get_collection("source")
+
+        with pytest.raises(EmbeddingMismatchError):
+            verify_embedding_metadata(
+                collection, {"embedding_model": "m", "embedding_dimensions": 4}
+            )
+
+        verify_embedding_metadata(collection, {"embedding_model": "m", "embedding_dimensions": 8})
+        assert client.get_collection("source").metadata["embedding_dimensions"] == 8
+
+        with pytest.raises(EmbeddingMismatchError):
+            verify_embedding_metadata(
+                collection, {"embedding_model": "m", "embedding_dimensions": 4}
+            )
+
+
+class TestMigrateCollection:
+    """Test cases for migrate_collection."""
+
+    def test_reproject_is_normalized_prefix(self):
+        vectors = reproject([[3.0, 4.0, 12.0]], 2)
+
+        assert vectors[0] == pytest.approx([0.6, 0.8])
+
+    def test_migration_resumes_without_duplicates(self, client, tmp_path):
+        vectors = fill_source(client)
+        checkpoint = tmp_path / "checkpoint.json"
+        seen = []
+
+        written = migrate_collection(
+            client, "source", "target", 4, batch_size=10,
+            checkpoint_path=checkpoint, progress=lambda done, total: seen.append(done),
+        )
+
+        assert written == 25
+        assert seen == [10, 20, 25]
+        target = client.get_collection("target")
+        assert target.metadata["embedding_dimensions"] == 4
+        stored = target.get(ids=["c3"], include=["embeddings", "metadatas"])
+        assert stored["metadatas"][0] == {"page": 3}
+        assert np.allclose(stored["embeddings"][0], reproject([vectors[3]], 4)[0], atol=1e-6)
+
+        # Simulate an interruption after the first batch: the second batch is already written
+        checkpoint.write_text(json.dumps({"source": "source", "target": "target", "offset": 10}))
+        assert migrate_collection(
+            client, "source", "target", 4, batch_size=10, checkpoint_path=checkpoint
+        ) == 0
+        assert target.count() == 25
+
+    def test_reproject_keeps_source_model(self, client):
+        fill_source(client, model="text-embedding-3-large")
+
+        migrate_collection(client, "source", "target", 4)
+
+        assert client.get_collection("target").metadata["embedding_model"] == (
+            "text-embedding-3-large"
+        )
+
+    @pytest.mark.parametrize("model", ["text-embedding-ada-002", None])
+    def test_reproject_requires_matryoshka_source(self, client, model):
+        if model:
+            fill_source(client, model=model)
+        else:
+            client.create_collection("source")
+
+        with pytest.raises(EmbeddingMismatchError, match="reembed"):
+            migrate_collection(client, "source", "target", 4)
+        assert "target" not in [collection.name for collection in client.list_collections()]
+
+    def test_rejects_target_with_other_dimensions(self, client):
+        fill_source(client)
+        migrate_collection(client, "source", "target", 4)
+
+        with pytest.raises(EmbeddingMismatchError):
+            migrate_collection(client, "source", "target", 6)
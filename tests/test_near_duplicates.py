@@ -0,0 +1,151 @@
+"""
+Tests for MinHash near-duplicate detection.
+"""
+
+from langchain_core.documents import Document
+
+from app.services import document_pipeline
+from app.services.document_pipeline import DocumentPipeline
+from app.services.rag.near_duplicates import (
+    MinHasher,
+    NearDuplicateIndex,
+    choose_bands,
+    collapse_duplicate_hits,
+    collapse_near_duplicates,
+)
+
+TEMPLATE = (
+    "Vorlesung Grundlagen des Vertragsrechts, Wintersemester 2024/25. "
+    "Alle Rechte vorbehalten. Weitergabe nur mit Zustimmung des Lehrstuhls. "
+    "Agenda: Einführung, Vertragsschluss, Stellvertretung, Leistungsstörungen."
+)
+
+
+def chunk(text, page):
+    return Document(page_content=text, metadata={"source_file": "a.pdf", "page": page})
+
+
+class TestMinHash:
+    """Test cases for MinHash signatures and LSH banding."""
+
+    def test_similar_texts_have_similar_signatures(self):
+        hasher = MinHasher()
+        first = hasher.signature(TEMPLATE)
+        near = hasher.signature(TEMPLATE.replace("2024/25", "2025/26"))
+        other = hasher.signature(
+            "Die Stellvertretung setzt eine eigene Willenserklärung des Vertreters voraus."
+        )
+
+        assert MinHasher.similarity(first, near) > 0.5
+        assert MinHasher.similarity(first, other) < 0.2
+
+    def test_band_choice_matches_threshold(self):
+        bands, rows = choose_bands(128, 0.85)
+
+        assert bands * rows == 128
+        assert abs((1 / bands) ** (1 / rows) - 0.85) < 0.1
+
+
+class TestCollapse:
+    """Test cases for collapsing near-duplicates within a document."""
+
+    def test_collapses_into_first_occurrence(self):
+        chunks = [
+            chunk(TEMPLATE, 0),
+            chunk("Der Vertrag kommt durch Angebot und Annahme zustande.", 0),
+            chunk(TEMPLATE + " Folie 2", 1),
+            chunk(TEMPLATE, 4),
+        ]
+
+        kept = collapse_near_duplicates(chunks, threshold=0.8)
+
+        assert len(kept) == 2
+        assert kept[0].metadata["source_pages"] == "1,2,5"
+        assert kept[0].metadata["duplicate_count"] == 2
+        assert "source_pages" not in kept[1].metadata
+
+
+class TestNearDuplicateIndex:
+    """Test cases for the persisted cross-document index."""
+
+    def test_finds_duplicates_of_other_documents_only(self, tmp_path):
+        index = NearDuplicateIndex(tmp_path / "signatures.db")
+        signature = index.hasher.signature(TEMPLATE)
+        index.add(["chunk-1"], "doc-a", [signature])
+
+        assert index.find(signature) == "chunk-1"
+        assert index.find(signature, exclude_document="doc-a") is None
+
+        index.remove_chunks(["chunk-1"])
+        assert index.find(signature) is None
+
+
+class StubCollection:
+    """Chroma collection stand-in serving stored metadata by ID."""
+
+    def __init__(self, metadatas):
+        self.metadatas = metadatas
+
+    def get(self, ids, include):
+        found = [chunk_id for chunk_id in ids if chunk_id in self.metadatas]
+        return {"ids": found, "metadatas": [self.metadatas[chunk_id] for chunk_id in found]}
+
+
+class StubVectorStore:
+    def __init__(self, metadatas):
+        self.vectorstore = type("Chroma", (), {"_collection": StubCollection(metadatas)})()
+
+
+class TestCollectionDuplicates:
+    """Test cases for marking and collapsing near-duplicates across documents."""
+
+    def test_duplicates_are_marked_and_kept(self, tmp_path, monkeypatch):
+        index = NearDuplicateIndex(tmp_path / "signatures.db")
+        index.add(["a-1"], "doc-a", [index.hasher.signature(TEMPLATE)])
+        monkeypatch.setattr(document_pipeline, "get_near_duplicate_index", lambda: index)
+        store = StubVectorStore({"a-1": {"source_file": "a.pdf"}})
+        chunks = [
+            chunk(TEMPLATE, 0),
+            chunk("Der Vertrag kommt durch Angebot und Annahme zustande.", 1),
+        ]
+
+        for _ in range(2):
+            signatures = DocumentPipeline._mark_collection_duplicates(chunks, "doc-b", store)
+
+        assert len(signatures) == 2
+        assert chunks[0].metadata["duplicate_of"] == "a-1"
+        assert "duplicate_of" not in chunks[1].metadata
+        assert store.vectorstore._collection.metadatas["a-1"] == {"source_file": "a.pdf"}
+
+    def test_duplicate_of_a_duplicate_joins_its_group(self, tmp_path, monkeypatch):
+        index = NearDuplicateIndex(tmp_path / "signatures.db")
+        index.add(["b-1"], "doc-b", [index.hasher.signature(TEMPLATE)])
+        monkeypatch.setattr(document_pipeline, "get_near_duplicate_index", lambda: index)
+        store = StubVectorStore({"b-1": {"duplicate_of": "a-1"}})
+        chunks = [chunk(TEMPLATE, 2)]
+
+        DocumentPipeline._mark_collection_duplicates(chunks, "doc-c", store)
+
+        assert chunks[0].metadata["duplicate_of"] == "a-1"
+
+    def test_hits_collapse_into_best_ranked_copy(self):
+        copy = {"source_file": "b.pdf", "page": 2, "duplicate_of": "a-1"}
+        hits = [
+            Document(id="b-1", page_content=TEMPLATE, metadata=copy),
+            Document(id="x-1", page_content="Stellvertretung", metadata={"source_file": "x.pdf"}),
+            Document(id="a-1", page_content=TEMPLATE, metadata={"source_file": "a.pdf", "page": 0}),
+        ]
+
+        kept = collapse_duplicate_hits(hits)
+
+        assert [doc.id for doc in kept] == ["b-1", "x-1"]
+        assert kept[0].metadata["duplicate_sources"] == "a.pdf:1"
+        assert "duplicate_sources" not in hits[0].metadata
+
+    def test_copies_stay_grouped_after_first_chunk_is_deleted(self):
+        hits = [
+            Document(id=f"{name}-1", page_content=TEMPLATE, metadata={"duplicate_of": "a-1"})
+            for name in ("b", "c")
+        ]
+
+        assert [doc.id for doc in collapse_duplicate_hits(hits)] == ["b-1"]
@@ -0,0 +1,145 @@
+"""
+Tests for parallel PDF text extraction.
+"""
+
+import asyncio
+
+import pytest
+from langchain_community.document_loaders import PyPDFLoader
+
+from app.services.rag.document_processor import DocumentProcessor
+from app.services.rag.pdf_parsing import (
+    PDF_EXTRACTORS,
+    PdfParser,
+    extract_pages,
+    page_ranges,
+    resolve_extractor,
+    shutdown_pdf_parser,
+)
+
+
+def write_pdf(path, page_texts):
+    """Write a minimal PDF with one line of text per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 50 780 Td ({text}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{kid} 0 R" for kid in kids).encode(), len(kids)
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    trailer = b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+    output += trailer % (len(objects) + 1, xref)
+    path.write_bytes(bytes(output))
+    return path
+
+
+@pytest.fixture
+def lecture(tmp_path):
+    return write_pdf(tmp_path / "skript.pdf", [f"Kapitel {i} Vertragsrecht" for i in range(7)])
+
+
+class TestPageRanges:
+    """Test cases for splitting PDFs into page ranges."""
+
+    def test_ranges_cover_all_pages(self):
+        assert page_ranges(0, 7, 3) == [(0, 3), (3, 6), (6, 7)]
+
+    def test_ranges_after_first_task(self):
+        assert page_ranges(3, 7, 3) == [(3, 6), (6, 7)]
+        assert page_ranges(3, 2, 3) == []
+
+
+class TestExtractors:
+    """Test cases for the pluggable text extractors."""
+
+    @pytest.mark.parametrize("name", list(PDF_EXTRACTORS))
+    def test_extractors_agree_with_pypdf(self, lecture, name):
+        if not PDF_EXTRACTORS[name].is_available():
+            pytest.skip(f"{PDF_EXTRACTORS[name].module} not installed")
+
+        total, texts = extract_pages(name, str(lecture), 2, 5)
+        _, expected = extract_pages("pypdf", str(lecture), 2, 5)
+
+        assert total == 7
+        assert [text.strip() for text in texts] == expected
+
+    def test_unknown_extractor_is_rejected(self):
+        with pytest.raises(ValueError):
+            resolve_extractor("pdfminer")
+
+    def test_missing_library_falls_back_to_pypdf(self, monkeypatch):
+        monkeypatch.setattr(PDF_EXTRACTORS["pdfium"], "module", "pypdfium2_not_installed")
+
+        assert resolve_extractor("pdfium") == "pypdf"
+
+
+class TestPdfParser:
+    """Test cases for the PDF parsing pool."""
+
+    def test_matches_pypdf_loader(self, lecture):
+        parser = PdfParser(workers=2, pages_per_task=2)
+        try:
+            documents = parser.parse(lecture)
+        finally:
+            parser.shutdown()
+
+        expected = PyPDFLoader(str(lecture)).load()
+        assert [doc.page_content for doc in documents] == [doc.page_content for doc in expected]
+        assert [doc.metadata for doc in documents] == [doc.metadata for doc in expected]
+
+    def test_async_parse_in_thread_mode(self, lecture):
+        parser = PdfParser(workers=0, pages_per_task=3)
+        try:
+            documents = asyncio.run(parser.aparse(lecture))
+        finally:
+            parser.shutdown()
+
+        assert [doc.metadata["page"] for doc in documents] == list(range(7))
+        assert "Kapitel 6" in documents[6].page_content
+
+    def test_parse_many_reports_broken_files(self, lecture, tmp_path):
+        broken = tmp_path / "kaputt.pdf"
+        broken.write_bytes(b"%PDF-1.4\nkein PDF")
+        parser = PdfParser(workers=0, pages_per_task=4)
+        try:
+            good, bad = parser.parse_many([lecture, broken])
+            with pytest.raises(Exception):
+                parser.parse(broken)
+        finally:
+            parser.shutdown()
+
+        assert len(good) == 7
+        assert isinstance(bad, Exception)
+
+
+class TestDocumentProcessor:
+    """Test cases for document loading through the parsing pool."""
+
+    def test_aprocess_pdf_enriches_chunks(self, lecture):
+        try:
+            chunks = asyncio.run(DocumentProcessor().aprocess_pdf(lecture))
+        finally:
+            shutdown_pdf_parser()
+
+        assert chunks
+        assert all(chunk.metadata["source_file"] == "skript.pdf" for chunk in chunks)
+        assert {chunk.metadata["page"] for chunk in chunks} == set(range(7))
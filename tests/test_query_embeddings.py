@@ -0,0 +1,119 @@
+"""
+Tests for the query embedding cache and micro-batcher.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.rag.query_embeddings import (
+    QueryCachedEmbeddings,
+    QueryEmbeddingBatcher,
+    QueryEmbeddingCache,
+)
+
+
+class TestQueryEmbeddingCache:
+    """Test cases for the LRU/TTL cache."""
+
+    def test_lru_eviction(self):
+        cache = QueryEmbeddingCache(max_size=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+        cache.put("c", [3.0])
+
+        assert cache.get("a") == [1.0]
+        assert cache.get("b") is None
+
+    def test_ttl_expiry(self):
+        cache = QueryEmbeddingCache(ttl_seconds=0.01)
+        cache.put("a", [1.0])
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+
+
+class TestQueryEmbeddingBatcher:
+    """Test cases for the micro-batcher."""
+
+    def test_concurrent_requests_share_one_call(self):
+        calls = []
+        lock = threading.Lock()
+
+        def embed_fn(texts):
+            with lock:
+                calls.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+        batcher = QueryEmbeddingBatcher(embed_fn, window_ms=50, max_batch_size=100)
+        questions = ["a", "bb", "a", "ccc"]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(batcher.embed, questions))
+
+        assert results == [[1.0], [2.0], [1.0], [3.0]]
+        assert len(calls) == 1
+        assert sorted(calls[0]) == ["a", "bb", "ccc"]
+
+    def test_full_batch_flushes_immediately(self):
+        batcher = QueryEmbeddingBatcher(lambda texts: [[0.0] for _ in texts], window_ms=10_000,
+                                        max_batch_size=1)
+
+        assert batcher.embed("x") == [0.0]
+
+
+class TestQueryCachedEmbeddings:
+    """Test cases for the query embedding wrapper."""
+
+    def test_repeated_query_hits_cache(self):
+        class Inner:
+            calls = 0
+
+            def embed_query(self, text):
+                Inner.calls += 1
+                return [1.0]
+
+        embeddings = QueryCachedEmbeddings(Inner(), QueryEmbeddingCache())
+
+        embeddings.embed_query("Was ist  ein Graph?")
+        embeddings.embed_query("Was ist ein Graph?")
+
+        assert Inner.calls == 1
+
+    def test_embed_queries_sends_misses_in_one_call(self):
+        calls = []
+
+        class Inner:
+            def embed_documents(self, texts):
+                calls.append(list(texts))
+                return [[float(len(text))] for text in texts]
+
+        embeddings = QueryCachedEmbeddings(Inner(), QueryEmbeddingCache())
+        embeddings.cache.put("a", [9.0])
+
+        vectors = embeddings.embed_queries(["a", "bb", "ccc", "bb "])
+
+        assert vectors == [[9.0], [2.0], [3.0], [2.0]]
+        assert calls == [["bb", "ccc"]]
+
+    def test_queries_bypass_document_embeddings(self):
+        class Documents:
+            def embed_documents(self, texts):
+                raise AssertionError("Queries must not reach the chunk cache")
+
+            embed_query = embed_documents
+
+        class Base:
+            def embed_documents(self, texts):
+                return [[1.0] for _ in texts]
+
+            def embed_query(self, text):
+                return [2.0]
+
+        embeddings = QueryCachedEmbeddings(
+            Documents(), QueryEmbeddingCache(), query_embeddings=Base()
+        )
+
+        assert embeddings.embed_queries(["a", "b"]) == [[1.0], [1.0]]
+        assert embeddings.embed_query("c") == [2.0]
@@ -0,0 +1,109 @@
+"""
+Tests for streamed RAG answers.
+"""
+
+import asyncio
+import json
+from typing import List
+
+import pytest
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.retrievers import BaseRetriever
+
+from app import config
+from app.api.routes.rag import answer_event_generator
+from app.services.rag.conversation_store import ConversationStore
+from app.services.rag.rag_chain import RAGChain
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+    monkeypatch.setattr(config, "_settings", None)
+
+
+class StaticRetriever(BaseRetriever):
+    documents: List[Document]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.documents
+
+
+class StubVectorStore:
+    def __init__(self, documents):
+        self.retriever = StaticRetriever(documents=documents)
+
+    def get_retriever(self, **kwargs):
+        return self.retriever
+
+    def get_hybrid_retriever(self, **kwargs):
+        return self.retriever
+
+
+def make_chain(tmp_path, responses):
+    documents = [
+        Document(
+            page_content="Der Vertrag kommt durch Angebot und Annahme zustande.",
+            metadata={"source_file": "bgb.pdf", "page": 4},
+        )
+    ]
+    store = ConversationStore(tmp_path / "conversations.db")
+    chain = RAGChain(StubVectorStore(documents), store)
+    chain._llm = FakeListChatModel(responses=responses)
+    return chain
+
+
+async def collect(iterator):
+    return [event async for event in iterator]
+
+
+class TestStreamedAnswer:
+    """Test cases for RAGChain.astream."""
+
+    def test_sources_precede_tokens(self, tmp_path):
+        chain = make_chain(tmp_path, ["Durch Angebot und Annahme."])
+
+        events = asyncio.run(collect(chain.astream("Wie kommt ein Vertrag zustande?")))
+
+        assert events[0]["type"] == "sources"
+        assert [(src["file"], src["page"]) for src in events[0]["sources"]] == [("bgb.pdf", 5)]
+        tokens = [event["content"] for event in events if event["type"] == "token"]
+        assert len(tokens) > 1
+        assert events[-1]["type"] == "done"
+        assert events[-1]["answer"] == "Durch Angebot und Annahme."
+        assert "".join(tokens) == events[-1]["answer"]
+
+    def test_answer_saved_to_memory(self, tmp_path):
+        # Second question is condensed first, which consumes one response
+        chain = make_chain(tmp_path, ["Erste Antwort", "Eigenständige Frage?", "Zweite Antwort"])
+
+        asyncio.run(collect(chain.astream("Erste Frage")))
+        events = asyncio.run(collect(chain.astream("Und dann?")))
+
+        assert events[-1]["answer"] == "Zweite Antwort"
+        assert [msg["content"] for msg in chain.get_chat_history()] == [
+            "Erste Frage", "Erste Antwort", "Und dann?", "Zweite Antwort"
+        ]
+
+
+class TestAnswerEvents:
+    """Test cases for the SSE encoding of streamed answers."""
+
+    def test_event_stream_format(self, tmp_path):
+        class Assistant:
+            def __init__(self, chain):
+                self.astream = chain.astream
+
+        chain = make_chain(tmp_path, ["Ja"])
+        lines = asyncio.run(collect(answer_event_generator(Assistant(chain), "Frage", "c1")))
+
+        assert lines[0].startswith("event: sources\ndata: ")
+        assert lines[-1].startswith("event: done\ndata: ")
+        done = json.loads(lines[-1].split("data: ", 1)[1])
+        assert (done["answer"], done["conversation_id"]) == ("Ja", "c1")
+        sources = json.loads(lines[0].split("data: ", 1)[1])["sources"]
+        assert sources[0]["pages"] is None
@@ -0,0 +1,217 @@
+"""
+Tests for the chunk diff used by incremental reprocessing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import chromadb
+import pytest
+from chromadb.config import Settings as ChromaSettings
+from fastapi.testclient import TestClient
+from langchain_core.documents import Document
+
+from app.api.routes import documents as documents_route
+from app.config import Settings, get_settings
+from app.services import document_pipeline
+from app.services.document_catalog import STATUS_PROCESSED, DocumentCatalog
+from app.services.document_pipeline import DocumentPipeline
+from app.services.rag.document_processor import chunk_content_hash
+from app.services.rag.vector_store import VectorStore
+
+
+def chunk(text, page=0):
+    return Document(
+        page_content=text, metadata={"page": page, "content_hash": chunk_content_hash(text)}
+    )
+
+
+class TestChunkDiff:
+    """Test cases for DocumentPipeline.diff_chunks."""
+
+    def test_content_hash_ignores_whitespace(self):
+        expected = chunk_content_hash("Angebot und Annahme")
+        assert chunk_content_hash("Angebot  und\nAnnahme") == expected
+
+    def test_diff_keeps_unchanged_and_reports_changes(self):
+        old_texts = ["Einleitung", "Vertragsschluss", "Tippfehler hier", "Anhang"]
+        new = [
+            chunk("Einleitung", 0),
+            chunk("Vertragsschluss", 1),
+            chunk("Tippfehler behoben", 1),
+            chunk("Anhang", 3),
+        ]
+
+        diff = DocumentPipeline.diff_chunks(
+            ["a", "b", "c", "d"], [chunk_content_hash(t) for t in old_texts], new
+        )
+
+        assert [chunk_id for chunk_id, _ in diff["unchanged"]] == ["a", "b", "d"]
+        assert diff["unchanged"][2][1].metadata["page"] == 3
+        assert [doc.page_content for doc in diff["added"]] == ["Tippfehler behoben"]
+        assert diff["removed"] == ["c"]
+
+    def test_repeated_texts_match_one_to_one(self):
+        diff = DocumentPipeline.diff_chunks(
+            ["a", "b"],
+            [chunk_content_hash("Folie")] * 2,
+            [chunk("Folie"), chunk("Folie"), chunk("Folie")],
+        )
+
+        assert [chunk_id for chunk_id, _ in diff["unchanged"]] == ["a", "b"]
+        assert len(diff["added"]) == 1
+        assert diff["removed"] == []
+
+
+class StubEmbeddingEngine:
+    """Stores chunks with a constant embedding instead of calling the API."""
+
+    def __init__(self, vector_store):
+        self.collection = vector_store.vectorstore._collection
+
+    async def add_documents(self, documents):
+        ids = [doc.id for doc in documents]
+        if ids:
+            self.collection.upsert(
+                ids=ids,
+                embeddings=[[1.0, 0.0]] * len(ids),
+                metadatas=[doc.metadata for doc in documents],
+                documents=[doc.page_content for doc in documents],
+            )
+        return ids
+
+
+class TestReprocessDocument:
+    """Test cases for DocumentPipeline.reprocess_document against a Chroma collection."""
+
+    @pytest.fixture
+    def setup(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+        client = chromadb.PersistentClient(
+            path=str(tmp_path / "chroma"), settings=ChromaSettings(anonymized_telemetry=False)
+        )
+        collection = client.create_collection("chunks")
+        vector_store = VectorStore()
+        vector_store._vectorstore = SimpleNamespace(_collection=collection)
+        catalog = DocumentCatalog(db_path=tmp_path / "catalog.db")
+        catalog.add_document("doc-1", "skript.pdf", 10)
+        manager = SimpleNamespace(delete_chunks=lambda ids: ids and collection.delete(ids=ids))
+
+        monkeypatch.setattr(document_pipeline, "EmbeddingEngine", StubEmbeddingEngine)
+        monkeypatch.setattr(document_pipeline, "get_document_catalog", lambda: catalog)
+        monkeypatch.setattr(document_pipeline, "get_document_manager", lambda: manager)
+
+        pipeline = DocumentPipeline.__new__(DocumentPipeline)
+        pipeline.settings = Settings(flashcard_generation_enabled=False)
+        file_path = tmp_path / "skript.pdf"
+        file_path.write_bytes(b"%PDF-1.4")
+        return pipeline, SimpleNamespace(vector_store=vector_store), collection, catalog, file_path
+
+    def chunks(self, texts_by_page):
+        documents = []
+        for page, text in texts_by_page:
+            documents.append(chunk(text, page))
+            documents[-1].metadata["document_id"] = "doc-1"
+        return documents
+
+    def test_applies_diff_and_refreshes_metadata(self, setup, monkeypatch):
+        pipeline, assistant, collection, catalog, file_path = setup
+        collection.add(
+            ids=["a", "b", "c"],
+            embeddings=[[0.0, 1.0]] * 3,
+            metadatas=[
+                {"page": 0, "document_id": "doc-1", "source_pages": "1,4", "duplicate_count": 1},
+                {"page": 1, "document_id": "doc-1"},
+                {"page": 2, "document_id": "doc-1"},
+            ],
+            documents=["Einleitung", "Vertragsschluss", "Tippfehler hier"],
+        )
+
+        async def chunk_document(path, document_id):
+            texts = [(0, "Einleitung"), (2, "Vertragsschluss"), (2, "Tippfehler behoben")]
+            return self.chunks(texts)
+
+        monkeypatch.setattr(pipeline, "_chunk_document", chunk_document)
+        for _ in range(2):
+            results = asyncio.run(
+                pipeline.reprocess_document(file_path, "doc-1", assistant=assistant)
+            )
+
+        # The second run sees the state the first one left behind
+        assert [results[f"chunks_{key}"] for key in ("unchanged", "added", "removed")] == [3, 0, 0]
+        stored = collection.get(include=["metadatas", "documents", "embeddings"])
+        by_text = {
+            text: (chunk_id, metadata, embedding)
+            for chunk_id, text, metadata, embedding in zip(
+                stored["ids"], stored["documents"], stored["metadatas"], stored["embeddings"]
+            )
+        }
+        assert sorted(by_text) == ["Einleitung", "Tippfehler behoben", "Vertragsschluss"]
+        assert by_text["Einleitung"][0] == "a"
+        # Stale keys from the previous chunking are gone, the stored vector is kept
+        assert "source_pages" not in by_text["Einleitung"][1]
+        assert "duplicate_count" not in by_text["Einleitung"][1]
+        assert list(by_text["Einleitung"][2]) == [0.0, 1.0]
+        assert by_text["Vertragsschluss"][1]["page"] == 2
+        assert catalog.get_document("doc-1")["chunk_count"] == 3
+        assert catalog.get_document("doc-1")["status"] == STATUS_PROCESSED
+
+    def test_removed_chunks_survive_failed_embedding(self, setup, monkeypatch):
+        pipeline, assistant, collection, catalog, file_path = setup
+        collection.add(
+            ids=["a"], embeddings=[[0.0, 1.0]], metadatas=[{"page": 0, "document_id": "doc-1"}],
+            documents=["Alte Fassung"],
+        )
+
+        async def chunk_document(path, document_id):
+            return self.chunks([(0, "Neue Fassung")])
+
+        async def fail(self, documents):
+            raise RuntimeError("API nicht erreichbar")
+
+        monkeypatch.setattr(pipeline, "_chunk_document", chunk_document)
+        monkeypatch.setattr(StubEmbeddingEngine, "add_documents", fail)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(pipeline.reprocess_document(file_path, "doc-1", assistant=assistant))
+
+        assert collection.get()["documents"] == ["Alte Fassung"]
+        assert catalog.get_document("doc-1")["status"] == "error"
+
+
+class TestReprocessRoute:
+    """Test cases for the reprocess endpoint."""
+
+    def test_conflict_while_processing(self, tmp_path, monkeypatch):
+        from app.main import app
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+        settings = Settings(upload_dir=tmp_path)
+        (tmp_path / "skript.pdf").write_bytes(b"%PDF-1.4")
+        catalog = DocumentCatalog(db_path=tmp_path / "catalog.db")
+        catalog.add_document("doc-1", "skript.pdf", 8)
+        started = []
+
+        async def reprocess(**kwargs):
+            started.append(kwargs["document_id"])
+
+        monkeypatch.setattr(documents_route, "get_document_catalog", lambda: catalog)
+        monkeypatch.setattr(documents_route, "_reprocess_document_background", reprocess)
+        app.dependency_overrides[get_settings] = lambda: settings
+        try:
+            client = TestClient(app)
+            busy = client.post(
+                "/api/documents/doc-1/reprocess", files={"file": ("skript.pdf", b"%PDF-1.4 neu")}
+            )
+            catalog.mark_processed("doc-1", chunk_count=1)
+            first = client.post("/api/documents/doc-1/reprocess")
+            second = client.post("/api/documents/doc-1/reprocess")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert busy.status_code == 409
+        assert (tmp_path / "skript.pdf").read_bytes() == b"%PDF-1.4"
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["catalog.db", "skript.pdf"]
+        assert first.status_code == 200
+        assert second.status_code == 409
+        assert started == ["doc-1"]
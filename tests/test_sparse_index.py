@@ -0,0 +1,169 @@
+"""
+Tests for the German analyzer, the BM25 sparse index and rank fusion.
+"""
+
+from langchain_core.documents import Document
+
+from app.services.rag.german_text import analyze, stem
+from app.services.rag.hybrid_retriever import (
+    HybridRetriever,
+    contains_references,
+    exact_references,
+    is_exact_lookup,
+    reciprocal_rank_fusion,
+)
+from app.services.rag.sparse_index import SparseIndex, decode_postings, encode_postings
+
+
+class TestGermanText:
+    """Test cases for German text analysis."""
+
+    def test_inflections_share_a_stem(self):
+        assert stem("verträge") == stem("vertrag")
+        assert stem("häuser") == stem("haus")
+
+    def test_paragraph_references_are_kept(self):
+        terms = analyze("Haftung nach § 823 BGB, siehe Kapitel 3.2.1")
+
+        assert "§823" in terms
+        assert "3.2.1" in terms
+        assert "nach" not in terms
+
+
+class TestPostingsEncoding:
+    """Test cases for the varint postings codec."""
+
+    def test_roundtrip(self):
+        postings = [(1, 3), (130, 1), (20_000, 200)]
+
+        assert decode_postings(encode_postings(postings)) == postings
+
+    def test_append_is_relative_to_last_doc(self):
+        blob = encode_postings([(5, 1)]) + encode_postings([(9, 2)], last_doc=5)
+
+        assert decode_postings(blob) == [(5, 1), (9, 2)]
+
+
+class TestSparseIndex:
+    """Test cases for SparseIndex."""
+
+    def make_index(self, tmp_path):
+        index = SparseIndex(tmp_path / "bm25.db")
+        index.add(
+            ["a", "b", "c"],
+            [
+                "Die Haftung für unerlaubte Handlungen regelt § 823 BGB.",
+                "Verträge kommen durch Angebot und Annahme zustande.",
+                "Der Vertrag ist ein zweiseitiges Rechtsgeschäft.",
+            ],
+        )
+        return index
+
+    def test_ranks_exact_terms(self, tmp_path):
+        index = self.make_index(tmp_path)
+
+        assert index.search("§ 823", k=1)[0][0] == "a"
+        assert {chunk_id for chunk_id, _ in index.search("Vertrag")} == {"b", "c"}
+
+    def test_persists_and_deletes(self, tmp_path):
+        self.make_index(tmp_path).delete(["b"])
+
+        reopened = SparseIndex(tmp_path / "bm25.db")
+
+        assert len(reopened) == 2
+        assert [chunk_id for chunk_id, _ in reopened.search("Vertrag")] == ["c"]
+
+    def test_re_adding_replaces_chunk(self, tmp_path):
+        index = self.make_index(tmp_path)
+        index.add(["a"], ["Mietrecht und Kündigung"])
+
+        assert len(index) == 3
+        assert index.search("§ 823") == []
+        assert index.search("Kündigung")[0][0] == "a"
+
+
+class TestFusion:
+    """Test cases for reciprocal-rank fusion."""
+
+    def test_items_in_both_lists_win(self):
+        fused = reciprocal_rank_fusion([["x", "y"], ["y", "z"]])
+
+        assert fused[0][0] == "y"
+
+    def test_exact_lookup_detection(self):
+        assert is_exact_lookup("Was regelt § 823?")
+        assert is_exact_lookup("Erkläre Abschnitt 2.1")
+        assert not is_exact_lookup("Was ist ein Vertrag?")
+
+    def test_reference_must_match_whole_term(self):
+        references = exact_references('Was regelt § 823 zum "Schadensersatz"?')
+
+        assert references == ["§823", "schadensersatz"]
+        assert contains_references("Nach §823 BGB besteht Schadensersatz", references)
+        assert not contains_references("Nach § 8231 besteht Schadensersatz", references)
+        assert not contains_references("§ 823 regelt die Haftung", references)
+
+
+class StubSparseIndex:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def search(self, query, k=10):
+        return [(chunk_id, 1.0) for chunk_id in self.ids[:k]]
+
+
+class StubVectorStore:
+    def __init__(self, texts, metadatas):
+        self.texts = texts
+        self.metadatas = metadatas
+        self.dense_calls = []
+
+    def get_documents_by_ids(self, ids):
+        return [Document(id=i, page_content=self.texts[i], metadata=self.metadatas[i]) for i in ids]
+
+    def filter_ids(self, ids, where):
+        return [
+            i
+            for i in ids
+            if all(self.metadatas[i].get(key) == value for key, value in where.items())
+        ]
+
+    def similarity_search_with_ids(self, query, k=None, filter=None):
+        self.dense_calls.append(filter)
+        ids = self.filter_ids(list(self.texts), filter or {})
+        return [(doc.id, doc, 0.1) for doc in self.get_documents_by_ids(ids)]
+
+
+class TestHybridRetriever:
+    """Test cases for the sparse shortcut and metadata filters."""
+
+    def make_retriever(self, top_text, **kwargs):
+        texts = {"a": top_text, "b": "Deliktsrecht", "c": "Vertragsrecht"}
+        metadatas = {"a": {"subject": "Jura"}, "b": {"subject": "Jura"}, "c": {"subject": "BWL"}}
+        store = StubVectorStore(texts, metadatas)
+        retriever = HybridRetriever(
+            vector_store=store, sparse_index=StubSparseIndex(["a", "b", "c"]), k=2, **kwargs
+        )
+        return retriever, store
+
+    def test_shortcut_requires_literal_reference(self):
+        retriever, store = self.make_retriever("§ 823 Abs. 1 BGB", sparse_shortcut=True)
+        retriever.invoke("Was regelt § 823?")
+        assert store.dense_calls == []
+
+        retriever, store = self.make_retriever("Haftung allgemein", sparse_shortcut=True)
+        retriever.invoke("Was regelt § 823?")
+        assert store.dense_calls == [None]
+
+    def test_shortcut_off_by_default(self):
+        retriever, store = self.make_retriever("§ 823 Abs. 1 BGB")
+        retriever.invoke("Was regelt § 823?")
+
+        assert store.dense_calls == [None]
+
+    def test_filter_applies_to_both_searches(self):
+        retriever, store = self.make_retriever("§ 823", filter={"subject": "BWL"})
+        documents = retriever.invoke("Vertrag")
+
+        assert store.dense_calls == [{"subject": "BWL"}]
+        assert [doc.id for doc in documents] == ["c"]
@@ -0,0 +1,144 @@
+"""
+Tests for speculative retrieval in parallel with question condensation.
+"""
+
+import asyncio
+import time
+from typing import List
+
+import pytest
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.retrievers import BaseRetriever
+
+from app import config
+from app.services.rag.conversation_store import ConversationStore
+from app.services.rag.rag_chain import RAGChain, question_overlap
+
+DELAY = 0.2
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+    monkeypatch.setattr(config, "_settings", None)
+
+
+class SlowChatModel(FakeListChatModel):
+    def _call(self, *args, **kwargs):
+        time.sleep(DELAY)
+        return super()._call(*args, **kwargs)
+
+
+class SlowRetriever(BaseRetriever):
+    queries: List[str] = []
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        time.sleep(DELAY)
+        self.queries.append(query)
+        return [
+            Document(
+                page_content=f"Treffer für {query}", metadata={"source_file": "a.pdf", "page": 0}
+            )
+        ]
+
+
+class StubVectorStore:
+    def __init__(self):
+        self.retriever = SlowRetriever()
+
+    def get_retriever(self, **kwargs):
+        return self.retriever
+
+    def get_hybrid_retriever(self, **kwargs):
+        return self.retriever
+
+
+def make_chain(tmp_path, responses):
+    store = ConversationStore(tmp_path / "conversations.db")
+    store.append(
+        "c", [HumanMessage(content="Was ist ein Vertrag?"), AIMessage(content="Eine Einigung.")]
+    )
+    chain = RAGChain(StubVectorStore(), store)
+    chain._llm = SlowChatModel(responses=responses)
+    return chain
+
+
+class TestQuestionOverlap:
+    """Test cases for question_overlap."""
+
+    def test_overlap(self):
+        assert question_overlap("Was ist ein Vertrag?", "was ist ein vertrag") == 1.0
+        assert question_overlap("Und dann?", "Was ist eine Willenserklärung?") == 0.0
+
+
+class TestSpeculativeRetrieval:
+    """Test cases for retrieval running concurrently with condensation."""
+
+    def test_similar_question_reuses_speculative_results(self, tmp_path):
+        chain = make_chain(tmp_path, ["Wie kommt ein Vertrag zustande?", "Antwort"])
+
+        result = chain.ask("Wie kommt ein Vertrag zustande?", "c")
+
+        assert chain.vector_store.retriever.queries == ["Wie kommt ein Vertrag zustande?"]
+        assert chain.speculation_stats == {"hits": 1, "misses": 0}
+        assert "re_retrieve_ms" not in result["timings"]
+        # Condense and retrieval overlap: roughly two delays (condense + answer), not three
+        assert result["timings"]["total_ms"] < 2.8 * DELAY * 1000
+
+    def test_different_question_retrieves_again(self, tmp_path):
+        chain = make_chain(tmp_path, ["Was ist eine Anfechtung eines Vertrags?", "Antwort"])
+
+        result = chain.ask("Und dann?", "c")
+
+        assert chain.vector_store.retriever.queries == [
+            "Und dann?",
+            "Was ist eine Anfechtung eines Vertrags?",
+        ]
+        assert chain.speculation_stats == {"hits": 0, "misses": 1}
+        expected = "Treffer für Was ist eine Anfechtung eines Vertrags?"
+        assert result["sources"][0]["content_preview"] == expected
+
+    def test_stream_runs_speculatively(self, tmp_path):
+        chain = make_chain(tmp_path, ["Wie kommt ein Vertrag zustande?", "Antwort"])
+
+        async def collect():
+            return [event async for event in chain.astream("Wie kommt ein Vertrag zustande?", "c")]
+
+        done = asyncio.run(collect())[-1]
+
+        assert chain.speculation_stats["hits"] == 1
+        assert done["timings"]["total_ms"] < 2.8 * DELAY * 1000
+
+    def test_async_ask_keeps_event_loop_free(self, tmp_path):
+        chain = make_chain(tmp_path, ["Wie kommt ein Vertrag zustande?", "Antwort"])
+        ticks = []
+
+        async def ticker():
+            for _ in range(10):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(DELAY / 10)
+
+        async def main():
+            result, _ = await asyncio.gather(
+                chain.aask("Wie kommt ein Vertrag zustande?", "c"), ticker()
+            )
+            return result
+
+        result = asyncio.run(main())
+
+        assert result["answer"] == "Antwort"
+        assert chain.speculation_stats["hits"] == 1
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < DELAY
+
+    def test_no_condensation_without_history(self, tmp_path):
+        chain = make_chain(tmp_path, ["Antwort"])
+
+        result = chain.ask("Was ist Eigentum?", "neu")
+
+        assert result["answer"] == "Antwort"
+        assert "condense_ms" not in result["timings"]
@@ -0,0 +1,135 @@
+"""
+Tests for streaming uploads to disk.
+"""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from app.api.routes import documents
+from app.api.routes.documents import _stream_upload
+from app.config import Settings, get_settings
+from app.services.document_catalog import DocumentCatalog
+
+
+class RecordingFile(io.BytesIO):
+    """In-memory upload that records the requested read sizes."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.read_sizes = []
+
+    def read(self, size=-1):
+        self.read_sizes.append(size)
+        return super().read(size)
+
+
+def upload(data, size=None):
+    return UploadFile(file=RecordingFile(data), filename="skript.pdf", size=size)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key_12345")
+    return Settings(max_upload_size_mb=1, upload_chunk_size_kb=64)
+
+
+class TestStreamUpload:
+    """Test cases for chunked uploads with on-the-fly hashing."""
+
+    def test_streams_in_chunks_and_hashes(self, tmp_path, settings):
+        data = b"%PDF-1.4\n" + bytes(range(256)) * 1000
+        file = upload(data)
+
+        temp_path, size, content_hash = asyncio.run(
+            _stream_upload(file, tmp_path / "skript.pdf", settings)
+        )
+
+        assert size == len(data)
+        assert content_hash == hashlib.sha256(data).hexdigest()
+        assert temp_path.read_bytes() == data
+        assert set(file.file.read_sizes) == {64 * 1024}
+        # The target is left for the caller to replace
+        assert list(tmp_path.iterdir()) == [temp_path]
+
+    def test_limit_enforced_while_streaming(self, tmp_path, settings):
+        target = tmp_path / "skript.pdf"
+        target.write_bytes(b"%PDF-1.4 alt")
+        file = upload(b"x" * (1024 * 1024 + 1))
+
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(_stream_upload(file, target, settings))
+
+        assert error.value.status_code == 413
+        assert target.read_bytes() == b"%PDF-1.4 alt"
+        assert [path.name for path in tmp_path.iterdir()] == ["skript.pdf"]
+
+    def test_declared_size_rejected_before_reading(self, tmp_path, settings):
+        file = upload(b"%PDF-1.4", size=2 * 1024 * 1024)
+
+        with pytest.raises(HTTPException):
+            asyncio.run(_stream_upload(file, tmp_path / "skript.pdf", settings))
+
+        assert file.file.read_sizes == []
+
+
+class TestUploadDeduplication:
+    """Test cases for content-hash deduplication of uploads."""
+
+    @pytest.fixture
+    def upload_api(self, tmp_path, monkeypatch, settings):
+        from app.main import app
+
+        settings.upload_dir = tmp_path / "uploads"
+        settings.upload_dir.mkdir()
+        catalog = DocumentCatalog(db_path=tmp_path / "catalog.db")
+        processed = []
+
+        async def process(**kwargs):
+            processed.append(kwargs["filename"])
+
+        monkeypatch.setattr(documents, "get_document_catalog", lambda: catalog)
+        monkeypatch.setattr(documents, "_process_document_background", process)
+        app.dependency_overrides[get_settings] = lambda: settings
+        yield TestClient(app), catalog, processed
+        app.dependency_overrides.clear()
+
+    def test_identical_upload_becomes_alias(self, upload_api, settings):
+        client, catalog, processed = upload_api
+        data = b"%PDF-1.4\nVorlesung 3"
+
+        first = client.post("/api/documents/upload", files={"file": ("vl3.pdf", data)}).json()
+        second = client.post(
+            "/api/documents/upload", files={"file": ("vl3_kopie.pdf", data)}
+        ).json()
+
+        assert second["status"] == "duplicate"
+        assert second["document_id"] == first["document_id"]
+        assert processed == ["vl3.pdf"]
+        assert sorted(path.name for path in settings.upload_dir.iterdir()) == ["vl3.pdf"]
+        assert catalog.get_document(first["document_id"])["aliases"] == ["vl3_kopie.pdf"]
+
+    def test_changed_content_is_processed(self, upload_api):
+        client, catalog, processed = upload_api
+
+        client.post("/api/documents/upload", files={"file": ("vl3.pdf", b"%PDF-1.4\nVorlesung 3")})
+        response = client.post(
+            "/api/documents/upload", files={"file": ("vl4.pdf", b"%PDF-1.4\nVorlesung 4")}
+        )
+
+        assert response.json()["status"] == "processing"
+        assert processed == ["vl3.pdf", "vl4.pdf"]
+
+    def test_oversized_upload_leaves_no_file(self, upload_api, settings):
+        client, _, processed = upload_api
+        data = b"%PDF-1.4\n" + b"x" * (1024 * 1024)
+
+        response = client.post("/api/documents/upload", files={"file": ("gross.pdf", data)})
+
+        assert response.status_code == 413
+        assert processed == []
+        assert list(settings.upload_dir.iterdir()) == []